@@ -10,7 +10,17 @@ from sqlalchemy import engine_from_config, pool
 
 from alembic import context
 from app.api.dependencies.database import Base
-from app.models import project, sentiment_analysis, token, user
+from app.models import (
+    project,
+    project_sentiment_rollup,
+    project_sentiment_statistics,
+    rate_limit_bucket,
+    sentiment_analysis,
+    sentiment_analysis_job,
+    sentiment_score_cache,
+    token,
+    user,
+)
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, EmailStr
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependencies.database import get_db
 from app.services.auth import (
@@ -26,8 +26,8 @@ class RegisterUserResponse(BaseModel):
 
 
 @router.post("/register/")
-def registration(
-    register_user_request: RegisterUserRequest, db: Session = Depends(get_db)
+async def registration(
+    register_user_request: RegisterUserRequest, db: AsyncSession = Depends(get_db)
 ) -> RegisterUserResponse:
     register_user_input_data = RegisterUserInputData(
         username=register_user_request.username,
@@ -36,7 +36,7 @@ def registration(
     )
 
     try:
-        register_user_data = register_user(db, register_user_input_data)
+        register_user_data = await register_user(db, register_user_input_data)
     except EmailOrUsernameTakenException:
         raise HTTPException(
             status_code=400, detail="This email or username is already in use."
@@ -60,8 +60,8 @@ class LoginUserResponse(BaseModel):
 
 
 @router.post("/login/")
-def login(
-    login_user_request: LoginUserRequest, db: Session = Depends(get_db)
+async def login(
+    login_user_request: LoginUserRequest, db: AsyncSession = Depends(get_db)
 ) -> LoginUserResponse:
     login_user_input_data = LoginUserInputData(
         email=login_user_request.email,
@@ -69,7 +69,7 @@ def login(
     )
 
     try:
-        login_user_output_data = login_user(db, login_user_input_data)
+        login_user_output_data = await login_user(db, login_user_input_data)
     except IncorrectLoginDetailsException:
         raise HTTPException(status_code=400, detail="Incorrect login details.")
 
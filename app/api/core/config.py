@@ -1,12 +1,63 @@
 from pydantic import PostgresDsn
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from app.domain.sentiment_analysis import PromptPackingE, RateLimitScopeE
+from app.domain.tracing import TracingExporterE
+
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "Polarify API"
     DATABASE_URL: PostgresDsn
     TEST_DATABASE_URL: PostgresDsn
     GEMINI_API_KEY: str
+    DATABASE_POOL_SIZE: int = 10
+    DATABASE_MAX_OVERFLOW: int = 20
+    AUTH_CACHE_MAX_ENTRIES: int = 10_000
+    AUTH_CACHE_TTL_SECONDS: float = 60.0
+    GEMINI_MODEL: str = "gemini-2.5-flash"
+    GEMINI_BASE_URL: str | None = None
+    GEMINI_TIMEOUT_MS: int = 120_000
+    GEMINI_MAX_CONNECTIONS: int = 100
+    GEMINI_RPM_LIMIT: int = 0
+    GEMINI_TPM_LIMIT: int = 0
+    GEMINI_RATE_LIMIT_SCOPE: RateLimitScopeE = RateLimitScopeE.PROCESS
+    GEMINI_MAX_RETRIES: int = 5
+    GEMINI_RETRY_BASE_DELAY_SECONDS: float = 1.0
+    GEMINI_RETRY_MAX_DELAY_SECONDS: float = 60.0
+    GEMINI_BATCH_MAX_OPINIONS: int = 50_000
+    GEMINI_BATCH_POLL_INTERVAL_SECONDS: float = 30.0
+    GEMINI_BATCH_TIMEOUT_SECONDS: float = 86_400.0
+    SENTIMENT_CHUNK_MAX_OPINIONS: int = 200
+    SENTIMENT_CHUNK_MAX_CHARS: int = 40_000
+    SENTIMENT_MAX_CONCURRENCY: int = 8
+    SENTIMENT_CHUNK_RETRIES: int = 2
+    SENTIMENT_PROMPT_PACKING: PromptPackingE = PromptPackingE.ORDINAL
+    SENTIMENT_STREAM_BATCH_SIZE: int = 2_000
+    SENTIMENT_SCORES_SPOOL_MAX_BYTES: int = 8 * 1024 * 1024
+    SENTIMENT_DEDUP: bool = True
+    SENTIMENT_DEDUP_NEAR_DUPLICATES: bool = False
+    SENTIMENT_DEDUP_SIMILARITY: float = 0.8
+    SENTIMENT_DEDUP_MINHASH_PERMUTATIONS: int = 64
+    SENTIMENT_DEDUP_MAX_KEYS: int = 100_000
+    SENTIMENT_CACHE_MAX_ENTRIES: int = 100_000
+    SENTIMENT_JOB_WORKERS: int = 2
+    SENTIMENT_JOB_POLL_INTERVAL_SECONDS: float = 1.0
+    SENTIMENT_JOB_LEASE_SECONDS: int = 3600
+    SENTIMENT_JOB_MAX_ATTEMPTS: int = 3
+    SENTIMENT_JOB_UPLOAD_CHUNK_BYTES: int = 1024 * 1024
+    PROMPTS_HOT_RELOAD: bool = False
+    METRICS_ENABLED: bool = True
+    QUERY_PROFILER_ENABLED: bool = False
+    QUERY_PROFILER_HEADER_ENABLED: bool = False
+    QUERY_PROFILER_REPEAT_THRESHOLD: int = 3
+    TRACING_EXPORTER: TracingExporterE = TracingExporterE.NONE
+    TRACING_SAMPLE_RATE: float = 0.1
+    TRACING_SERVICE_NAME: str = "polarify"
+    TRACING_FILE_PATH: str = "traces.jsonl"
+    TRACING_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"
+    TRACING_MAX_QUEUE_SIZE: int = 2048
+    TRACING_EXPORT_BATCH_SIZE: int = 512
+    TRACING_EXPORT_INTERVAL_SECONDS: float = 5.0
 
     model_config = SettingsConfigDict(env_file=".env")
 
@@ -0,0 +1,72 @@
+import time
+from collections.abc import AsyncIterator
+
+from fastapi import APIRouter, HTTPException, Request, Response, status
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.api.core.config import settings
+from app.utils.metrics import (
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS_IN_PROGRESS,
+    HTTP_RESPONSES,
+    current_request_scope,
+    get_route_label,
+)
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics() -> Response:
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
+async def track_request_in_progress(request: Request) -> AsyncIterator[None]:
+    """App-wide dependency, run once the route is known, for the in-flight gauge."""
+    if not settings.METRICS_ENABLED:
+        yield
+        return
+    in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(
+        request.method, get_route_label(request.scope)
+    )
+    in_progress.inc()
+    try:
+        yield
+    finally:
+        in_progress.dec()
+
+
+class MetricsMiddleware:
+    """Time each HTTP request and count its response by route template."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        token = current_request_scope.set(scope)
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = get_route_label(scope)
+            HTTP_REQUEST_DURATION.labels(method, route).observe(
+                time.perf_counter() - start
+            )
+            HTTP_RESPONSES.labels(method, route, str(status_code)).inc()
+            current_request_scope.reset(token)
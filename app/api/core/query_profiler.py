@@ -0,0 +1,67 @@
+import logging
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.api.core.config import settings
+from app.utils.query_profiler import QueryProfile, profile_queries
+
+QUERY_PROFILE_HEADER = "x-query-profile"
+
+logger = logging.getLogger(__name__)
+
+
+def get_server_timing(profile: QueryProfile) -> str:
+    timing = f'db;dur={profile.total_seconds * 1000:.2f};desc="{profile.count} queries"'
+    repeated = profile.repeated_statements(settings.QUERY_PROFILER_REPEAT_THRESHOLD)
+    if repeated:
+        timing += f', db-repeated;desc="{len(repeated)} statements repeated"'
+    return timing
+
+
+class QueryProfilerMiddleware:
+    """Profile the statements of a request and report them in ``Server-Timing``.
+
+    Runs for every request with ``QUERY_PROFILER_ENABLED``, or for requests
+    sending ``X-Query-Profile`` with ``QUERY_PROFILER_HEADER_ENABLED``. The
+    header counts statements run before the response starts; the full profile,
+    and any statement repeated ``QUERY_PROFILER_REPEAT_THRESHOLD`` times, is
+    logged when the request ends.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    def is_enabled(self, scope: Scope) -> bool:
+        if settings.QUERY_PROFILER_ENABLED:
+            return True
+        return (
+            settings.QUERY_PROFILER_HEADER_ENABLED
+            and QUERY_PROFILE_HEADER in Headers(scope=scope)
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.is_enabled(scope):
+            await self.app(scope, receive, send)
+            return
+
+        with profile_queries() as profile:
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", get_server_timing(profile))
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
+
+        logger.info("%s %s: %s", scope["method"], scope["path"], profile.summary())
+        repeated = profile.repeated_statements(settings.QUERY_PROFILER_REPEAT_THRESHOLD)
+        for shape, count in repeated.items():
+            logger.warning(
+                "%s %s ran a statement %d times: %s",
+                scope["method"],
+                scope["path"],
+                count,
+                shape,
+            )
@@ -0,0 +1,22 @@
+from collections.abc import Iterable, Mapping
+
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+
+def rows_response(
+    model: type[BaseModel],
+    rows: Iterable[object],
+    headers: Mapping[str, str] | None = None,
+) -> ORJSONResponse:
+    """Serialize ORM rows or dataclasses as a JSON list of ``model``.
+
+    The model's fields are read straight off each row and handed to orjson,
+    skipping the build, validate and dump passes FastAPI makes over returned
+    models. Routes declare ``response_model`` to keep the schema documented.
+    """
+    fields = tuple(model.model_fields)
+    return ORJSONResponse(
+        [{field: getattr(row, field) for field in fields} for row in rows],
+        headers=headers,
+    )
@@ -0,0 +1,44 @@
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.metrics import get_route_label
+from app.utils.tracing import parse_traceparent, tracer
+
+
+class TracingMiddleware:
+    """Open the root span of each HTTP request, joining the caller's trace.
+
+    A ``traceparent`` header from the caller makes the request's spans part of
+    its trace, and its sampled flag takes precedence over the sample rate.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        traceparent = headers.get("traceparent")
+        parent = parse_traceparent(traceparent) if traceparent else None
+        method = scope["method"]
+        attributes = {"http.method": method, "http.target": scope["path"]}
+        content_length = headers.get("content-length", "")
+        if content_length.isdecimal():
+            attributes["http.request.body.size"] = int(content_length)
+
+        with tracer.span(f"{method} request", attributes, parent=parent) as span:
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.status_code", message["status"])
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = get_route_label(scope)
+                span.name = f"{method} {route}"
+                span.set_attribute("http.route", route)
@@ -1,21 +1,37 @@
-from sqlalchemy import create_engine
+from collections.abc import AsyncIterator
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
 
 from app.api.core.config import settings
+from app.utils.metrics import instrument_engine
+from app.utils.query_profiler import profile_engine
+from app.utils.tracing import trace_engine
 
 database_url = settings.DATABASE_URL
 if database_url is None:
     raise ValueError("DATABASE_URL not found.")
 
-engine = create_engine(str(database_url))
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def to_async_database_url(url: str) -> str:
+    _, address = url.split("://", 1)
+    return f"postgresql+asyncpg://{address}"
+
+
+engine = create_async_engine(
+    to_async_database_url(str(database_url)),
+    pool_size=settings.DATABASE_POOL_SIZE,
+    max_overflow=settings.DATABASE_MAX_OVERFLOW,
+)
+instrument_engine(engine)
+profile_engine(engine)
+trace_engine(engine)
+SessionLocal = async_sessionmaker(
+    engine, autoflush=False, expire_on_commit=False, class_=AsyncSession
+)
 Base = declarative_base()
 
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db() -> AsyncIterator[AsyncSession]:
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
@@ -1,11 +1,13 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.core.responses import rows_response
 from app.api.dependencies.auth import get_current_user
 from app.api.dependencies.database import get_db
+from app.domain.sentiment_analysis import SentimentBackendE
 from app.domain.user import User as UserDomain
 from app.repository.project import (
     ProjectNotFoundException,
@@ -15,6 +17,7 @@ from app.repository.project import (
     list_projects,
     update_project,
 )
+from app.utils.pagination import decode_cursor, encode_cursor
 
 router = APIRouter()
 
@@ -22,95 +25,117 @@ router = APIRouter()
 class ProjectCreateUpdateRequest(BaseModel):
     name: str
     description: str | None = None
+    sentiment_backend: SentimentBackendE | None = None
 
 
 class ProjectResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     name: str
     description: str | None = None
+    sentiment_backend: SentimentBackendE
 
 
 @router.post("/projects/", status_code=status.HTTP_201_CREATED)
 async def create_project_api(
     project_create_update_request: ProjectCreateUpdateRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserDomain = Depends(get_current_user),
 ) -> ProjectResponse:
-    project = create_project(
+    project = await create_project(
         db=db,
         user_id=current_user.id,
         name=project_create_update_request.name,
         description=project_create_update_request.description,
+        sentiment_backend=project_create_update_request.sentiment_backend,
     )
 
-    response = ProjectResponse(
-        id=project.id, name=project.name, description=project.description
-    )
-    return response
+    return ProjectResponse.model_validate(project)
 
 
 @router.get("/projects/{project_id}")
 async def get_project_api(
     project_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserDomain = Depends(get_current_user),
 ) -> ProjectResponse:
-    project = get_project(db, project_id=project_id, user_id=current_user.id)
+    project = await get_project(db, project_id=project_id, user_id=current_user.id)
     if project is None:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    response = ProjectResponse(
-        id=project.id, name=project.name, description=project.description
-    )
-    return response
+    return ProjectResponse.model_validate(project)
 
 
 @router.put("/projects/{project_id}", status_code=status.HTTP_202_ACCEPTED)
 async def update_project_api(
     project_id: int,
     project_create_update_request: ProjectCreateUpdateRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserDomain = Depends(get_current_user),
 ) -> ProjectResponse:
-    project = update_project(
+    project = await update_project(
         db,
         project_id=project_id,
         user_id=current_user.id,
         name=project_create_update_request.name,
         description=project_create_update_request.description,
+        sentiment_backend=project_create_update_request.sentiment_backend,
     )
     if project is None:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    response = ProjectResponse(
-        id=project.id, name=project.name, description=project.description
-    )
-    return response
+    return ProjectResponse.model_validate(project)
 
 
 @router.delete("/projects/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_project_api(
     project_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserDomain = Depends(get_current_user),
 ) -> None:
     try:
-        delete_project(db, project_id=project_id, user_id=current_user.id)
+        await delete_project(db, project_id=project_id, user_id=current_user.id)
     except ProjectNotFoundException:
         raise HTTPException(status_code=404, detail="Project not found")
 
 
-@router.get("/projects/")
+@router.get("/projects/", response_model=List[ProjectResponse])
 async def get_projects_list_api(
-    db: Session = Depends(get_db), current_user: UserDomain = Depends(get_current_user)
-) -> List[ProjectResponse]:
-    projects = list_projects(db=db, user_id=current_user.id)
-
-    response = []
-    for project in projects:
-        response.append(
-            ProjectResponse(
-                id=project.id, name=project.name, description=project.description
-            )
-        )
-    return response
+    db: AsyncSession = Depends(get_db),
+    current_user: UserDomain = Depends(get_current_user),
+    limit: int = Query(default=100, ge=1, le=1000),
+    cursor: str | None = None,
+    name_prefix: str | None = None,
+    include_total: bool = False,
+) -> Response:
+    """Projects in creation order.
+
+    The next page's cursor is sent in ``X-Next-Cursor`` and, with
+    ``include_total``, the number of matching projects in ``X-Total-Count``.
+    """
+    after_id = None
+    if cursor is not None:
+        try:
+            (last_id,) = decode_cursor(cursor, length=1)
+            after_id = int(last_id)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    projects, total = await list_projects(
+        db=db,
+        user_id=current_user.id,
+        limit=limit + 1,
+        after_id=after_id,
+        name_prefix=name_prefix,
+        with_total=include_total,
+    )
+
+    headers = {}
+    if len(projects) > limit:
+        projects = projects[:limit]
+        headers["X-Next-Cursor"] = encode_cursor(projects[-1].id)
+    if total is not None:
+        headers["X-Total-Count"] = str(total)
+
+    return rows_response(ProjectResponse, projects, headers=headers)
@@ -1,7 +1,9 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 # Common user model
 class User(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     username: str
     email: str
@@ -1,21 +1,47 @@
 from datetime import date, datetime
-from typing import cast
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile
-from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.core.responses import rows_response
 from app.api.dependencies.auth import get_current_user
 from app.api.dependencies.database import get_db
+from app.domain.sentiment_analysis import (
+    ExportFormatE,
+    JobStatusE,
+    RollupGranularityE,
+    SentimentBackendE,
+)
 from app.domain.user import User as UserDomain
 from app.repository import project as project_repo
 from app.repository import sentiment_analysis as sentiment_repo
+from app.repository import sentiment_analysis_job as sentiment_job_repo
+from app.services.rate_limit import gemini_rate_limiter
 from app.services.sentiment_analysis import (
     Opinion,
     analyze_sentiment,
     calculate_statistical_measures,
-    opinions_csv_to_list,
+    get_sentiment_rollups,
+    iter_opinions_csv,
 )
+from app.services.sentiment_analysis_jobs import submit_sentiment_analysis_job
+from app.services.sentiment_backends import get_sentiment_backend
+from app.services.sentiment_cache import score_cache
+from app.services.sentiment_export import (
+    EXPORT_MEDIA_TYPES,
+    export_sentiment_analysis_results,
+)
+from app.utils.pagination import decode_cursor, encode_cursor
 
 router = APIRouter()
 
@@ -26,6 +52,8 @@ class OpinionsToAnalyzeRequest(BaseModel):
 
 
 class SentimentAnalysisResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     project_id: int
     user_id: int
     date_from: date
@@ -38,43 +66,49 @@ class SentimentAnalysisResponse(BaseModel):
     created_at: datetime
 
 
+def check_interactive_backend(backend: SentimentBackendE) -> SentimentBackendE:
+    if get_sentiment_backend(backend).background_only:
+        raise HTTPException(
+            status_code=400,
+            detail=f"The {backend} backend is only available for analysis jobs.",
+        )
+    return backend
+
+
 @router.post("/sentiment-analysis-raw")
 async def sentiment_analysis_raw(
     project_id: int,
     date_from: date,
     date_to: date,
     opinions_to_analyze: list[OpinionsToAnalyzeRequest],
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserDomain = Depends(get_current_user),
+    backend: SentimentBackendE | None = None,
 ) -> SentimentAnalysisResponse:
+    project = await project_repo.get_project(
+        db, project_id=project_id, user_id=current_user.id
+    )
+    if project is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+
     opinions_list = [
         Opinion(id=opinion.id, content=opinion.content)
         for opinion in opinions_to_analyze
     ]
 
-    sentiment_analysis_results = analyze_sentiment(
+    sentiment_analysis_results = await analyze_sentiment(
         db,
         project_id=project_id,
         user_id=current_user.id,
         date_from=date_from,
         date_to=date_to,
         opinions_list=opinions_list,
+        backend=check_interactive_backend(
+            backend or SentimentBackendE(project.sentiment_backend)
+        ),
     )
 
-    response = SentimentAnalysisResponse(
-        project_id=sentiment_analysis_results.project_id,
-        user_id=sentiment_analysis_results.user_id,
-        date_from=sentiment_analysis_results.date_from,
-        date_to=sentiment_analysis_results.date_to,
-        opinions_count=sentiment_analysis_results.opinions_count,
-        positive_count=sentiment_analysis_results.positive_count,
-        neutral_count=sentiment_analysis_results.neutral_count,
-        negative_count=sentiment_analysis_results.negative_count,
-        avg_sentiment=sentiment_analysis_results.avg_sentiment,
-        created_at=sentiment_analysis_results.created_at,
-    )
-
-    return response
+    return SentimentAnalysisResponse.model_validate(sentiment_analysis_results)
 
 
 @router.post("/sentiment-analysis-csv")
@@ -83,8 +117,9 @@ async def sentiment_analysis_csv(
     date_from: date,
     date_to: date,
     file: UploadFile,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserDomain = Depends(get_current_user),
+    backend: SentimentBackendE | None = None,
 ) -> SentimentAnalysisResponse:
 
     if file.content_type not in ["text/csv", "application/vnd.ms-excel"]:
@@ -92,103 +127,215 @@ async def sentiment_analysis_csv(
             status_code=400, detail="Invalid file type. Please upload a CSV."
         )
 
-    opinions_list = await opinions_csv_to_list(file)
+    project = await project_repo.get_project(
+        db, project_id=project_id, user_id=current_user.id
+    )
+    if project is None:
+        raise HTTPException(status_code=404, detail="Project not found")
 
-    sentiment_analysis_results = analyze_sentiment(
+    sentiment_analysis_results = await analyze_sentiment(
         db,
         project_id=project_id,
         user_id=current_user.id,
         date_from=date_from,
         date_to=date_to,
-        opinions_list=opinions_list,
+        opinions_list=iter_opinions_csv(file),
+        backend=check_interactive_backend(
+            backend or SentimentBackendE(project.sentiment_backend)
+        ),
+    )
+
+    return SentimentAnalysisResponse.model_validate(sentiment_analysis_results)
+
+
+class SentimentAnalysisJobResponse(BaseModel):
+    id: int
+    status: JobStatusE
+    opinions_total: int | None = None
+    opinions_done: int
+    error: str | None = None
+    result: SentimentAnalysisResponse | None = None
+
+
+@router.post("/sentiment-analysis-jobs", status_code=status.HTTP_202_ACCEPTED)
+async def create_sentiment_analysis_job(
+    project_id: int,
+    date_from: date,
+    date_to: date,
+    file: UploadFile,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserDomain = Depends(get_current_user),
+    backend: SentimentBackendE | None = None,
+) -> SentimentAnalysisJobResponse:
+    if file.content_type not in ["text/csv", "application/vnd.ms-excel"]:
+        raise HTTPException(
+            status_code=400, detail="Invalid file type. Please upload a CSV."
+        )
+
+    project = await project_repo.get_project(
+        db, project_id=project_id, user_id=current_user.id
+    )
+    if project is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    job = await submit_sentiment_analysis_job(
+        db,
+        project_id=project_id,
+        user_id=current_user.id,
+        date_from=date_from,
+        date_to=date_to,
+        file=file,
+        backend=backend or SentimentBackendE(project.sentiment_backend),
+    )
+
+    response = SentimentAnalysisJobResponse(
+        id=job.id,
+        status=JobStatusE(job.status),
+        opinions_done=job.opinions_done,
     )
+    return response
+
 
-    response = SentimentAnalysisResponse(
-        project_id=sentiment_analysis_results.project_id,
-        user_id=sentiment_analysis_results.user_id,
-        date_from=sentiment_analysis_results.date_from,
-        date_to=sentiment_analysis_results.date_to,
-        opinions_count=sentiment_analysis_results.opinions_count,
-        positive_count=sentiment_analysis_results.positive_count,
-        neutral_count=sentiment_analysis_results.neutral_count,
-        negative_count=sentiment_analysis_results.negative_count,
-        avg_sentiment=sentiment_analysis_results.avg_sentiment,
-        created_at=sentiment_analysis_results.created_at,
+@router.get("/sentiment-analysis-jobs/{job_id}")
+async def get_sentiment_analysis_job(
+    job_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserDomain = Depends(get_current_user),
+) -> SentimentAnalysisJobResponse:
+    job = await sentiment_job_repo.get_sentiment_analysis_job(
+        db, job_id=job_id, user_id=current_user.id
     )
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    result = None
+    if job.result is not None:
+        result = SentimentAnalysisResponse.model_validate(job.result)
 
+    response = SentimentAnalysisJobResponse(
+        id=job.id,
+        status=JobStatusE(job.status),
+        opinions_total=job.opinions_total,
+        opinions_done=job.opinions_done,
+        error=job.error,
+        result=result,
+    )
     return response
 
 
-@router.get("/sentiment-analysis_results/{project_id}")
+@router.get(
+    "/sentiment-analysis_results/{project_id}",
+    response_model=list[SentimentAnalysisResponse],
+)
 async def get_sentiment_analysis_results(
     project_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserDomain = Depends(get_current_user),
     year: int | None = None,
-) -> list[SentimentAnalysisResponse]:
-    project = project_repo.get_project(
+    limit: int = Query(default=100, ge=1, le=1000),
+    cursor: str | None = None,
+) -> Response:
+    """Newest results first; the next page's cursor is sent in ``X-Next-Cursor``."""
+    after = None
+    if cursor is not None:
+        try:
+            created_at, result_id = decode_cursor(cursor, length=2)
+            after = (datetime.fromisoformat(str(created_at)), int(result_id))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    project = await project_repo.get_project(
         db, project_id=project_id, user_id=current_user.id
     )
     if project is None:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    sentiment_analysis_results = sentiment_repo.get_sentiment_analysis_results(
+    sentiment_analysis_results = await sentiment_repo.get_sentiment_analysis_results(
         db,
         project_id=project_id,
         user_id=current_user.id,
         year=year,
+        limit=limit + 1,
+        after=after,
     )
 
-    response = []
-    for sentiment_analysis_result in sentiment_analysis_results:
-        response.append(
-            SentimentAnalysisResponse(
-                project_id=sentiment_analysis_result.project_id,
-                user_id=sentiment_analysis_result.user_id,
-                date_from=sentiment_analysis_result.date_from,
-                date_to=sentiment_analysis_result.date_to,
-                opinions_count=sentiment_analysis_result.opinions_count,
-                positive_count=sentiment_analysis_result.positive_count,
-                neutral_count=sentiment_analysis_result.neutral_count,
-                negative_count=sentiment_analysis_result.negative_count,
-                avg_sentiment=cast(float, sentiment_analysis_result.avg_sentiment),
-                created_at=sentiment_analysis_result.created_at,
-            )
+    headers = {}
+    if len(sentiment_analysis_results) > limit:
+        sentiment_analysis_results = sentiment_analysis_results[:limit]
+        last_result = sentiment_analysis_results[-1]
+        headers["X-Next-Cursor"] = encode_cursor(
+            last_result.created_at.isoformat(), last_result.id
         )
-    return response
+
+    return rows_response(
+        SentimentAnalysisResponse, sentiment_analysis_results, headers=headers
+    )
+
+
+@router.get("/sentiment-analysis_results/{project_id}/export")
+async def export_sentiment_analysis_results_api(
+    project_id: int,
+    export_format: ExportFormatE = Query(default=ExportFormatE.NDJSON, alias="format"),
+    year: int | None = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserDomain = Depends(get_current_user),
+) -> StreamingResponse:
+    project = await project_repo.get_project(
+        db, project_id=project_id, user_id=current_user.id
+    )
+    if project is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    return StreamingResponse(
+        export_sentiment_analysis_results(
+            db,
+            project_id=project_id,
+            user_id=current_user.id,
+            export_format=export_format,
+            year=year,
+        ),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="sentiment-analysis-results-{project_id}'
+                f'.{export_format}"'
+            )
+        },
+    )
 
 
 class SentimentAnalysisStatisticalMeasuresResponse(BaseModel):
     project_id: int
     user_id: int
-    min: float
-    max: float
-    mean: float
-    median: float
-    std: float
+    results_count: int
+    min: float | None
+    max: float | None
+    mean: float | None
+    median: float | None
+    std: float | None
 
 
 @router.get("/sentiment-analysis_statistical_measures/{project_id}")
 async def get_sentiment_analysis_statistical_measures(
     project_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserDomain = Depends(get_current_user),
 ) -> SentimentAnalysisStatisticalMeasuresResponse:
-    project = project_repo.get_project(
+    project = await project_repo.get_project(
         db, project_id=project_id, user_id=current_user.id
     )
     if project is None:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    statistical_measures = calculate_statistical_measures(
+    statistical_measures = await calculate_statistical_measures(
         db=db,
         project_id=project_id,
-        user_id=current_user.id,
     )
 
     response = SentimentAnalysisStatisticalMeasuresResponse(
         project_id=project_id,
         user_id=current_user.id,
+        results_count=statistical_measures.results_count,
         min=statistical_measures.min,
         max=statistical_measures.max,
         mean=statistical_measures.mean,
@@ -197,3 +344,89 @@ async def get_sentiment_analysis_statistical_measures(
     )
 
     return response
+
+
+class SentimentRollupBucketResponse(BaseModel):
+    bucket: date
+    results_count: int
+    opinions_count: int
+    positive_count: int
+    neutral_count: int
+    negative_count: int
+    avg_sentiment: float | None
+
+
+@router.get(
+    "/sentiment-analysis_rollups/{project_id}",
+    response_model=list[SentimentRollupBucketResponse],
+)
+async def get_sentiment_analysis_rollups(
+    project_id: int,
+    granularity: RollupGranularityE = RollupGranularityE.MONTH,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserDomain = Depends(get_current_user),
+) -> Response:
+    """Results bucketed by ``date_from``, averaged weighting by opinions count."""
+    project = await project_repo.get_project(
+        db, project_id=project_id, user_id=current_user.id
+    )
+    if project is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    buckets = await get_sentiment_rollups(
+        db,
+        project_id=project_id,
+        granularity=granularity,
+        date_from=date_from,
+        date_to=date_to,
+    )
+
+    return rows_response(SentimentRollupBucketResponse, buckets)
+
+
+class SentimentScoreCacheStatsResponse(BaseModel):
+    memory_hits: int
+    db_hits: int
+    misses: int
+    memory_entries: int
+
+
+@router.get("/sentiment-analysis-cache/stats")
+async def get_sentiment_score_cache_stats(
+    current_user: UserDomain = Depends(get_current_user),
+) -> SentimentScoreCacheStatsResponse:
+    stats = score_cache.get_stats()
+
+    response = SentimentScoreCacheStatsResponse(
+        memory_hits=stats.memory_hits,
+        db_hits=stats.db_hits,
+        misses=stats.misses,
+        memory_entries=stats.memory_entries,
+    )
+    return response
+
+
+class GeminiRateLimitStatsResponse(BaseModel):
+    requests: int
+    throttled_requests: int
+    throttled_seconds: float
+    retries: int
+    retry_wait_seconds: float
+
+
+@router.get("/sentiment-analysis-rate-limit/stats")
+async def get_gemini_rate_limit_stats(
+    current_user: UserDomain = Depends(get_current_user),
+) -> GeminiRateLimitStatsResponse:
+    stats = gemini_rate_limiter.get_stats()
+
+    response = GeminiRateLimitStatsResponse(
+        requests=stats.requests,
+        throttled_requests=stats.throttled_requests,
+        throttled_seconds=stats.throttled_seconds,
+        retries=stats.retries,
+        retry_wait_seconds=stats.retry_wait_seconds,
+    )
+    return response
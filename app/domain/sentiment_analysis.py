@@ -0,0 +1,48 @@
+from dataclasses import dataclass
+from enum import StrEnum
+
+
+class SentimentBackendE(StrEnum):
+    GEMINI = "gemini"
+    GEMINI_BATCH = "gemini_batch"
+    LEXICON = "lexicon"
+
+
+class PromptPackingE(StrEnum):
+    KEYED = "keyed"
+    ORDINAL = "ordinal"
+
+
+class RateLimitScopeE(StrEnum):
+    PROCESS = "process"
+    DATABASE = "database"
+
+
+class JobStatusE(StrEnum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class RollupGranularityE(StrEnum):
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+
+class ExportFormatE(StrEnum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+@dataclass
+class Opinion:
+    id: str
+    content: str
+
+
+@dataclass
+class OpinionsSentiment:
+    id: str
+    sentiment: float
@@ -0,0 +1,8 @@
+from enum import StrEnum
+
+
+class TracingExporterE(StrEnum):
+    NONE = "none"
+    CONSOLE = "console"
+    FILE = "file"
+    OTLP = "otlp"
@@ -1,12 +1,47 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.api.auth import router as auth_router
+from app.api.core.config import settings
+from app.api.core.metrics import MetricsMiddleware
+from app.api.core.metrics import router as metrics_router
+from app.api.core.metrics import track_request_in_progress
+from app.api.core.query_profiler import QueryProfilerMiddleware
+from app.api.core.tracing import TracingMiddleware
+from app.api.dependencies.database import engine
 from app.api.project import router as projects_router
 from app.api.sentiment_analysis import router as sentiment_analysis_router
 from app.api.user import router as users_router
+from app.services.gemini import close_gemini_client, init_gemini_client
+from app.services.sentiment_analysis_jobs import (
+    start_sentiment_analysis_job_workers,
+    stop_sentiment_analysis_job_workers,
+)
+from app.utils.prompts import prompt_registry
+from app.utils.tracing import configure_tracing, tracer
+
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    configure_tracing()
+    prompt_registry.load()
+    init_gemini_client()
+    job_workers = start_sentiment_analysis_job_workers(settings.SENTIMENT_JOB_WORKERS)
+    yield
+    await stop_sentiment_analysis_job_workers(job_workers)
+    await close_gemini_client()
+    await engine.dispose()
+    tracer.shutdown()
+
+
+app = FastAPI(
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+    dependencies=[Depends(track_request_in_progress)],
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -15,6 +50,9 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(QueryProfilerMiddleware)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(TracingMiddleware)
 
 
 @app.get("/")
@@ -26,3 +64,4 @@ app.include_router(projects_router)
 app.include_router(users_router)
 app.include_router(auth_router)
 app.include_router(sentiment_analysis_router)
+app.include_router(metrics_router)
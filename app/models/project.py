@@ -1,16 +1,30 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, func
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, func
 from sqlalchemy.orm import relationship
 
 from app.api.dependencies.database import Base
+from app.domain.sentiment_analysis import SentimentBackendE
 
 
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        Index("ix_projects_user_id_id", "user_id", "id"),
+        # Pattern ops let name-prefix LIKE use the index under any collation.
+        Index(
+            "ix_projects_user_id_name_pattern",
+            "user_id",
+            "name",
+            postgresql_ops={"name": "varchar_pattern_ops"},
+        ),
+    )
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime, default=func.now())
     description = Column(String(255))
+    sentiment_backend = Column(
+        String(32), nullable=False, server_default=SentimentBackendE.GEMINI.value
+    )
 
     user = relationship("User", back_populates="projects")  # type: ignore
     sentiment_analysis_results = relationship(  # type: ignore
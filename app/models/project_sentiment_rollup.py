@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Date, Float, ForeignKey, Integer, String
+
+from app.api.dependencies.database import Base
+
+
+class ProjectSentimentRollup(Base):
+    """Per-bucket sums of a project's results, bucketed by ``date_from``.
+
+    ``sentiment_sum`` is ``avg_sentiment * opinions_count`` summed over the
+    bucket, so dividing it by ``opinions_count`` weights each result by size.
+    """
+
+    __tablename__ = "project_sentiment_rollups"
+    project_id = Column(
+        Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True
+    )
+    granularity = Column(String(8), primary_key=True)
+    bucket = Column(Date, primary_key=True)
+    results_count = Column(Integer, nullable=False)
+    opinions_count = Column(Integer, nullable=False)
+    positive_count = Column(Integer, nullable=False)
+    neutral_count = Column(Integer, nullable=False)
+    negative_count = Column(Integer, nullable=False)
+    sentiment_sum = Column(Float, nullable=False)
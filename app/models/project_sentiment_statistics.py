@@ -0,0 +1,25 @@
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, func
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.api.dependencies.database import Base
+
+
+class ProjectSentimentStatistics(Base):
+    """Running aggregates of a project's ``avg_sentiment`` values.
+
+    ``sentiment_histogram`` maps each value, in hundredths, to how many results
+    had it; adding histograms merges them, and they give an exact median for
+    values rounded to two decimals.
+    """
+
+    __tablename__ = "project_sentiment_statistics"
+    project_id = Column(
+        Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True
+    )
+    results_count = Column(Integer, nullable=False)
+    sentiment_sum = Column(Float, nullable=False)
+    sentiment_sum_squares = Column(Float, nullable=False)
+    sentiment_min = Column(Float, nullable=False)
+    sentiment_max = Column(Float, nullable=False)
+    sentiment_histogram = Column(JSONB, nullable=False)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, DateTime, Float, String
+
+from app.api.dependencies.database import Base
+
+
+class RateLimitBucket(Base):
+    """Token bucket shared by every process; ``tokens`` goes negative while in debt."""
+
+    __tablename__ = "rate_limit_buckets"
+    name = Column(String(64), primary_key=True)
+    tokens = Column(Float, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
@@ -1,4 +1,14 @@
-from sqlalchemy import Column, Date, DateTime, Float, ForeignKey, Integer, func
+from sqlalchemy import (
+    Column,
+    Date,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    func,
+)
 from sqlalchemy.orm import relationship
 
 from app.api.dependencies.database import Base
@@ -6,6 +16,15 @@ from app.api.dependencies.database import Base
 
 class SentimentAnalysisResult(Base):
     __tablename__ = "sentiment_analysis_results"
+    __table_args__ = (
+        Index(
+            "ix_sentiment_analysis_results_project_user_created",
+            "project_id",
+            "user_id",
+            "created_at",
+            "id",
+        ),
+    )
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("projects.id"), index=True, nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), index=True, nullable=False)
@@ -24,3 +43,13 @@ class SentimentAnalysisResult(Base):
     user = relationship(  # type: ignore
         "User", back_populates="sentiment_analysis_results"
     )
+
+
+class OpinionSentimentScore(Base):
+    # No foreign key: a per-row RI check costs more than the COPY itself, and
+    # rows are only written in the transaction that inserts their result.
+    __tablename__ = "opinion_sentiment_scores"
+    result_id = Column(Integer, primary_key=True)
+    position = Column(Integer, primary_key=True)
+    opinion_id = Column(String, nullable=False)
+    sentiment = Column(Float, nullable=False)
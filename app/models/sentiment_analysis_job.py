@@ -0,0 +1,51 @@
+from sqlalchemy import (
+    Column,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+    func,
+)
+from sqlalchemy.orm import relationship
+
+from app.api.dependencies.database import Base
+
+
+class SentimentAnalysisJob(Base):
+    __tablename__ = "sentiment_analysis_jobs"
+    __table_args__ = (Index("ix_sentiment_analysis_jobs_status_id", "status", "id"),)
+    id = Column(Integer, primary_key=True, index=True)
+    project_id = Column(Integer, ForeignKey("projects.id"), index=True, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True, nullable=False)
+    date_from = Column(Date, nullable=False)
+    date_to = Column(Date, nullable=False)
+    backend = Column(String(32), nullable=False)
+    status = Column(String(16), nullable=False)
+    opinions_total = Column(Integer)
+    opinions_done = Column(Integer, nullable=False, default=0)
+    attempts = Column(Integer, nullable=False, default=0)
+    error = Column(Text)
+    result_id = Column(Integer, ForeignKey("sentiment_analysis_results.id"))
+    created_at = Column(DateTime, default=func.now())
+    started_at = Column(DateTime)
+    heartbeat_at = Column(DateTime)
+    finished_at = Column(DateTime)
+
+    result = relationship("SentimentAnalysisResult")  # type: ignore
+
+
+class SentimentAnalysisJobUploadChunk(Base):
+    """A piece of a job's CSV upload, kept until the job finishes."""
+
+    __tablename__ = "sentiment_analysis_job_upload_chunks"
+    job_id = Column(
+        Integer,
+        ForeignKey("sentiment_analysis_jobs.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    seq = Column(Integer, primary_key=True)
+    data = Column(LargeBinary, nullable=False)
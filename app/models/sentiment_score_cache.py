@@ -0,0 +1,12 @@
+from sqlalchemy import Column, DateTime, Float, String, func
+
+from app.api.dependencies.database import Base
+
+
+class SentimentScoreCache(Base):
+    __tablename__ = "sentiment_score_cache"
+    key = Column(String(32), primary_key=True)
+    model = Column(String(255), nullable=False)
+    prompt_version = Column(String(32), nullable=False)
+    sentiment = Column(Float, nullable=False)
+    created_at = Column(DateTime, default=func.now())
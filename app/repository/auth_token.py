@@ -1,7 +1,8 @@
 import uuid
 from dataclasses import dataclass
 
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.token import AuthToken
 from app.repository.user import get_user
@@ -18,16 +19,16 @@ class UserNotFoundException(Exception):
     pass
 
 
-def create_auth_token(db: Session, user_id: int) -> AuthTokenData:
-    user = get_user(db, user_id)
+async def create_auth_token(db: AsyncSession, user_id: int) -> AuthTokenData:
+    user = await get_user(db, user_id)
     if not user:
         raise UserNotFoundException
 
     token = uuid.uuid4().hex
     auth_token = AuthToken(user_id=user.id, token=token)
     db.add(auth_token)
-    db.commit()
-    db.refresh(auth_token)
+    await db.commit()
+    await db.refresh(auth_token)
 
     auth_token_data = AuthTokenData(
         user_id=auth_token.user_id,
@@ -36,8 +37,9 @@ def create_auth_token(db: Session, user_id: int) -> AuthTokenData:
     return auth_token_data
 
 
-def get_auth_token(db: Session, user_id: int) -> AuthTokenData | None:
-    db_auth_token = db.query(AuthToken).filter(AuthToken.user_id == user_id).first()
+async def get_auth_token(db: AsyncSession, user_id: int) -> AuthTokenData | None:
+    result = await db.execute(select(AuthToken).where(AuthToken.user_id == user_id))
+    db_auth_token = result.scalars().first()
     if not db_auth_token:
         return None
 
@@ -1,5 +1,8 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
+from app.domain.sentiment_analysis import SentimentBackendE
 from app.models.project import Project
 
 
@@ -7,58 +10,118 @@ class ProjectNotFoundException(Exception):
     pass
 
 
-def create_project(
-    db: Session, user_id: int, name: str, description: str | None
+async def create_project(
+    db: AsyncSession,
+    user_id: int,
+    name: str,
+    description: str | None,
+    sentiment_backend: str | None = None,
 ) -> Project:
     db_project = Project(
-        user_id=user_id, name=name, description=description if description else ""
+        user_id=user_id,
+        name=name,
+        description=description if description else "",
+        sentiment_backend=sentiment_backend or SentimentBackendE.GEMINI,
     )
     db.add(db_project)
-    db.commit()
-    db.refresh(db_project)
+    await db.commit()
+    await db.refresh(db_project)
 
     return db_project
 
 
-def get_project(db: Session, project_id: int, user_id: int) -> Project | None:
-    db_project = (
-        db.query(Project)
-        .filter(Project.id == project_id, Project.user_id == user_id)
-        .first()
+async def get_project(
+    db: AsyncSession, project_id: int, user_id: int
+) -> Project | None:
+    result = await db.execute(
+        select(Project).where((Project.id == project_id) & (Project.user_id == user_id))
     )
+    db_project = result.scalars().first()
     if not db_project:
         return None
 
     return db_project
 
 
-def update_project(
-    db: Session, project_id: int, user_id: int, name: str, description: str | None
+async def update_project(
+    db: AsyncSession,
+    project_id: int,
+    user_id: int,
+    name: str,
+    description: str | None,
+    sentiment_backend: str | None = None,
 ) -> Project | None:
-    db_project = (
-        db.query(Project)
-        .filter(Project.id == project_id, Project.user_id == user_id)
-        .first()
-    )
+    db_project = await get_project(db, project_id=project_id, user_id=user_id)
     if not db_project:
         return None
 
     db_project.name = name
     db_project.description = description if description else None  # type: ignore
-    db.commit()
-    db.refresh(db_project)
+    if sentiment_backend:
+        db_project.sentiment_backend = sentiment_backend  # type: ignore
+    await db.commit()
+    await db.refresh(db_project)
 
     return db_project
 
 
-def delete_project(db: Session, project_id: int, user_id: int) -> None:
-    db_project = get_project(db, project_id=project_id, user_id=user_id)
+async def delete_project(db: AsyncSession, project_id: int, user_id: int) -> None:
+    db_project = await get_project(db, project_id=project_id, user_id=user_id)
     if db_project is None:
         raise ProjectNotFoundException
-    db.delete(db_project)
-    db.commit()
-
-
-def list_projects(db: Session, user_id: int) -> list[Project]:
-    db_projects_list = db.query(Project).filter(Project.user_id == user_id).all()
-    return db_projects_list
+    await db.delete(db_project)
+    await db.commit()
+
+
+def escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+async def list_projects(
+    db: AsyncSession,
+    user_id: int,
+    limit: int | None = None,
+    after_id: int | None = None,
+    name_prefix: str | None = None,
+    with_total: bool = False,
+) -> tuple[list[Project], int | None]:
+    """Projects in id order, starting after ``after_id``.
+
+    With ``with_total`` the number of projects matching the filters, ignoring
+    ``after_id`` and ``limit``, is counted by a window function in the same scan.
+    """
+    condition = Project.user_id == user_id
+    if name_prefix:
+        condition &= Project.name.like(escape_like(name_prefix) + "%", escape="\\")
+
+    if not with_total:
+        query = select(Project).where(condition)
+        if after_id is not None:
+            query = query.where(Project.id > after_id)
+        query = query.order_by(Project.id)
+        if limit is not None:
+            query = query.limit(limit)
+        result = await db.execute(query)
+        return list(result.scalars().all()), None
+
+    matching_subquery = (
+        select(Project, func.count().over().label("total"))  # type: ignore
+        .where(condition)
+        .subquery()
+    )
+    matching_project = aliased(Project, matching_subquery)
+    query = select(matching_project, matching_subquery.c.total)  # type: ignore
+    if after_id is not None:
+        query = query.where(matching_subquery.c.id > after_id)
+    query = query.order_by(matching_subquery.c.id)
+    if limit is not None:
+        query = query.limit(limit)
+    rows = (await db.execute(query)).all()
+    if rows:
+        return [row[0] for row in rows], rows[0][1]
+
+    # Past the last page there is no row to carry the window count.
+    result = await db.execute(
+        select(func.count()).select_from(Project).where(condition)  # type: ignore
+    )
+    return [], result.scalar_one()
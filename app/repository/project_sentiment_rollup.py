@@ -0,0 +1,77 @@
+from datetime import date
+
+from sqlalchemy import values  # type: ignore
+from sqlalchemy import Date, String, column, func, literal, select, true
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.sentiment_analysis import RollupGranularityE
+from app.models.project_sentiment_rollup import ProjectSentimentRollup
+from app.models.sentiment_analysis import SentimentAnalysisResult
+
+SUMMED_COLUMNS = (
+    "results_count",
+    "opinions_count",
+    "positive_count",
+    "neutral_count",
+    "negative_count",
+    "sentiment_sum",
+)
+
+
+async def add_to_project_sentiment_rollups(db: AsyncSession, result_id: int) -> None:
+    """Add a stored result to its day, week and month buckets without committing."""
+    granularities = values(column("granularity", String), name="granularities").data(
+        [(granularity.value,) for granularity in RollupGranularityE]
+    )
+    result = SentimentAnalysisResult
+    columns = [
+        result.project_id,
+        granularities.c.granularity,
+        func.date_trunc(granularities.c.granularity, result.date_from).cast(Date),
+        literal(1),
+        result.opinions_count,
+        result.positive_count,
+        result.neutral_count,
+        result.negative_count,
+        result.avg_sentiment * result.opinions_count,
+    ]
+    rows = (
+        select(*columns)  # type: ignore
+        .select_from(result.__table__)
+        .join(granularities, true())
+        .where(result.id == result_id)
+    )
+
+    stmt = insert(ProjectSentimentRollup).from_select(
+        ["project_id", "granularity", "bucket", *SUMMED_COLUMNS], rows
+    )
+    rollup = ProjectSentimentRollup.__table__.c
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[rollup.project_id, rollup.granularity, rollup.bucket],
+        set_={name: rollup[name] + stmt.excluded[name] for name in SUMMED_COLUMNS},
+    )
+    await db.execute(stmt)
+
+
+async def get_project_sentiment_rollups(
+    db: AsyncSession,
+    project_id: int,
+    granularity: RollupGranularityE,
+    date_from: date | None = None,
+    date_to: date | None = None,
+) -> list[ProjectSentimentRollup]:
+    """Buckets in date order; a bucket is included if it contains any of the range."""
+    rollup = ProjectSentimentRollup
+    query = select(rollup).where(
+        (rollup.project_id == project_id) & (rollup.granularity == granularity)
+    )
+    if date_from is not None:
+        query = query.where(
+            rollup.bucket >= func.date_trunc(granularity.value, date_from).cast(Date)
+        )
+    if date_to is not None:
+        query = query.where(rollup.bucket <= date_to)
+
+    result = await db.execute(query.order_by(rollup.bucket))
+    return list(result.scalars().all())
@@ -0,0 +1,62 @@
+from sqlalchemy import Integer, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.project_sentiment_statistics import ProjectSentimentStatistics
+
+
+def sentiment_histogram_bin(value: float) -> str:
+    return str(min(max(round(value * 100), -100), 100))
+
+
+async def add_to_project_sentiment_statistics(
+    db: AsyncSession, project_id: int, avg_sentiment: float
+) -> None:
+    """Merge one result into the project's aggregates without committing."""
+    histogram_bin = sentiment_histogram_bin(avg_sentiment)
+    stmt = insert(ProjectSentimentStatistics).values(
+        project_id=project_id,
+        results_count=1,
+        sentiment_sum=avg_sentiment,
+        sentiment_sum_squares=avg_sentiment * avg_sentiment,
+        sentiment_min=avg_sentiment,
+        sentiment_max=avg_sentiment,
+        sentiment_histogram={histogram_bin: 1},
+    )
+    statistics = ProjectSentimentStatistics
+    histogram = statistics.sentiment_histogram
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[statistics.project_id],
+        set_={
+            "results_count": statistics.results_count + stmt.excluded.results_count,
+            "sentiment_sum": statistics.sentiment_sum + stmt.excluded.sentiment_sum,
+            "sentiment_sum_squares": (
+                statistics.sentiment_sum_squares + stmt.excluded.sentiment_sum_squares
+            ),
+            "sentiment_min": func.least(
+                statistics.sentiment_min, stmt.excluded.sentiment_min
+            ),
+            "sentiment_max": func.greatest(
+                statistics.sentiment_max, stmt.excluded.sentiment_max
+            ),
+            "sentiment_histogram": histogram.op("||")(
+                func.jsonb_build_object(
+                    histogram_bin,
+                    func.coalesce(histogram[histogram_bin].astext.cast(Integer), 0) + 1,
+                )
+            ),
+            "updated_at": func.now(),
+        },
+    )
+    await db.execute(stmt)
+
+
+async def get_project_sentiment_statistics(
+    db: AsyncSession, project_id: int
+) -> ProjectSentimentStatistics | None:
+    result = await db.execute(
+        select(ProjectSentimentStatistics).where(
+            ProjectSentimentStatistics.project_id == project_id
+        )
+    )
+    return result.scalars().first()
@@ -0,0 +1,37 @@
+from sqlalchemy import func, literal
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.rate_limit_bucket import RateLimitBucket
+
+
+async def reserve_rate_limit_tokens(
+    db: AsyncSession, name: str, rate: float, capacity: float, amount: float
+) -> float:
+    """Refill the bucket for the time elapsed, take ``amount`` and return the balance.
+
+    A negative ``amount`` refunds tokens, up to the bucket's capacity.
+
+    One atomic upsert, so concurrent processes serialize on the bucket's row.
+    """
+    now = func.clock_timestamp()
+    stmt = insert(RateLimitBucket).values(
+        name=name,
+        tokens=func.least(capacity, literal(capacity) - amount),
+        updated_at=now,
+    )
+    bucket = RateLimitBucket
+    elapsed_seconds = func.extract("epoch", now - bucket.updated_at)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[bucket.name],
+        set_={
+            "tokens": func.least(
+                capacity,
+                func.least(capacity, bucket.tokens + elapsed_seconds * rate) - amount,
+            ),
+            "updated_at": now,
+        },
+    ).returning(bucket.tokens)
+    result = await db.execute(stmt)
+    await db.commit()
+    return result.scalar_one()
@@ -1,13 +1,61 @@
-from datetime import date
+import csv
+import io
+from collections.abc import AsyncIterator, Sequence
+from datetime import date, datetime
+from itertools import islice
+from typing import IO, cast
 
-from sqlalchemy import extract
-from sqlalchemy.orm import Session
+from sqlalchemy import select, tuple_
+from sqlalchemy.engine import Row  # type: ignore
+from sqlalchemy.ext.asyncio import AsyncResult, AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
 
-from app.models.sentiment_analysis import SentimentAnalysisResult
+from app.models.sentiment_analysis import OpinionSentimentScore, SentimentAnalysisResult
+from app.repository.project_sentiment_rollup import add_to_project_sentiment_rollups
+from app.repository.project_sentiment_statistics import (
+    add_to_project_sentiment_statistics,
+)
+from app.utils.tracing import tracer
 
+COPY_ROWS_PER_CHUNK = 2_000
 
-def create_sentiment_analysis_result(
-    db: Session,
+
+async def iter_result_scores_csv(
+    result_id: int, scores_csv: IO[str]
+) -> AsyncIterator[bytes]:
+    """Encode ``position,opinion_id,sentiment`` rows prefixed with the result id.
+
+    Scores are spooled before the result row exists, so its id is only added
+    here. Strings stay quoted, so an empty opinion id is not loaded as NULL.
+    """
+    rows = csv.reader(scores_csv)
+    buffer = io.StringIO(newline="")
+    writer = csv.writer(buffer, quoting=csv.QUOTE_NONNUMERIC)
+    while chunk := list(islice(rows, COPY_ROWS_PER_CHUNK)):
+        writer.writerows([result_id, *row] for row in chunk)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+
+
+async def copy_opinion_sentiment_scores(
+    db: AsyncSession, result_id: int, scores_csv: IO[str]
+) -> None:
+    """Bulk load ``position,opinion_id,sentiment`` CSV rows of a result with COPY."""
+    connection = await db.connection()
+    raw_connection = await connection.get_raw_connection()
+    # COPY bypasses the cursor events that trace the other statements.
+    with tracer.span("db.copy", {"db.table": OpinionSentimentScore.__tablename__}):
+        await raw_connection.driver_connection.copy_to_table(
+            OpinionSentimentScore.__tablename__,
+            source=iter_result_scores_csv(result_id, scores_csv),
+            columns=["result_id", "position", "opinion_id", "sentiment"],
+            format="csv",
+        )
+
+
+async def create_sentiment_analysis_result(
+    db: AsyncSession,
     project_id: int,
     user_id: int,
     date_from: date,
@@ -17,7 +65,10 @@ def create_sentiment_analysis_result(
     neutral_count: int,
     negative_count: int,
     avg_sentiment: float,
+    opinion_scores_csv: IO[str] | None = None,
+    commit: bool = True,
 ) -> SentimentAnalysisResult:
+    """Write the result and its rollups; with ``commit=False`` the caller commits."""
     db_sentiment_analysis_result = SentimentAnalysisResult(
         project_id=project_id,
         user_id=user_id,
@@ -30,27 +81,97 @@ def create_sentiment_analysis_result(
         avg_sentiment=avg_sentiment,
     )
     db.add(db_sentiment_analysis_result)
-    db.commit()
-    db.refresh(db_sentiment_analysis_result)
+    await db.flush()
+    await add_to_project_sentiment_statistics(
+        db, project_id=project_id, avg_sentiment=avg_sentiment
+    )
+    result_id = cast(int, db_sentiment_analysis_result.id)
+    await add_to_project_sentiment_rollups(db, result_id=result_id)
+    if opinion_scores_csv is not None:
+        await copy_opinion_sentiment_scores(db, result_id, opinion_scores_csv)
+    if commit:
+        await db.commit()
+    await db.refresh(db_sentiment_analysis_result)
 
     return db_sentiment_analysis_result
 
 
-def get_sentiment_analysis_results(
-    db: Session,
+def sentiment_analysis_results_filter(
+    project_id: int, user_id: int, year: int | None = None
+) -> ColumnElement[bool]:
+    condition = (SentimentAnalysisResult.project_id == project_id) & (
+        SentimentAnalysisResult.user_id == user_id
+    )
+    if year:
+        condition &= (SentimentAnalysisResult.date_from <= date(year, 12, 31)) & (
+            SentimentAnalysisResult.date_to >= date(year, 1, 1)
+        )
+    return condition
+
+
+async def get_sentiment_analysis_results(
+    db: AsyncSession,
     project_id: int,
     user_id: int,
     year: int | None = None,
+    limit: int | None = None,
+    after: tuple[datetime, int] | None = None,
 ) -> list[SentimentAnalysisResult]:
-    query = db.query(SentimentAnalysisResult).filter(
-        SentimentAnalysisResult.project_id == project_id,
-        SentimentAnalysisResult.user_id == user_id,
+    """Newest results first; ``after`` is the (created_at, id) of the last row seen.
+
+    Served by the (project_id, user_id, created_at, id) index, so a page costs the
+    same however many results the project has.
+    """
+    query = select(SentimentAnalysisResult).where(
+        sentiment_analysis_results_filter(project_id, user_id, year)
     )
 
-    if year:
-        query = query.filter(
-            (extract("year", SentimentAnalysisResult.date_from) == year)
-            | (extract("year", SentimentAnalysisResult.date_to) == year)
+    if after is not None:
+        query = query.where(
+            tuple_(SentimentAnalysisResult.created_at, SentimentAnalysisResult.id)
+            < tuple_(*after)  # type: ignore
         )
 
-    return query.order_by(SentimentAnalysisResult.created_at.desc()).all()
+    query = query.order_by(
+        SentimentAnalysisResult.created_at.desc(), SentimentAnalysisResult.id.desc()
+    )
+    if limit is not None:
+        query = query.limit(limit)
+
+    result = await db.execute(query)
+    return list(result.scalars().all())
+
+
+SENTIMENT_ANALYSIS_RESULT_EXPORT_COLUMNS = (
+    "id",
+    "project_id",
+    "user_id",
+    "date_from",
+    "date_to",
+    "opinions_count",
+    "positive_count",
+    "neutral_count",
+    "negative_count",
+    "avg_sentiment",
+    "created_at",
+)
+
+
+async def stream_sentiment_analysis_results(
+    db: AsyncSession,
+    project_id: int,
+    user_id: int,
+    year: int | None = None,
+    batch_size: int = 1_000,
+) -> AsyncIterator[Sequence[Row]]:
+    """Newest results first, as batches of plain rows read from a server-side cursor."""
+    table = SentimentAnalysisResult.__table__
+    query = (
+        select(*(table.c[name] for name in SENTIMENT_ANALYSIS_RESULT_EXPORT_COLUMNS))
+        .where(sentiment_analysis_results_filter(project_id, user_id, year))
+        .order_by(table.c.created_at.desc(), table.c.id.desc())
+        .execution_options(yield_per=batch_size)
+    )
+    result: AsyncResult = await db.stream(query)
+    async for rows in result.partitions():
+        yield rows
@@ -0,0 +1,285 @@
+from collections.abc import AsyncIterable, AsyncIterator
+from datetime import date, timedelta
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.domain.sentiment_analysis import JobStatusE
+from app.models.sentiment_analysis_job import (
+    SentimentAnalysisJob,
+    SentimentAnalysisJobUploadChunk,
+)
+
+
+async def create_sentiment_analysis_job(
+    db: AsyncSession,
+    project_id: int,
+    user_id: int,
+    date_from: date,
+    date_to: date,
+    backend: str,
+    upload_chunks: AsyncIterable[bytes],
+) -> SentimentAnalysisJob:
+    """Create a queued job, storing its upload one chunk per row.
+
+    Chunks are inserted as they arrive rather than added to the session, so
+    only the chunk being written is held in memory.
+    """
+    db_job = SentimentAnalysisJob(
+        project_id=project_id,
+        user_id=user_id,
+        date_from=date_from,
+        date_to=date_to,
+        backend=backend,
+        status=JobStatusE.QUEUED,
+    )
+    db.add(db_job)
+    await db.flush()
+
+    seq = 0
+    async for data in upload_chunks:
+        await db.execute(
+            insert(SentimentAnalysisJobUploadChunk).values(  # type: ignore
+                job_id=db_job.id, seq=seq, data=data
+            )
+        )
+        seq += 1
+    await db.commit()
+    await db.refresh(db_job)
+
+    return db_job
+
+
+async def get_sentiment_analysis_job(
+    db: AsyncSession, job_id: int, user_id: int
+) -> SentimentAnalysisJob | None:
+    result = await db.execute(
+        select(SentimentAnalysisJob)
+        .where(
+            (SentimentAnalysisJob.id == job_id)
+            & (SentimentAnalysisJob.user_id == user_id)
+        )
+        .options(selectinload(SentimentAnalysisJob.result))  # type: ignore
+    )
+    db_job = result.scalars().first()
+    return db_job
+
+
+async def iter_sentiment_analysis_job_upload(
+    db: AsyncSession, job_id: int
+) -> AsyncIterator[bytes]:
+    """Yield a job's upload chunk by chunk, loading one chunk per query."""
+    seq = 0
+    while True:
+        result = await db.execute(
+            select(SentimentAnalysisJobUploadChunk.data).where(  # type: ignore
+                (SentimentAnalysisJobUploadChunk.job_id == job_id)
+                & (SentimentAnalysisJobUploadChunk.seq == seq)
+            )
+        )
+        data = result.scalar()
+        if data is None:
+            return
+        yield data
+        seq += 1
+
+
+async def delete_sentiment_analysis_job_upload(db: AsyncSession, *job_ids: int) -> None:
+    await db.execute(
+        delete(SentimentAnalysisJobUploadChunk)  # type: ignore
+        .where(SentimentAnalysisJobUploadChunk.job_id.in_(job_ids))
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def claim_next_sentiment_analysis_job(
+    db: AsyncSession, lease_seconds: int, max_attempts: int
+) -> SentimentAnalysisJob | None:
+    """Lock and mark as running the oldest queued job, or one whose lease expired.
+
+    ``FOR UPDATE SKIP LOCKED`` lets any number of workers, on any number of
+    replicas, poll the same table without claiming a job twice. A running job
+    keeps its lease by renewing ``heartbeat_at``; one whose lease expired on
+    its last attempt is marked as failed instead of being left running.
+    """
+    lease_expired_before = func.now() - timedelta(seconds=lease_seconds)
+    result = await db.execute(
+        update(SentimentAnalysisJob)  # type: ignore
+        .where(
+            (SentimentAnalysisJob.status == JobStatusE.RUNNING)
+            & (SentimentAnalysisJob.heartbeat_at < lease_expired_before)
+            & (SentimentAnalysisJob.attempts >= max_attempts)
+        )
+        .values(
+            {
+                SentimentAnalysisJob.status: JobStatusE.FAILED,
+                SentimentAnalysisJob.error: (
+                    f"Lease expired on attempt {max_attempts} of {max_attempts}"
+                ),
+                SentimentAnalysisJob.finished_at: func.now(),
+            }
+        )
+        .returning(SentimentAnalysisJob.id)
+        .execution_options(synchronize_session=False)
+    )
+    expired_job_ids = result.scalars().all()
+    if expired_job_ids:
+        await delete_sentiment_analysis_job_upload(db, *expired_job_ids)
+        await db.commit()
+
+    result = await db.execute(
+        select(SentimentAnalysisJob)
+        .where(
+            (
+                (SentimentAnalysisJob.status == JobStatusE.QUEUED)
+                | (
+                    (SentimentAnalysisJob.status == JobStatusE.RUNNING)
+                    & (SentimentAnalysisJob.heartbeat_at < lease_expired_before)
+                )
+            )
+            & (SentimentAnalysisJob.attempts < max_attempts)
+        )
+        .order_by(SentimentAnalysisJob.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    )
+    db_job = result.scalars().first()
+    if not db_job:
+        await db.rollback()
+        return None
+
+    db_job.status = JobStatusE.RUNNING  # type: ignore
+    db_job.started_at = func.now()  # type: ignore
+    db_job.heartbeat_at = func.now()  # type: ignore
+    db_job.attempts = SentimentAnalysisJob.attempts + 1  # type: ignore
+    db_job.opinions_done = 0  # type: ignore
+    await db.commit()
+    await db.refresh(db_job)
+
+    return db_job
+
+
+def claimed_sentiment_analysis_job_filter(
+    job_id: int, attempt: int
+) -> ColumnElement[bool]:
+    """Match the job only while the given attempt still holds it.
+
+    Once a lease expires another worker may claim the job, bumping
+    ``attempts``; updates from the earlier attempt then match no row.
+    """
+    return (
+        (SentimentAnalysisJob.id == job_id)
+        & (SentimentAnalysisJob.attempts == attempt)
+        & (SentimentAnalysisJob.status == JobStatusE.RUNNING)
+    )
+
+
+async def update_sentiment_analysis_job_progress(
+    db: AsyncSession,
+    job_id: int,
+    attempt: int,
+    opinions_done: int,
+) -> None:
+    """Record a running job's progress, renewing its lease."""
+    await db.execute(
+        update(SentimentAnalysisJob)  # type: ignore
+        .where(claimed_sentiment_analysis_job_filter(job_id, attempt))
+        .values(
+            {
+                SentimentAnalysisJob.opinions_done: opinions_done,
+                SentimentAnalysisJob.heartbeat_at: func.now(),
+            }
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+
+
+async def renew_sentiment_analysis_job_lease(
+    db: AsyncSession, job_id: int, attempt: int
+) -> None:
+    await db.execute(
+        update(SentimentAnalysisJob)  # type: ignore
+        .where(claimed_sentiment_analysis_job_filter(job_id, attempt))
+        .values({SentimentAnalysisJob.heartbeat_at: func.now()})
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+
+
+async def complete_sentiment_analysis_job(
+    db: AsyncSession,
+    job_id: int,
+    attempt: int,
+    result_id: int,
+    opinions_done: int,
+    opinions_total: int,
+) -> bool:
+    """Mark the job as succeeded and commit it together with its result.
+
+    The result is written, uncommitted, in the same transaction beforehand. If
+    the attempt lost its lease the transaction is rolled back, result included,
+    and False is returned.
+    """
+    result = await db.execute(
+        update(SentimentAnalysisJob)  # type: ignore
+        .where(claimed_sentiment_analysis_job_filter(job_id, attempt))
+        .values(
+            {
+                SentimentAnalysisJob.status: JobStatusE.SUCCEEDED,
+                SentimentAnalysisJob.result_id: result_id,
+                SentimentAnalysisJob.opinions_done: opinions_done,
+                SentimentAnalysisJob.opinions_total: opinions_total,
+                SentimentAnalysisJob.error: None,
+                SentimentAnalysisJob.finished_at: func.now(),
+            }
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        await db.rollback()
+        return False
+    await delete_sentiment_analysis_job_upload(db, job_id)
+    await db.commit()
+    return True
+
+
+async def requeue_sentiment_analysis_job(
+    db: AsyncSession, job_id: int, attempt: int, error: str
+) -> None:
+    """Put the job back in the queue, keeping its upload for the next attempt."""
+    await db.execute(
+        update(SentimentAnalysisJob)  # type: ignore
+        .where(claimed_sentiment_analysis_job_filter(job_id, attempt))
+        .values(
+            {
+                SentimentAnalysisJob.status: JobStatusE.QUEUED,
+                SentimentAnalysisJob.error: error,
+            }
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+
+
+async def fail_sentiment_analysis_job(
+    db: AsyncSession, job_id: int, attempt: int, error: str
+) -> None:
+    result = await db.execute(
+        update(SentimentAnalysisJob)  # type: ignore
+        .where(claimed_sentiment_analysis_job_filter(job_id, attempt))
+        .values(
+            {
+                SentimentAnalysisJob.status: JobStatusE.FAILED,
+                SentimentAnalysisJob.error: error,
+                SentimentAnalysisJob.finished_at: func.now(),
+            }
+        )
+        .execution_options(synchronize_session=False)
+    )
+    # The upload belongs to whichever attempt holds the job now.
+    if result.rowcount:
+        await delete_sentiment_analysis_job_upload(db, job_id)
+    await db.commit()
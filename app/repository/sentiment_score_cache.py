@@ -0,0 +1,41 @@
+from sqlalchemy import String, any_, bindparam, select
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.sentiment_score_cache import SentimentScoreCache
+
+
+async def get_cached_scores(db: AsyncSession, keys: list[str]) -> dict[str, float]:
+    if not keys:
+        return {}
+
+    # One array parameter rather than one per key: a backfill batch can look up
+    # more keys than asyncpg's 32767 bind parameters.
+    key, sentiment = SentimentScoreCache.key, SentimentScoreCache.sentiment
+    keys_param = bindparam("keys", keys, type_=ARRAY(String))
+    stmt = select(key, sentiment).where(key == any_(keys_param))  # type: ignore
+    rows = await db.execute(stmt)
+    return {key: sentiment for key, sentiment in rows}
+
+
+async def save_cached_scores(
+    db: AsyncSession, scores: dict[str, float], model: str, prompt_version: str
+) -> None:
+    if not scores:
+        return
+
+    stmt = insert(SentimentScoreCache).on_conflict_do_nothing(
+        index_elements=[SentimentScoreCache.key]
+    )
+    await db.execute(
+        stmt,
+        [
+            {
+                "key": key,
+                "model": model,
+                "prompt_version": prompt_version,
+                "sentiment": sentiment,
+            }
+            for key, sentiment in scores.items()
+        ],
+    )
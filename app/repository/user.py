@@ -2,14 +2,16 @@ from datetime import datetime
 from typing import cast
 
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domain.user import User, UserAuth
+from app.models.token import AuthToken
 from app.models.user import User as UserModel
 
 
-def get_user(db: Session, user_id: int) -> User | None:
-    db_user = db.query(UserModel).filter_by(id=user_id).first()
+async def get_user(db: AsyncSession, user_id: int) -> User | None:
+    result = await db.execute(select(UserModel).where(UserModel.id == user_id))
+    db_user = result.scalars().first()
     if not db_user:
         return None
 
@@ -22,8 +24,29 @@ def get_user(db: Session, user_id: int) -> User | None:
     return user
 
 
-def get_user_auth(db: Session, email: str) -> UserAuth | None:
-    db_user = db.query(UserModel).filter(UserModel.email == email).first()
+async def get_user_by_token(db: AsyncSession, token: str) -> User | None:
+    stmt = (
+        select(UserModel)
+        .join(AuthToken, AuthToken.user_id == UserModel.id)  # type: ignore
+        .where(AuthToken.token == token)
+    )
+    result = await db.execute(stmt)
+    db_user = result.scalars().first()
+    if not db_user:
+        return None
+
+    user = User(
+        id=db_user.id,
+        username=db_user.username,
+        email=db_user.email,
+        created_at=db_user.created_at,
+    )
+    return user
+
+
+async def get_user_auth(db: AsyncSession, email: str) -> UserAuth | None:
+    result = await db.execute(select(UserModel).where(UserModel.email == email))
+    db_user = result.scalars().first()
     if not db_user:
         return None
 
@@ -37,11 +60,13 @@ def get_user_auth(db: Session, email: str) -> UserAuth | None:
     return user
 
 
-def create_user(db: Session, *, email: str, username: str, password_hash: str) -> User:
+async def create_user(
+    db: AsyncSession, *, email: str, username: str, password_hash: str
+) -> User:
     db_user = UserModel(username=username, email=email, password_hash=password_hash)
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
 
     user = User(
         id=cast(int, db_user.id),
@@ -52,8 +77,9 @@ def create_user(db: Session, *, email: str, username: str, password_hash: str) -
     return user
 
 
-def get_user_by_email(db: Session, email: str) -> User | None:
-    db_user = db.query(UserModel).filter(UserModel.email == email).first()
+async def get_user_by_email(db: AsyncSession, email: str) -> User | None:
+    result = await db.execute(select(UserModel).where(UserModel.email == email))
+    db_user = result.scalars().first()
     if not db_user:
         return None
 
@@ -66,13 +92,15 @@ def get_user_by_email(db: Session, email: str) -> User | None:
     return user
 
 
-def is_email_or_login_taken(db: Session, *, email: str, username: str) -> bool:
+async def is_email_or_login_taken(
+    db: AsyncSession, *, email: str, username: str
+) -> bool:
     stmt = (
         select(UserModel.id)  # type: ignore
         .where((UserModel.email == email) | (UserModel.username == username))
         .limit(1)
     )
-    result = db.execute(stmt).scalar_one_or_none()
+    result = (await db.execute(stmt)).scalar_one_or_none()
     is_taken = result is not None
 
     return is_taken
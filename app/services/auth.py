@@ -1,14 +1,82 @@
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
 
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.core.config import settings
+from app.domain.user import User
 from app.repository import auth_token as auth_token_repo
 from app.repository import user as user_repo
 
 pwd_context = CryptContext(schemes=["sha256_crypt"], deprecated="auto")
 
 
+@dataclass
+class AuthUserCacheEntry:
+    user: User
+    expires_at: float
+
+
+class AuthUserCache:
+    """Bounded token -> user cache whose entries expire after ``ttl_seconds``.
+
+    Entries are never invalidated early: tokens are not revoked and users are
+    not edited anywhere, so a cached user is at most ``AUTH_CACHE_TTL_SECONDS``
+    stale. Any future logout or user update path must account for that.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, AuthUserCacheEntry] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, token: str) -> User | None:
+        entry = self._entries.get(token)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            del self._entries[token]
+            return None
+        self._entries.move_to_end(token)
+        return entry.user
+
+    def set(self, token: str, user: User) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        self._entries[token] = AuthUserCacheEntry(
+            user=user, expires_at=time.monotonic() + self.ttl_seconds
+        )
+        self._entries.move_to_end(token)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+auth_user_cache = AuthUserCache(
+    max_entries=settings.AUTH_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS,
+)
+
+
+async def get_user_by_token(db: AsyncSession, token: str) -> User | None:
+    """Resolve a bearer token, hitting the database only on a cache miss."""
+    user = auth_user_cache.get(token)
+    if user is not None:
+        return user
+
+    user = await user_repo.get_user_by_token(db, token)
+    if user is not None:
+        auth_user_cache.set(token, user)
+    return user
+
+
 @dataclass
 class RegisterUserInputData:
     username: str
@@ -25,10 +93,10 @@ class EmailOrUsernameTakenException(Exception):
     pass
 
 
-def register_user(
-    db: Session, register_user_input_data: RegisterUserInputData
+async def register_user(
+    db: AsyncSession, register_user_input_data: RegisterUserInputData
 ) -> RegisterUserOutputData:
-    is_email_or_login_taken = user_repo.is_email_or_login_taken(
+    is_email_or_login_taken = await user_repo.is_email_or_login_taken(
         db,
         email=register_user_input_data.email,
         username=register_user_input_data.username,
@@ -38,14 +106,14 @@ def register_user(
 
     password_hash = pwd_context.hash(register_user_input_data.password)
 
-    user = user_repo.create_user(
+    user = await user_repo.create_user(
         db,
         email=register_user_input_data.email,
         username=register_user_input_data.username,
         password_hash=password_hash,
     )
 
-    auth_token_data = auth_token_repo.create_auth_token(db, user_id=user.id)
+    auth_token_data = await auth_token_repo.create_auth_token(db, user_id=user.id)
     register_user_output_data = RegisterUserOutputData(token=auth_token_data.token)
 
     return register_user_output_data
@@ -70,10 +138,10 @@ class IncorrectLoginDetailsException(Exception):
     pass
 
 
-def login_user(
-    db: Session, login_user_input_data: LoginUserInputData
+async def login_user(
+    db: AsyncSession, login_user_input_data: LoginUserInputData
 ) -> LoginUserOutputData:
-    user_auth = user_repo.get_user_auth(db, login_user_input_data.email)
+    user_auth = await user_repo.get_user_auth(db, login_user_input_data.email)
     if not user_auth:
         raise IncorrectLoginDetailsException
 
@@ -83,7 +151,7 @@ def login_user(
     if not is_password_verified:
         raise IncorrectLoginDetailsException
 
-    auth_token_data = auth_token_repo.get_auth_token(db, user_id=user_auth.id)
+    auth_token_data = await auth_token_repo.get_auth_token(db, user_id=user_auth.id)
     assert auth_token_data
 
     login_user_output_data = LoginUserOutputData(
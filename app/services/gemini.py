@@ -0,0 +1,147 @@
+import asyncio
+import random
+import time
+
+import httpx
+from google import genai
+from google.genai import errors, types
+
+from app.api.core.config import settings
+from app.services.rate_limit import RateLimiter, gemini_rate_limiter
+from app.utils.metrics import (
+    GEMINI_ERRORS,
+    GEMINI_REQUEST_DURATION,
+    get_error_type,
+    record_gemini_usage,
+)
+from app.utils.tracing import tracer
+
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+_client: genai.Client | None = None
+
+
+def create_gemini_client(
+    http_client: httpx.AsyncClient | None = None,
+) -> genai.Client:
+    if http_client is None:
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.GEMINI_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.GEMINI_MAX_CONNECTIONS,
+            ),
+        )
+
+    http_options = types.HttpOptions(
+        base_url=settings.GEMINI_BASE_URL,
+        timeout=settings.GEMINI_TIMEOUT_MS,
+        httpx_async_client=http_client,
+    )
+    return genai.Client(api_key=settings.GEMINI_API_KEY, http_options=http_options)
+
+
+def init_gemini_client() -> None:
+    global _client
+    if _client is None:
+        _client = create_gemini_client()
+
+
+async def close_gemini_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aio.aclose()
+        _client.close()
+        _client = None
+
+
+def get_gemini_client() -> genai.Client:
+    """Return the process-wide client, creating it outside the app lifespan."""
+    if _client is None:
+        init_gemini_client()
+    assert _client is not None
+    return _client
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """Quota, overload and transport errors, which a later attempt can survive."""
+    if isinstance(error, errors.APIError):
+        return error.code in RETRYABLE_STATUS_CODES
+    return isinstance(error, httpx.TransportError)
+
+
+def get_retry_delay(attempt: int, error: BaseException) -> float:
+    """Exponential backoff with full jitter, but no sooner than ``Retry-After``."""
+    backoff = min(
+        settings.GEMINI_RETRY_MAX_DELAY_SECONDS,
+        settings.GEMINI_RETRY_BASE_DELAY_SECONDS * 2**attempt,
+    )
+    delay = random.uniform(0, backoff)
+
+    response = getattr(error, "response", None)
+    retry_after = getattr(response, "headers", {}).get("retry-after")
+    if retry_after is not None:
+        try:
+            delay = max(delay, float(retry_after))
+        except ValueError:
+            pass
+    return delay
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // 4 + 1
+
+
+async def generate_content(
+    client: genai.Client,
+    contents: str,
+    config: types.GenerateContentConfig,
+    expected_output_tokens: int = 0,
+    rate_limiter: RateLimiter = gemini_rate_limiter,
+) -> types.GenerateContentResponse:
+    """Call ``generate_content`` within the rate limits, retrying transient errors."""
+    estimated_tokens = (
+        estimate_tokens(contents)
+        + estimate_tokens(str(config.system_instruction or ""))
+        + expected_output_tokens
+    )
+    attempt = 0
+    while True:
+        await rate_limiter.acquire(estimated_tokens)
+        start = time.perf_counter()
+        try:
+            with tracer.span(
+                "gemini.generate_content",
+                {
+                    "gemini.model": settings.GEMINI_MODEL,
+                    "gemini.attempt": attempt,
+                    "prompt.chars": len(contents),
+                },
+            ) as span:
+                response = await client.aio.models.generate_content(
+                    model=settings.GEMINI_MODEL, contents=contents, config=config
+                )
+                usage = response.usage_metadata
+                if usage is not None:
+                    span.set_attributes(
+                        {
+                            "tokens.prompt": usage.prompt_token_count or 0,
+                            "tokens.output": usage.candidates_token_count or 0,
+                        }
+                    )
+        except Exception as e:
+            GEMINI_REQUEST_DURATION.observe(time.perf_counter() - start)
+            GEMINI_ERRORS.labels(get_error_type(e)).inc()
+            if attempt >= settings.GEMINI_MAX_RETRIES or not is_retryable_error(e):
+                raise
+            delay = get_retry_delay(attempt, e)
+            rate_limiter.record_retry(delay)
+            await asyncio.sleep(delay)
+            attempt += 1
+            continue
+
+        GEMINI_REQUEST_DURATION.observe(time.perf_counter() - start)
+        if usage is not None:
+            record_gemini_usage(usage)
+        if usage is not None and usage.total_token_count is not None:
+            await rate_limiter.settle(estimated_tokens, usage.total_token_count)
+        return response
@@ -0,0 +1,141 @@
+"""Request and token quotas for Gemini calls.
+
+Buckets hand out reservations instead of making callers poll: a reservation
+always succeeds, may leave the bucket in debt, and tells the caller how long
+to sleep until the debt is repaid. Waiters are therefore served in arrival
+order and calls go out at the refill rate, which keeps throughput at the quota
+without tripping it.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Protocol
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.api.core.config import settings
+from app.api.dependencies.database import SessionLocal
+from app.domain.sentiment_analysis import RateLimitScopeE
+from app.repository.rate_limit_bucket import reserve_rate_limit_tokens
+
+
+class Bucket(Protocol):
+    rate: float
+
+    async def reserve(self, amount: float) -> float:
+        """Take ``amount`` and return the seconds to wait before using it."""
+        ...
+
+
+class TokenBucket:
+    """In-process bucket refilled at ``rate`` per second up to ``capacity``."""
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    async def reserve(self, amount: float) -> float:
+        now = time.monotonic()
+        refilled = self.tokens + (now - self.updated_at) * self.rate
+        # A negative amount refunds an overestimate, but never past capacity.
+        self.tokens = min(self.capacity, min(self.capacity, refilled) - amount)
+        self.updated_at = now
+        return max(-self.tokens / self.rate, 0.0)
+
+
+class DatabaseTokenBucket:
+    """Bucket kept in ``rate_limit_buckets``, shared by every API and worker process."""
+
+    def __init__(
+        self,
+        name: str,
+        rate: float,
+        capacity: float,
+        session_factory: async_sessionmaker[AsyncSession] = SessionLocal,
+    ) -> None:
+        self.name = name
+        self.rate = rate
+        self.capacity = capacity
+        self.session_factory = session_factory
+
+    async def reserve(self, amount: float) -> float:
+        async with self.session_factory() as db:
+            tokens = await reserve_rate_limit_tokens(
+                db,
+                name=self.name,
+                rate=self.rate,
+                capacity=self.capacity,
+                amount=amount,
+            )
+        return max(-tokens / self.rate, 0.0)
+
+
+@dataclass
+class RateLimiterStats:
+    requests: int = 0
+    throttled_requests: int = 0
+    throttled_seconds: float = 0.0
+    retries: int = 0
+    retry_wait_seconds: float = 0.0
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute limits; ``None`` means no limit."""
+
+    def __init__(
+        self,
+        requests_bucket: Bucket | None = None,
+        tokens_bucket: Bucket | None = None,
+    ) -> None:
+        self.requests_bucket = requests_bucket
+        self.tokens_bucket = tokens_bucket
+        self.stats = RateLimiterStats()
+
+    async def acquire(self, tokens: int) -> None:
+        delay = 0.0
+        if self.requests_bucket is not None:
+            delay = await self.requests_bucket.reserve(1)
+        if self.tokens_bucket is not None:
+            delay = max(delay, await self.tokens_bucket.reserve(tokens))
+
+        self.stats.requests += 1
+        if delay > 0:
+            self.stats.throttled_requests += 1
+            self.stats.throttled_seconds += delay
+            await asyncio.sleep(delay)
+
+    async def settle(self, estimated_tokens: int, used_tokens: int) -> None:
+        """Charge or refund the difference between the estimate and actual usage."""
+        if self.tokens_bucket is not None and used_tokens != estimated_tokens:
+            await self.tokens_bucket.reserve(used_tokens - estimated_tokens)
+
+    def record_retry(self, delay: float) -> None:
+        self.stats.retries += 1
+        self.stats.retry_wait_seconds += delay
+
+    def get_stats(self) -> RateLimiterStats:
+        return self.stats
+
+    def reset_stats(self) -> None:
+        self.stats = RateLimiterStats()
+
+
+def create_bucket(name: str, per_minute: int) -> Bucket | None:
+    if per_minute <= 0:
+        return None
+    rate = per_minute / 60
+    # One second's worth of burst: enough to absorb jitter between callers
+    # without letting a burst exceed the per-minute quota.
+    capacity = max(rate, 1.0)
+    if settings.GEMINI_RATE_LIMIT_SCOPE == RateLimitScopeE.DATABASE:
+        return DatabaseTokenBucket(name, rate=rate, capacity=capacity)
+    return TokenBucket(rate=rate, capacity=capacity)
+
+
+gemini_rate_limiter = RateLimiter(
+    requests_bucket=create_bucket("gemini:requests", settings.GEMINI_RPM_LIMIT),
+    tokens_bucket=create_bucket("gemini:tokens", settings.GEMINI_TPM_LIMIT),
+)
@@ -1,34 +1,36 @@
 import csv
-import io
-import json
-from dataclasses import dataclass
+import math
+import tempfile
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+from dataclasses import dataclass, field
 from datetime import date, datetime
-from statistics import StatisticsError, mean, median, pstdev
+from statistics import mean
+from typing import cast
 
-from fastapi import HTTPException
-from google import genai
-from google.genai import types
-from sqlalchemy.orm import Session
-from starlette.datastructures import UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.core.config import settings
+from app.domain.sentiment_analysis import (
+    Opinion,
+    OpinionsSentiment,
+    RollupGranularityE,
+    SentimentBackendE,
+)
+from app.repository.project_sentiment_rollup import get_project_sentiment_rollups
+from app.repository.project_sentiment_statistics import (
+    get_project_sentiment_statistics,
+)
 from app.repository.sentiment_analysis import (
     create_sentiment_analysis_result,
-    get_sentiment_analysis_results,
 )
-from app.utils.prompts import PromptTypeE, get_prompt
-
-
-@dataclass
-class Opinion:
-    id: str
-    content: str
-
-
-@dataclass
-class OpinionsSentiment:
-    id: str
-    sentiment: float
+from app.services.sentiment_backends import get_sentiment_backend
+from app.services.sentiment_backends.base import ProgressCallback, SentimentBackend
+from app.services.sentiment_cache import score_cache, score_cache_key
+from app.services.sentiment_dedup import dedup_digest, group_duplicate_opinions
+from app.utils.csv_stream import AsyncReader, iter_csv_rows
+from app.utils.metrics import OPINIONS_SCORED
+from app.utils.prompts import get_prompt_version
+from app.utils.tracing import tracer
 
 
 @dataclass
@@ -36,36 +38,118 @@ class OpinionsSentimentAverage:
     value: float
 
 
-def get_sentiment_values(
+async def get_sentiment_values(
+    db: AsyncSession,
     opinions_list: list[Opinion],
+    backend: SentimentBackend,
+    on_progress: ProgressCallback | None = None,
+    scores_by_key: dict[bytes, float] | None = None,
 ) -> list[OpinionsSentiment]:
-    opinions_str = opinions_list_to_str(opinions_list)
-    client = genai.Client(api_key=settings.GEMINI_API_KEY)
-
-    try:
-        response = client.models.generate_content(
-            model="gemini-2.5-flash",
-            contents=get_prompt(PromptTypeE.CONTENT) + opinions_str,
-            config=types.GenerateContentConfig(
-                system_instruction=get_prompt(PromptTypeE.SYSTEM_INSTRUCTIONS),
-                response_mime_type="application/json",
-            ),
+    """Score each distinct opinion once and fan the score out to its duplicates.
+
+    Duplicates are grouped within ``opinions_list``. Passing the same
+    ``scores_by_key`` for every batch of an upload also reuses scores across
+    batches: it maps the digest of each scored dedup key to its score, and
+    holds at most ``SENTIMENT_DEDUP_MAX_KEYS`` of them. Near-duplicates are only
+    found within a batch.
+    """
+    with tracer.span(
+        "sentiment.score_batch",
+        {"sentiment.backend": backend.name, "opinions.count": len(opinions_list)},
+    ) as span:
+        if not settings.SENTIMENT_DEDUP:
+            return await get_cached_sentiment_values(
+                db, opinions_list, backend, on_progress=on_progress
+            )
+
+        groups = group_duplicate_opinions(
+            opinions_list,
+            near_duplicates=settings.SENTIMENT_DEDUP_NEAR_DUPLICATES,
+            similarity=settings.SENTIMENT_DEDUP_SIMILARITY,
+            permutations=settings.SENTIMENT_DEDUP_MINHASH_PERMUTATIONS,
         )
+        if scores_by_key is None:
+            scores_by_key = {}
+        digests = [dedup_digest(key) for key in groups.representative_keys]
+        scored = {
+            representative.id: scores_by_key[digest]
+            for representative, digest in zip(groups.representatives, digests)
+            if digest in scores_by_key
+        }
+        unscored = [
+            representative
+            for representative in groups.representatives
+            if representative.id not in scored
+        ]
+        span.set_attribute("opinions.distinct", len(groups.representatives))
+        span.set_attribute("dedup.earlier_batch_hits", len(scored))
+        reused_count = len(opinions_list) - len(unscored)
+        if on_progress is not None and reused_count:
+            await on_progress(reused_count)
+
+        for value in await get_cached_sentiment_values(
+            db, unscored, backend, on_progress=on_progress
+        ):
+            scored[value.id] = value.sentiment
+            if len(scores_by_key) < settings.SENTIMENT_DEDUP_MAX_KEYS:
+                scores_by_key[digests[int(value.id)]] = value.sentiment
+        return [
+            OpinionsSentiment(id=opinion.id, sentiment=scored[str(index)])
+            for opinion, index in zip(opinions_list, groups.representative_indexes)
+            if str(index) in scored
+        ]
+
+
+async def get_cached_sentiment_values(
+    db: AsyncSession,
+    opinions_list: list[Opinion],
+    backend: SentimentBackend,
+    on_progress: ProgressCallback | None = None,
+) -> list[OpinionsSentiment]:
+    """Score opinions, sending only the ones missing from the score cache."""
+    if not backend.cacheable:
+        return await backend.score(opinions_list, on_progress=on_progress)
+
+    model = backend.model
+    prompt_version = get_prompt_version()
+    keys = [
+        score_cache_key(opinion.content, model=model, prompt_version=prompt_version)
+        for opinion in opinions_list
+    ]
+    cached_scores = await score_cache.get_many(db, keys)
 
-        if response.text is None:
-            raise HTTPException(status_code=400, detail="Failed to get response.")
+    uncached_opinions = [
+        opinion for opinion, key in zip(opinions_list, keys) if key not in cached_scores
+    ]
+    tracer.current_span().set_attribute("cache.hits", len(cached_scores))
+    if on_progress is not None:
+        await on_progress(len(opinions_list) - len(uncached_opinions))
+    scored = {}
+    if uncached_opinions:
+        scored = {
+            value.id: value.sentiment
+            for value in await backend.score(uncached_opinions, on_progress=on_progress)
+        }
+
+    new_scores = {}
+    opinions_sentiment_values = []
+    for opinion, key in zip(opinions_list, keys):
+        if key in cached_scores:
+            sentiment = cached_scores[key]
+        elif opinion.id in scored:
+            sentiment = scored[opinion.id]
+            new_scores[key] = sentiment
         else:
-            data = json.loads(response.text)
-            opinions_sentiment_values = [
-                OpinionsSentiment(id=k, sentiment=v) for k, v in data.items()
-            ]
-            return opinions_sentiment_values
-
-    except Exception as e:
-        raise HTTPException(
-            status_code=400, detail=f"Failed to generate sentiment {e}."
+            continue
+        opinions_sentiment_values.append(
+            OpinionsSentiment(id=opinion.id, sentiment=sentiment)
         )
 
+    await score_cache.set_many(
+        db, new_scores, model=model, prompt_version=prompt_version
+    )
+    return opinions_sentiment_values
+
 
 def get_sentiment_average_value(
     opinions_sentiment: list[OpinionsSentiment],
@@ -75,59 +159,146 @@ def get_sentiment_average_value(
     return OpinionsSentimentAverage(value=average_sentiment)
 
 
-def opinions_list_to_str(opinions_list: list[Opinion]) -> str:
-    opinions_str = ", ".join(
-        f"{opinion.id}: {opinion.content}" for opinion in opinions_list
-    )
-    return opinions_str
+async def iter_opinions_csv(file: AsyncReader) -> AsyncIterator[Opinion]:
+    async for row in iter_csv_rows(file):
+        if row:
+            yield Opinion(id=row[0], content=row[1])
+
+
+async def iter_opinion_batches(
+    opinions: Iterable[Opinion] | AsyncIterable[Opinion], batch_size: int
+) -> AsyncIterator[list[Opinion]]:
+    """Group opinions into batches, tracing the time spent reading each one.
+
+    The spans are never made current: a generator runs in its consumer's
+    context, so they would leak into it between batches.
+    """
+    batch: list[Opinion] = []
+    span = tracer.start_span("opinions.read_batch")
+    if isinstance(opinions, AsyncIterable):
+        async for opinion in opinions:
+            batch.append(opinion)
+            if len(batch) >= batch_size:
+                span.set_attribute("opinions.count", len(batch))
+                tracer.end_span(span)
+                yield batch
+                batch = []
+                span = tracer.start_span("opinions.read_batch")
+    else:
+        for opinion in opinions:
+            batch.append(opinion)
+            if len(batch) >= batch_size:
+                span.set_attribute("opinions.count", len(batch))
+                tracer.end_span(span)
+                yield batch
+                batch = []
+                span = tracer.start_span("opinions.read_batch")
+    if batch:
+        span.set_attribute("opinions.count", len(batch))
+        tracer.end_span(span)
+        yield batch
 
 
-async def opinions_csv_to_list(file: UploadFile) -> list[Opinion]:
-    content = await file.read()
-    text = content.decode("utf-8")
+@dataclass
+class SentimentAnalysisStatisticalMeasures:
+    results_count: int
+    min: float | None
+    max: float | None
+    mean: float | None
+    median: float | None
+    std: float | None
+
+
+def histogram_median(histogram: dict[str, int], count: int) -> float:
+    """Median of the values in a histogram keyed by value in hundredths."""
+    middle = {(count - 1) // 2, count // 2}
+    middle_values = []
+    seen = 0
+    for value in sorted(int(key) for key in histogram):
+        bin_count = histogram[str(value)]
+        middle_values += [value] * sum(
+            seen <= position < seen + bin_count for position in middle
+        )
+        seen += bin_count
+        if seen > count // 2:
+            break
+    return round(sum(middle_values) / len(middle_values) / 100, 3)
 
-    reader = csv.reader(io.StringIO(text))
 
-    opinions_list = [Opinion(id=row[0], content=row[1]) for row in reader if row]
+async def calculate_statistical_measures(
+    db: AsyncSession,
+    project_id: int,
+) -> SentimentAnalysisStatisticalMeasures:
+    statistics = await get_project_sentiment_statistics(db, project_id=project_id)
+    if statistics is None or not statistics.results_count:
+        return SentimentAnalysisStatisticalMeasures(
+            results_count=0, min=None, max=None, mean=None, median=None, std=None
+        )
 
-    return opinions_list
+    count = statistics.results_count
+    exact_mean = cast(float, statistics.sentiment_sum) / count
+    variance = max(
+        cast(float, statistics.sentiment_sum_squares) / count - exact_mean**2, 0.0
+    )
+
+    return SentimentAnalysisStatisticalMeasures(
+        results_count=count,
+        min=cast(float, statistics.sentiment_min),
+        max=cast(float, statistics.sentiment_max),
+        mean=round(exact_mean, 2),
+        median=histogram_median(
+            cast(dict[str, int], statistics.sentiment_histogram), count
+        ),
+        std=round(math.sqrt(variance), 2),
+    )
 
 
 @dataclass
-class SentimentAnalysisStatisticalMeasures:
-    min: float
-    max: float
-    mean: float
-    median: float
-    std: float
+class SentimentRollupBucket:
+    bucket: date
+    results_count: int
+    opinions_count: int
+    positive_count: int
+    neutral_count: int
+    negative_count: int
+    avg_sentiment: float | None
 
 
-def calculate_statistical_measures(
-    db: Session,
+async def get_sentiment_rollups(
+    db: AsyncSession,
     project_id: int,
-    user_id: int,
-) -> SentimentAnalysisStatisticalMeasures:
-    sentiment_analysis_results = get_sentiment_analysis_results(
-        db=db,
+    granularity: RollupGranularityE,
+    date_from: date | None = None,
+    date_to: date | None = None,
+) -> list[SentimentRollupBucket]:
+    rollups = await get_project_sentiment_rollups(
+        db,
         project_id=project_id,
-        user_id=user_id,
+        granularity=granularity,
+        date_from=date_from,
+        date_to=date_to,
     )
-    values = [
-        float(sentiment_analysis_result.avg_sentiment)
-        for sentiment_analysis_result in sentiment_analysis_results
+    return [
+        SentimentRollupBucket(
+            bucket=cast(date, rollup.bucket),
+            results_count=rollup.results_count,
+            opinions_count=rollup.opinions_count,
+            positive_count=rollup.positive_count,
+            neutral_count=rollup.neutral_count,
+            negative_count=rollup.negative_count,
+            avg_sentiment=(
+                round(cast(float, rollup.sentiment_sum) / rollup.opinions_count, 2)
+                if rollup.opinions_count
+                else None
+            ),
+        )
+        for rollup in rollups
     ]
 
-    return SentimentAnalysisStatisticalMeasures(
-        min=min(values),
-        max=max(values),
-        mean=round(mean(values), 2),
-        median=median(values),
-        std=round(pstdev(values), 2),
-    )
-
 
 @dataclass
 class SentimentAnalysisResult:
+    id: int
     project_id: int
     user_id: int
     date_from: date
@@ -140,52 +311,115 @@ class SentimentAnalysisResult:
     created_at: datetime
 
 
-def analyze_sentiment(
-    db: Session,
+@dataclass
+class SentimentCounts:
+    """Running counts over batches of scores, summed exactly at the end."""
+
+    opinions_count: int = 0
+    positive_count: int = 0
+    neutral_count: int = 0
+    negative_count: int = 0
+    sentiment_sums: list[float] = field(default_factory=list)
+
+    def add(self, sentiments: list[float]) -> None:
+        self.opinions_count += len(sentiments)
+        self.positive_count += sum(1 for sentiment in sentiments if sentiment > 0.05)
+        self.negative_count += sum(1 for sentiment in sentiments if sentiment < -0.05)
+        self.neutral_count += sum(
+            1 for sentiment in sentiments if -0.05 <= sentiment <= 0.05
+        )
+        self.sentiment_sums.append(math.fsum(sentiments))
+
+    @property
+    def avg_sentiment(self) -> float:
+        if not self.opinions_count:
+            return 0.0
+        return round(math.fsum(self.sentiment_sums) / self.opinions_count, 2)
+
+
+async def analyze_sentiment(
+    db: AsyncSession,
     project_id: int,
     user_id: int,
     date_from: date,
     date_to: date,
-    opinions_list: list[Opinion],
+    opinions_list: Iterable[Opinion] | AsyncIterable[Opinion],
+    backend: SentimentBackendE = SentimentBackendE.GEMINI,
+    on_progress: ProgressCallback | None = None,
+    commit: bool = True,
 ) -> SentimentAnalysisResult:
-
-    opinions_sentiment_values = get_sentiment_values(opinions_list)
-    opinions_count = len(opinions_sentiment_values)
-    positive_count = sum(1 for o in opinions_sentiment_values if o.sentiment > 0.05)
-
-    negative_count = sum(1 for o in opinions_sentiment_values if o.sentiment < -0.05)
-
-    neutral_count = sum(
-        1 for o in opinions_sentiment_values if -0.05 <= o.sentiment <= 0.05
-    )
-    try:
-        avg_sentiment = round(mean(o.sentiment for o in opinions_sentiment_values), 2)
-    except StatisticsError:
-        avg_sentiment = 0.0
-
-    sentiment_analysis_result_repo = create_sentiment_analysis_result(
-        db,
-        project_id=project_id,
-        user_id=user_id,
-        date_from=date_from,
-        date_to=date_to,
-        opinions_count=opinions_count,
-        positive_count=positive_count,
-        neutral_count=neutral_count,
-        negative_count=negative_count,
-        avg_sentiment=avg_sentiment,
-    )
+    """Score opinions batch by batch, keeping only running counts in memory.
+
+    Per-opinion scores are spooled as CSV (spilling to disk past
+    ``SENTIMENT_SCORES_SPOOL_MAX_BYTES``) and COPY-ed in the same transaction
+    as the result row. The caller's transaction is ended first, so ``db``
+    holds no pooled connection while the backend scores. With
+    ``commit=False`` the result is left for the caller to commit.
+    """
+    await db.commit()
+    sentiment_backend = get_sentiment_backend(backend)
+    counts = SentimentCounts()
+    scores_by_key: dict[bytes, float] = {}
+
+    with tempfile.SpooledTemporaryFile(
+        max_size=settings.SENTIMENT_SCORES_SPOOL_MAX_BYTES, mode="w+", newline=""
+    ) as scores_csv:
+        scores_writer = csv.writer(scores_csv, quoting=csv.QUOTE_NONNUMERIC)
+
+        async for opinions_batch in iter_opinion_batches(
+            opinions_list, batch_size=sentiment_backend.batch_size
+        ):
+            opinions_sentiment_values = await get_sentiment_values(
+                db,
+                opinions_batch,
+                backend=sentiment_backend,
+                on_progress=on_progress,
+                scores_by_key=scores_by_key,
+            )
+            scores_writer.writerows(
+                (position, o.id, o.sentiment)
+                for position, o in enumerate(
+                    opinions_sentiment_values, counts.opinions_count
+                )
+            )
+            counts.add([o.sentiment for o in opinions_sentiment_values])
+            OPINIONS_SCORED.labels(backend.value).inc(len(opinions_sentiment_values))
+
+        scores_csv_size = scores_csv.tell()
+        scores_csv.seek(0)
+        with tracer.span(
+            "sentiment.save_result",
+            {
+                "opinions.count": counts.opinions_count,
+                "scores_csv.size": scores_csv_size,
+            },
+        ):
+            sentiment_analysis_result_repo = await create_sentiment_analysis_result(
+                db,
+                project_id=project_id,
+                user_id=user_id,
+                date_from=date_from,
+                date_to=date_to,
+                opinions_count=counts.opinions_count,
+                positive_count=counts.positive_count,
+                neutral_count=counts.neutral_count,
+                negative_count=counts.negative_count,
+                avg_sentiment=counts.avg_sentiment,
+                opinion_scores_csv=scores_csv,
+                commit=commit,
+            )
 
     sentiment_analysis_result = SentimentAnalysisResult(
+        id=sentiment_analysis_result_repo.id,
         project_id=project_id,
         user_id=user_id,
         date_from=date_from,
         date_to=date_to,
-        opinions_count=opinions_count,
-        positive_count=positive_count,
-        neutral_count=neutral_count,
-        negative_count=negative_count,
-        avg_sentiment=avg_sentiment,
+        opinions_count=counts.opinions_count,
+        positive_count=counts.positive_count,
+        neutral_count=counts.neutral_count,
+        negative_count=counts.negative_count,
+        avg_sentiment=counts.avg_sentiment,
         created_at=sentiment_analysis_result_repo.created_at,
     )
     return sentiment_analysis_result
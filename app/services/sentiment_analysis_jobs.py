@@ -0,0 +1,218 @@
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+from datetime import date
+
+from fastapi import HTTPException
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.datastructures import UploadFile
+
+from app.api.core.config import settings
+from app.api.dependencies.database import SessionLocal
+from app.domain.sentiment_analysis import Opinion, SentimentBackendE
+from app.models.sentiment_analysis_job import SentimentAnalysisJob
+from app.repository.sentiment_analysis_job import (
+    claim_next_sentiment_analysis_job,
+    complete_sentiment_analysis_job,
+    create_sentiment_analysis_job,
+    fail_sentiment_analysis_job,
+    iter_sentiment_analysis_job_upload,
+    renew_sentiment_analysis_job_lease,
+    requeue_sentiment_analysis_job,
+    update_sentiment_analysis_job_progress,
+)
+from app.services.gemini import is_retryable_error
+from app.services.sentiment_analysis import analyze_sentiment, iter_opinions_csv
+from app.utils.csv_stream import ChunkedReader
+from app.utils.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+
+async def submit_sentiment_analysis_job(
+    db: AsyncSession,
+    project_id: int,
+    user_id: int,
+    date_from: date,
+    date_to: date,
+    file: UploadFile,
+    backend: SentimentBackendE,
+) -> SentimentAnalysisJob:
+
+    async def read_upload_chunks() -> AsyncIterator[bytes]:
+        while data := await file.read(settings.SENTIMENT_JOB_UPLOAD_CHUNK_BYTES):
+            yield data
+
+    return await create_sentiment_analysis_job(
+        db,
+        project_id=project_id,
+        user_id=user_id,
+        date_from=date_from,
+        date_to=date_to,
+        backend=backend,
+        upload_chunks=read_upload_chunks(),
+    )
+
+
+def is_retryable_job_error(error: BaseException) -> bool:
+    """An unavailable backend or a lost database connection, not a bad upload."""
+    if isinstance(error, HTTPException):
+        return error.status_code == 503
+    if isinstance(error, DBAPIError):
+        return error.connection_invalidated
+    return isinstance(error, (OSError, PoolTimeoutError)) or is_retryable_error(error)
+
+
+async def renew_lease_while_running(
+    db: AsyncSession, job_id: int, attempt: int
+) -> None:
+    """Keep the job's lease alive while nothing reports progress.
+
+    A batch job can wait on Gemini for longer than the lease, and progress is
+    only reported once the batch finishes. Renewing at a third of the lease
+    stops another worker from claiming the job, and submitting a second batch,
+    in the meantime.
+    """
+    while True:
+        await asyncio.sleep(settings.SENTIMENT_JOB_LEASE_SECONDS / 3)
+        try:
+            await renew_sentiment_analysis_job_lease(db, job_id, attempt)
+        except Exception:
+            await db.rollback()
+            logger.exception("Failed to renew the lease of job %s", job_id)
+
+
+async def run_sentiment_analysis_job(
+    db: AsyncSession, job: SentimentAnalysisJob
+) -> None:
+    """Run one claimed attempt of the job.
+
+    Every update is fenced on the claimed attempt, so a worker whose lease
+    expired cannot overwrite the attempt that took over. Retryable errors put
+    the job back in the queue until its attempts run out.
+    """
+    job_id = job.id
+    attempt = job.attempts
+    # The upload is read, and the lease renewed, while chunks are scored, so
+    # each gets its own session.
+    upload_db = AsyncSession(db.bind)
+    lease_db = AsyncSession(db.bind)
+    lease_renewal = asyncio.create_task(
+        renew_lease_while_running(lease_db, job_id, attempt)
+    )
+    try:
+        upload = ChunkedReader(iter_sentiment_analysis_job_upload(upload_db, job_id))
+        opinions_read = 0
+        opinions_done = 0
+        # Chunks are scored concurrently, but a session allows one query at a time.
+        progress_lock = asyncio.Lock()
+
+        async def read_opinions() -> AsyncIterator[Opinion]:
+            nonlocal opinions_read
+            async for opinion in iter_opinions_csv(upload):
+                opinions_read += 1
+                yield opinion
+
+        async def on_progress(opinions_scored: int) -> None:
+            nonlocal opinions_done
+            async with progress_lock:
+                opinions_done += opinions_scored
+                await update_sentiment_analysis_job_progress(
+                    db, job_id, attempt, opinions_done
+                )
+
+        sentiment_analysis_result = await analyze_sentiment(
+            db,
+            project_id=job.project_id,
+            user_id=job.user_id,
+            date_from=job.date_from,
+            date_to=job.date_to,
+            opinions_list=read_opinions(),
+            backend=SentimentBackendE(job.backend),
+            on_progress=on_progress,
+            commit=False,
+        )
+        completed = await complete_sentiment_analysis_job(
+            db,
+            job_id,
+            attempt,
+            result_id=sentiment_analysis_result.id,
+            opinions_done=opinions_done,
+            opinions_total=opinions_read,
+        )
+    except Exception as e:
+        await db.rollback()
+        error = str(e.detail if isinstance(e, HTTPException) else repr(e))
+        if is_retryable_job_error(e) and attempt < settings.SENTIMENT_JOB_MAX_ATTEMPTS:
+            logger.warning(
+                "Sentiment analysis job %s attempt %s failed, requeueing: %s",
+                job_id,
+                attempt,
+                error,
+            )
+            await requeue_sentiment_analysis_job(db, job_id, attempt, error=error)
+        else:
+            logger.exception("Sentiment analysis job %s failed", job_id)
+            await fail_sentiment_analysis_job(db, job_id, attempt, error=error)
+        return
+    finally:
+        lease_renewal.cancel()
+        await asyncio.gather(lease_renewal, return_exceptions=True)
+        await lease_db.close()
+        await upload_db.close()
+
+    if not completed:
+        logger.warning(
+            "Sentiment analysis job %s attempt %s lost its lease; result discarded",
+            job_id,
+            attempt,
+        )
+
+
+async def run_next_sentiment_analysis_job(db: AsyncSession) -> bool:
+    """Claim and run one job; return False when the queue is empty."""
+    job = await claim_next_sentiment_analysis_job(
+        db,
+        lease_seconds=settings.SENTIMENT_JOB_LEASE_SECONDS,
+        max_attempts=settings.SENTIMENT_JOB_MAX_ATTEMPTS,
+    )
+    if job is None:
+        return False
+
+    with tracer.span(
+        "sentiment_analysis_job.run",
+        {
+            "job.id": job.id,
+            "job.backend": job.backend,
+            "job.attempt": job.attempts,
+        },
+    ):
+        await run_sentiment_analysis_job(db, job)
+    return True
+
+
+async def sentiment_analysis_job_worker() -> None:
+    while True:
+        try:
+            async with SessionLocal() as db:
+                has_run = await run_next_sentiment_analysis_job(db)
+        except Exception:
+            logger.exception("Sentiment analysis job worker error")
+            has_run = False
+
+        if not has_run:
+            await asyncio.sleep(settings.SENTIMENT_JOB_POLL_INTERVAL_SECONDS)
+
+
+def start_sentiment_analysis_job_workers(workers: int) -> list[asyncio.Task]:
+    return [
+        asyncio.create_task(sentiment_analysis_job_worker()) for _ in range(workers)
+    ]
+
+
+async def stop_sentiment_analysis_job_workers(tasks: list[asyncio.Task]) -> None:
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
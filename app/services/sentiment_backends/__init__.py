@@ -0,0 +1,15 @@
+from app.domain.sentiment_analysis import SentimentBackendE
+from app.services.sentiment_backends.base import SentimentBackend
+from app.services.sentiment_backends.gemini import GeminiBackend
+from app.services.sentiment_backends.gemini_batch import GeminiBatchBackend
+from app.services.sentiment_backends.lexicon import LexiconBackend
+
+SENTIMENT_BACKENDS: dict[SentimentBackendE, SentimentBackend] = {
+    SentimentBackendE.GEMINI: GeminiBackend(),
+    SentimentBackendE.GEMINI_BATCH: GeminiBatchBackend(),
+    SentimentBackendE.LEXICON: LexiconBackend(),
+}
+
+
+def get_sentiment_backend(name: SentimentBackendE | str) -> SentimentBackend:
+    return SENTIMENT_BACKENDS[SentimentBackendE(name)]
@@ -0,0 +1,34 @@
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable
+
+from app.api.core.config import settings
+from app.domain.sentiment_analysis import Opinion, OpinionsSentiment
+
+# Called with the number of opinions scored since the previous call.
+ProgressCallback = Callable[[int], Awaitable[None]]
+
+
+class SentimentBackend(ABC):
+    name: str
+    # Scores from backends that are cheaper than a cache lookup are not cached.
+    cacheable: bool = True
+    # Backends that take minutes or hours to answer only run in background jobs.
+    background_only: bool = False
+
+    @property
+    def batch_size(self) -> int:
+        """Opinions per ``score`` call when analysing a stream of opinions."""
+        return settings.SENTIMENT_STREAM_BATCH_SIZE
+
+    @property
+    @abstractmethod
+    def model(self) -> str:
+        """Identifier of the scoring model, part of the score cache key."""
+
+    @abstractmethod
+    async def score(
+        self,
+        opinions_list: list[Opinion],
+        on_progress: ProgressCallback | None = None,
+    ) -> list[OpinionsSentiment]:
+        """Score the opinions; opinions the backend could not score are omitted."""
@@ -0,0 +1,224 @@
+import asyncio
+import json
+from collections.abc import Iterable, Iterator
+
+from fastapi import HTTPException
+from google.genai import types
+
+from app.api.core.config import settings
+from app.domain.sentiment_analysis import Opinion, OpinionsSentiment, PromptPackingE
+from app.services.gemini import (
+    generate_content,
+    get_gemini_client,
+    is_retryable_error,
+)
+from app.services.sentiment_backends.base import ProgressCallback, SentimentBackend
+from app.utils.prompts import PromptTypeE, get_prompt
+from app.utils.tracing import tracer
+
+# Roughly a score and its separator in the response.
+OUTPUT_TOKENS_PER_OPINION = 4
+
+
+def chunk_opinions(
+    opinions_list: Iterable[Opinion],
+    max_opinions: int,
+    max_chars: int,
+) -> Iterator[list[Opinion]]:
+    """Split opinions into batches bounded by count and by prompt size."""
+    chunk: list[Opinion] = []
+    chunk_chars = 0
+    for opinion in opinions_list:
+        opinion_chars = len(opinion.id) + len(opinion.content) + 4
+        if chunk and (
+            len(chunk) >= max_opinions or chunk_chars + opinion_chars > max_chars
+        ):
+            yield chunk
+            chunk = []
+            chunk_chars = 0
+        chunk.append(opinion)
+        chunk_chars += opinion_chars
+
+    if chunk:
+        yield chunk
+
+
+def opinions_list_to_str(opinions_list: list[Opinion]) -> str:
+    opinions_str = ", ".join(
+        f"{opinion.id}: {opinion.content}" for opinion in opinions_list
+    )
+    return opinions_str
+
+
+def opinions_list_to_ordinal_str(opinions_list: list[Opinion]) -> str:
+    """One opinion per line as ``<n><TAB><text>``, numbered from 1.
+
+    Whitespace runs, line breaks included, collapse to single spaces, so every
+    line holds exactly one opinion and the caller's IDs are never sent.
+    """
+    return "\n".join(
+        f"{number}\t{' '.join(opinion.content.split())}"
+        for number, opinion in enumerate(opinions_list, start=1)
+    )
+
+
+def parse_sentiment(value: object) -> float:
+    """Cast one score from a response, raising ``ValueError`` for non-numbers."""
+    try:
+        return float(value)  # type: ignore
+    except TypeError:
+        raise ValueError(f"Expected a numeric score, got {value!r}.")
+
+
+def parse_ordinal_sentiment_values(
+    opinions_list: list[Opinion], text: str
+) -> list[OpinionsSentiment]:
+    """Map a positional array of scores back to the opinions' IDs."""
+    data = json.loads(text)
+    if not isinstance(data, list) or len(data) != len(opinions_list):
+        raise ValueError(
+            f"Expected a JSON array of {len(opinions_list)} scores in input order."
+        )
+    return [
+        OpinionsSentiment(id=opinion.id, sentiment=parse_sentiment(sentiment))
+        for opinion, sentiment in zip(opinions_list, data)
+    ]
+
+
+def build_chunk_contents(opinions_list: list[Opinion]) -> str:
+    if settings.SENTIMENT_PROMPT_PACKING == PromptPackingE.ORDINAL:
+        return get_prompt(PromptTypeE.CONTENT_ORDINAL) + opinions_list_to_ordinal_str(
+            opinions_list
+        )
+    return get_prompt(PromptTypeE.CONTENT) + opinions_list_to_str(opinions_list)
+
+
+def get_generate_content_config() -> types.GenerateContentConfig:
+    return types.GenerateContentConfig(
+        system_instruction=get_prompt(PromptTypeE.SYSTEM_INSTRUCTIONS),
+        response_mime_type="application/json",
+    )
+
+
+def parse_chunk_response(
+    opinions_list: list[Opinion], text: str
+) -> list[OpinionsSentiment]:
+    if settings.SENTIMENT_PROMPT_PACKING == PromptPackingE.ORDINAL:
+        return parse_ordinal_sentiment_values(opinions_list, text)
+    data = json.loads(text)
+    if not isinstance(data, dict):
+        raise ValueError("Expected a JSON object mapping opinion IDs to scores.")
+    return [
+        OpinionsSentiment(id=k, sentiment=parse_sentiment(v)) for k, v in data.items()
+    ]
+
+
+async def get_chunk_sentiment_values(
+    opinions_list: list[Opinion],
+) -> list[OpinionsSentiment]:
+    client = get_gemini_client()
+
+    try:
+        with tracer.span("gemini.build_prompt") as span:
+            contents = build_chunk_contents(opinions_list)
+            span.set_attribute("prompt.chars", len(contents))
+        response = await generate_content(
+            client,
+            contents=contents,
+            config=get_generate_content_config(),
+            expected_output_tokens=len(opinions_list) * OUTPUT_TOKENS_PER_OPINION,
+        )
+
+        if response.text is None:
+            raise HTTPException(status_code=400, detail="Failed to get response.")
+        with tracer.span(
+            "gemini.parse_response", {"response.chars": len(response.text)}
+        ):
+            return parse_chunk_response(opinions_list, response.text)
+
+    except Exception as e:
+        if is_retryable_error(e):
+            raise HTTPException(
+                status_code=503,
+                detail="Sentiment backend is unavailable, please try again later.",
+            )
+        raise HTTPException(
+            status_code=400, detail=f"Failed to generate sentiment {e}."
+        )
+
+
+async def score_opinions(
+    opinions_list: list[Opinion],
+    on_progress: ProgressCallback | None = None,
+) -> list[OpinionsSentiment]:
+    chunks = list(
+        chunk_opinions(
+            opinions_list,
+            max_opinions=settings.SENTIMENT_CHUNK_MAX_OPINIONS,
+            max_chars=settings.SENTIMENT_CHUNK_MAX_CHARS,
+        )
+    )
+    semaphore = asyncio.Semaphore(settings.SENTIMENT_MAX_CONCURRENCY)
+
+    async def score_chunk(chunk: list[Opinion]) -> list[OpinionsSentiment]:
+        async with semaphore:
+            with tracer.span("gemini.score_chunk", {"opinions.count": len(chunk)}):
+                opinions_sentiment_values = await get_chunk_sentiment_values(chunk)
+        if on_progress is not None:
+            await on_progress(len(chunk))
+        return opinions_sentiment_values
+
+    results: list[list[OpinionsSentiment] | BaseException] = list(
+        await asyncio.gather(
+            *(score_chunk(chunk) for chunk in chunks), return_exceptions=True
+        )
+    )
+
+    for _ in range(settings.SENTIMENT_CHUNK_RETRIES):
+        # Unavailable chunks have already been retried with backoff.
+        failed = [
+            i
+            for i, result in enumerate(results)
+            if isinstance(result, Exception)
+            and not (isinstance(result, HTTPException) and result.status_code == 503)
+        ]
+        if not failed:
+            break
+        retried = await asyncio.gather(
+            *(score_chunk(chunks[i]) for i in failed), return_exceptions=True
+        )
+        for i, result in zip(failed, retried):
+            results[i] = result
+
+    opinions_sentiment_values = []
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+        opinions_sentiment_values.extend(result)
+
+    return opinions_sentiment_values
+
+
+class GeminiBackend(SentimentBackend):
+    name = "gemini"
+
+    @property
+    def model(self) -> str:
+        return settings.GEMINI_MODEL
+
+    @property
+    def batch_size(self) -> int:
+        # Whole rounds of SENTIMENT_MAX_CONCURRENCY full chunks, so no request slot
+        # sits idle while the last chunks of a batch are scored.
+        round_size = (
+            settings.SENTIMENT_CHUNK_MAX_OPINIONS * settings.SENTIMENT_MAX_CONCURRENCY
+        )
+        rounds = -(-settings.SENTIMENT_STREAM_BATCH_SIZE // round_size)
+        return max(rounds, 1) * round_size
+
+    async def score(
+        self,
+        opinions_list: list[Opinion],
+        on_progress: ProgressCallback | None = None,
+    ) -> list[OpinionsSentiment]:
+        return await score_opinions(opinions_list, on_progress=on_progress)
@@ -0,0 +1,168 @@
+"""Offline scoring through the Gemini Batch API, for backfills.
+
+All chunks of a scoring call are submitted as the inlined requests of a single
+batch job, which is billed at half the interactive price and does not count
+against the interactive rate limits. The job is polled until it finishes;
+chunks the batch could not score are retried interactively. A batch can take
+hours, so the backend only runs in background jobs.
+"""
+
+import asyncio
+import time
+
+from fastapi import HTTPException
+from google import genai
+from google.genai import types
+
+from app.api.core.config import settings
+from app.domain.sentiment_analysis import Opinion, OpinionsSentiment
+from app.services.gemini import get_gemini_client, is_retryable_error
+from app.services.sentiment_backends.base import ProgressCallback, SentimentBackend
+from app.services.sentiment_backends.gemini import (
+    build_chunk_contents,
+    chunk_opinions,
+    get_generate_content_config,
+    parse_chunk_response,
+    score_opinions,
+)
+from app.utils.metrics import record_gemini_usage
+from app.utils.tracing import tracer
+
+FINISHED_BATCH_STATES = frozenset(
+    {
+        types.JobState.JOB_STATE_SUCCEEDED,
+        types.JobState.JOB_STATE_FAILED,
+        types.JobState.JOB_STATE_CANCELLED,
+        types.JobState.JOB_STATE_EXPIRED,
+    }
+)
+
+
+async def wait_for_batch_job(client: genai.Client, name: str) -> types.BatchJob:
+    """Poll the batch job until it finishes, cancelling it past the timeout."""
+    deadline = time.monotonic() + settings.GEMINI_BATCH_TIMEOUT_SECONDS
+    while True:
+        batch_job = await client.aio.batches.get(name=name)
+        if batch_job.state in FINISHED_BATCH_STATES:
+            return batch_job
+        if time.monotonic() >= deadline:
+            await client.aio.batches.cancel(name=name)
+            raise HTTPException(
+                status_code=504, detail=f"Sentiment batch {name} timed out."
+            )
+        await asyncio.sleep(settings.GEMINI_BATCH_POLL_INTERVAL_SECONDS)
+
+
+async def run_batch_job(
+    chunks: list[list[Opinion]],
+) -> list[types.InlinedResponse]:
+    client = get_gemini_client()
+    config = get_generate_content_config()
+
+    try:
+        batch_job = await client.aio.batches.create(
+            model=settings.GEMINI_MODEL,
+            src=[
+                types.InlinedRequest(
+                    contents=build_chunk_contents(chunk), config=config
+                )
+                for chunk in chunks
+            ],
+            config=types.CreateBatchJobConfig(
+                display_name=f"polarify-{sum(len(chunk) for chunk in chunks)}"
+            ),
+        )
+        assert batch_job.name is not None
+        batch_job = await wait_for_batch_job(client, batch_job.name)
+    except HTTPException:
+        raise
+    except Exception as e:
+        if is_retryable_error(e):
+            raise HTTPException(
+                status_code=503,
+                detail="Sentiment backend is unavailable, please try again later.",
+            )
+        raise HTTPException(
+            status_code=400, detail=f"Failed to generate sentiment {e}."
+        )
+
+    if batch_job.state != types.JobState.JOB_STATE_SUCCEEDED:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Sentiment batch {batch_job.name} ended as {batch_job.state}.",
+        )
+    responses = batch_job.dest.inlined_responses if batch_job.dest else None
+    if responses is None or len(responses) != len(chunks):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Sentiment batch {batch_job.name} returned incomplete results.",
+        )
+    return responses
+
+
+async def score_opinions_batch(
+    opinions_list: list[Opinion],
+    on_progress: ProgressCallback | None = None,
+) -> list[OpinionsSentiment]:
+    chunks = list(
+        chunk_opinions(
+            opinions_list,
+            max_opinions=settings.SENTIMENT_CHUNK_MAX_OPINIONS,
+            max_chars=settings.SENTIMENT_CHUNK_MAX_CHARS,
+        )
+    )
+    if not chunks:
+        return []
+    with tracer.span(
+        "gemini_batch.run_job",
+        {"chunks.count": len(chunks), "opinions.count": len(opinions_list)},
+    ):
+        responses = await run_batch_job(chunks)
+
+    results: list[list[OpinionsSentiment] | None] = []
+    for chunk, inlined_response in zip(chunks, responses):
+        text = None
+        if inlined_response.response is not None:
+            text = inlined_response.response.text
+            if inlined_response.response.usage_metadata is not None:
+                record_gemini_usage(inlined_response.response.usage_metadata)
+        try:
+            if text is None:
+                raise ValueError(inlined_response.error)
+            results.append(parse_chunk_response(chunk, text))
+        except ValueError:
+            results.append(None)
+            continue
+        if on_progress is not None:
+            await on_progress(len(chunk))
+
+    failed = [i for i, result in enumerate(results) if result is None]
+    retried = await asyncio.gather(
+        *(score_opinions(chunks[i], on_progress=on_progress) for i in failed)
+    )
+    for i, result in zip(failed, retried):
+        results[i] = result
+
+    return [value for result in results if result is not None for value in result]
+
+
+class GeminiBatchBackend(SentimentBackend):
+    name = "gemini_batch"
+    background_only = True
+
+    @property
+    def model(self) -> str:
+        # Same model and prompts as the interactive backend, so cached scores are
+        # shared between the two.
+        return settings.GEMINI_MODEL
+
+    @property
+    def batch_size(self) -> int:
+        return settings.GEMINI_BATCH_MAX_OPINIONS
+
+    async def score(
+        self,
+        opinions_list: list[Opinion],
+        on_progress: ProgressCallback | None = None,
+    ) -> list[OpinionsSentiment]:
+        return await score_opinions_batch(opinions_list, on_progress=on_progress)
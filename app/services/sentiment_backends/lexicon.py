@@ -0,0 +1,229 @@
+"""Rule-based English sentiment scorer that runs locally, without a network call.
+
+The whole batch is joined, lower-cased, stripped of punctuation and split in a
+few C-level string passes, and non-sentiment words are dropped with ``filter``
+before the Python loop, which therefore only touches the handful of
+sentiment-bearing tokens in each opinion instead of every word.
+"""
+
+import math
+import string
+
+from app.domain.sentiment_analysis import Opinion, OpinionsSentiment
+from app.services.sentiment_backends.base import ProgressCallback, SentimentBackend
+
+# Valences on the -4..4 scale used by VADER-style lexicons.
+LEXICON: dict[str, float] = {
+    # positive
+    "amazing": 2.8,
+    "awesome": 3.1,
+    "beautiful": 2.9,
+    "best": 3.2,
+    "better": 1.9,
+    "brilliant": 2.8,
+    "cheap": 0.8,
+    "clean": 1.7,
+    "comfortable": 2.3,
+    "cool": 1.3,
+    "delicious": 2.7,
+    "delighted": 3.0,
+    "easy": 1.9,
+    "effective": 2.1,
+    "efficient": 1.8,
+    "enjoy": 2.2,
+    "enjoyed": 2.3,
+    "excellent": 3.2,
+    "fantastic": 2.6,
+    "fast": 1.3,
+    "favorite": 2.0,
+    "fine": 0.8,
+    "friendly": 2.2,
+    "fun": 2.3,
+    "glad": 2.0,
+    "good": 1.9,
+    "gorgeous": 3.0,
+    "great": 3.1,
+    "happy": 2.7,
+    "helpful": 1.9,
+    "impressed": 2.3,
+    "impressive": 2.4,
+    "incredible": 2.6,
+    "like": 1.5,
+    "liked": 1.8,
+    "love": 3.2,
+    "loved": 2.9,
+    "lovely": 2.8,
+    "nice": 1.8,
+    "ok": 0.9,
+    "okay": 0.9,
+    "outstanding": 3.0,
+    "perfect": 2.7,
+    "pleasant": 2.3,
+    "pleased": 1.9,
+    "polite": 1.9,
+    "positive": 2.3,
+    "quick": 1.1,
+    "recommend": 1.5,
+    "recommended": 1.6,
+    "reliable": 1.9,
+    "satisfied": 1.8,
+    "smooth": 1.2,
+    "solid": 1.4,
+    "superb": 3.1,
+    "thank": 1.5,
+    "thanks": 1.9,
+    "useful": 1.9,
+    "worth": 0.9,
+    "wonderful": 2.7,
+    "wow": 2.8,
+    # negative
+    "angry": -2.3,
+    "annoyed": -1.6,
+    "annoying": -1.8,
+    "awful": -2.0,
+    "bad": -2.5,
+    "boring": -1.3,
+    "broke": -1.8,
+    "broken": -2.1,
+    "bug": -1.0,
+    "buggy": -1.9,
+    "complain": -1.5,
+    "complaint": -1.5,
+    "confusing": -1.3,
+    "crash": -1.7,
+    "crashes": -1.7,
+    "damaged": -2.2,
+    "defective": -2.3,
+    "delay": -1.3,
+    "delayed": -1.4,
+    "dirty": -1.9,
+    "disappointed": -1.9,
+    "disappointing": -2.2,
+    "disgusting": -2.4,
+    "dislike": -1.6,
+    "expensive": -1.1,
+    "fail": -2.4,
+    "failed": -2.3,
+    "fake": -2.0,
+    "hate": -2.7,
+    "hated": -3.2,
+    "horrible": -2.5,
+    "late": -1.0,
+    "lost": -1.3,
+    "mess": -1.5,
+    "missing": -1.2,
+    "negative": -2.7,
+    "poor": -2.1,
+    "problem": -1.7,
+    "problems": -1.7,
+    "refund": -0.8,
+    "rude": -2.0,
+    "sad": -2.1,
+    "scam": -2.6,
+    "slow": -1.5,
+    "sorry": -0.3,
+    "terrible": -2.1,
+    "ugly": -2.3,
+    "unhappy": -1.8,
+    "unusable": -2.4,
+    "useless": -1.8,
+    "waste": -1.8,
+    "worse": -2.1,
+    "worst": -3.1,
+    "wrong": -2.1,
+}
+
+NEGATORS = frozenset(
+    {"not", "no", "never", "none", "nothing", "neither", "nor", "without", "hardly"}
+)
+
+# Added to the magnitude of the next sentiment word.
+INTENSIFIERS: dict[str, float] = {
+    "absolutely": 0.293,
+    "extremely": 0.293,
+    "really": 0.293,
+    "so": 0.293,
+    "totally": 0.293,
+    "very": 0.293,
+    "barely": -0.293,
+    "slightly": -0.293,
+    "somewhat": -0.293,
+}
+
+NEGATION_SCALAR = -0.74
+NORMALIZATION_ALPHA = 15.0
+SEPARATOR = "\x00"
+
+_punctuation = string.punctuation.replace("'", "")
+# One-to-one ASCII mapping, which keeps str.translate on its fast path.
+PUNCTUATION_TABLE = str.maketrans(_punctuation, " " * len(_punctuation))
+RELEVANT_TOKENS = frozenset({*LEXICON, *NEGATORS, *INTENSIFIERS, SEPARATOR})
+
+
+def normalize_score(score: float) -> float:
+    return round(score / math.sqrt(score * score + NORMALIZATION_ALPHA), 4)
+
+
+def score_texts(texts: list[str]) -> list[float]:
+    """Score a batch of texts, each to a polarity between -1.0 and 1.0.
+
+    A negator flips and an intensifier strengthens the next sentiment word.
+    """
+    if not texts:
+        return []
+
+    joined = f" {SEPARATOR} ".join(texts)
+    if joined.count(SEPARATOR) != len(texts) - 1:
+        joined = f" {SEPARATOR} ".join(text.replace(SEPARATOR, " ") for text in texts)
+
+    tokens = joined.lower().replace("n't", " not").translate(PUNCTUATION_TABLE).split()
+
+    lexicon_get = LEXICON.get
+    scores = []
+    total = 0.0
+    boost = 0.0
+    negated = False
+    for token in filter(RELEVANT_TOKENS.__contains__, tokens):
+        valence = lexicon_get(token)
+        if valence is not None:
+            if boost:
+                valence += boost if valence > 0 else -boost
+                boost = 0.0
+            if negated:
+                valence *= NEGATION_SCALAR
+                negated = False
+            total += valence
+        elif token == SEPARATOR:
+            scores.append(normalize_score(total) if total else 0.0)
+            total = 0.0
+            boost = 0.0
+            negated = False
+        elif token in NEGATORS:
+            negated = True
+        else:
+            boost += INTENSIFIERS[token]
+
+    scores.append(normalize_score(total) if total else 0.0)
+    return scores
+
+
+class LexiconBackend(SentimentBackend):
+    name = "lexicon"
+    cacheable = False
+
+    @property
+    def model(self) -> str:
+        return "lexicon-v1"
+
+    async def score(
+        self,
+        opinions_list: list[Opinion],
+        on_progress: ProgressCallback | None = None,
+    ) -> list[OpinionsSentiment]:
+        scores = score_texts([opinion.content for opinion in opinions_list])
+        if on_progress is not None:
+            await on_progress(len(opinions_list))
+        return [
+            OpinionsSentiment(id=opinion.id, sentiment=score)
+            for opinion, score in zip(opinions_list, scores)
+        ]
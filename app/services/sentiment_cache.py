@@ -0,0 +1,123 @@
+import hashlib
+import re
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.core.config import settings
+from app.repository.sentiment_score_cache import get_cached_scores, save_cached_scores
+
+WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    text = unicodedata.normalize("NFKC", text)
+    return WHITESPACE_RE.sub(" ", text).strip()
+
+
+def score_cache_key(text: str, model: str, prompt_version: str) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{model}\0{prompt_version}\0".encode("utf-8"))
+    digest.update(normalize_text(text).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class LRUCache:
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, float] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> float | None:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: float) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+@dataclass
+class SentimentScoreCacheStats:
+    memory_hits: int = 0
+    db_hits: int = 0
+    misses: int = 0
+    memory_entries: int = 0
+
+
+class SentimentScoreCache:
+    """Two-tier cache: a bounded in-process LRU in front of a shared table."""
+
+    def __init__(self, max_entries: int) -> None:
+        self.memory = LRUCache(max_entries)
+        self.stats = SentimentScoreCacheStats()
+
+    async def get_many(self, db: AsyncSession, keys: list[str]) -> dict[str, float]:
+        found = {}
+        memory_misses = []
+        for key in keys:
+            value = self.memory.get(key)
+            if value is None:
+                memory_misses.append(key)
+            else:
+                found[key] = value
+        self.stats.memory_hits += len(found)
+
+        db_found = {}
+        if memory_misses:
+            # Looked up in a session of its own, so the caller's session holds no
+            # pooled connection while the backend scores the misses.
+            async with AsyncSession(db.bind) as cache_db:
+                db_found = await get_cached_scores(cache_db, list(set(memory_misses)))
+        for key, value in db_found.items():
+            self.memory.set(key, value)
+        found.update(db_found)
+
+        self.stats.db_hits += sum(1 for key in memory_misses if key in db_found)
+        self.stats.misses += sum(1 for key in memory_misses if key not in db_found)
+        return found
+
+    async def set_many(
+        self,
+        db: AsyncSession,
+        scores: dict[str, float],
+        model: str,
+        prompt_version: str,
+    ) -> None:
+        """Store scores in a transaction of their own.
+
+        Committing the caller's session here would also commit whatever it has
+        pending. A separate transaction keeps scores that were paid for even if
+        the analysis fails later, and holds the key locks only briefly.
+        """
+        for key, value in scores.items():
+            self.memory.set(key, value)
+        if not scores:
+            return
+        async with AsyncSession(db.bind) as cache_db:
+            await save_cached_scores(
+                cache_db, scores, model=model, prompt_version=prompt_version
+            )
+            await cache_db.commit()
+
+    def get_stats(self) -> SentimentScoreCacheStats:
+        self.stats.memory_entries = len(self.memory)
+        return self.stats
+
+    def clear(self) -> None:
+        self.memory.clear()
+        self.stats = SentimentScoreCacheStats()
+
+
+score_cache = SentimentScoreCache(max_entries=settings.SENTIMENT_CACHE_MAX_ENTRIES)
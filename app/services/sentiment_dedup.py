@@ -0,0 +1,155 @@
+"""Collapse duplicate opinions before scoring, so each distinct text is sent once.
+
+Texts are compared after case folding and stripping punctuation, so "Great!",
+"great" and "GREAT!!!" share one score. Optionally, near-duplicates (copy-pasted
+text with small edits) are grouped too: word 3-gram shingles are MinHashed and
+candidate pairs found by LSH banding are merged when their estimated Jaccard
+similarity reaches the threshold.
+"""
+
+import hashlib
+import math
+import operator
+import struct
+import unicodedata
+from dataclasses import dataclass
+
+from app.domain.sentiment_analysis import Opinion
+
+SHINGLE_WORDS = 3
+MINHASH_ROWS_PER_BAND = 4
+# A 64-byte BLAKE2b digest holds sixteen 32-bit hash values; each salt gives
+# another independent sixteen.
+MINHASH_VALUES_PER_DIGEST = 16
+
+# Punctuation outside the Basic Multilingual Plane belongs to historic scripts;
+# scanning all of Unicode would add a second to import time.
+PUNCTUATION_TABLE = dict.fromkeys(
+    i for i in range(0x10000) if unicodedata.category(chr(i)).startswith("P")
+)
+
+
+@dataclass
+class OpinionGroups:
+    # One opinion per group, with its position in ``representatives`` as ID.
+    representatives: list[Opinion]
+    # For each input opinion, the index of its group's representative.
+    representative_indexes: list[int]
+    # The dedup key of each representative.
+    representative_keys: list[str]
+
+
+def dedup_key(text: str) -> str:
+    """Case-folded text with punctuation dropped and whitespace collapsed.
+
+    Texts made only of punctuation and symbols, like emoticons, keep them, so
+    ":)" and ":(" stay apart.
+    """
+    text = " ".join(unicodedata.normalize("NFKC", text).casefold().split())
+    stripped = " ".join(text.translate(PUNCTUATION_TABLE).split())
+    return stripped if any(char.isalnum() for char in stripped) else text
+
+
+def dedup_digest(key: str) -> bytes:
+    """A short stand-in for ``key``, for remembering many keys at once."""
+    return hashlib.blake2b(key.encode(), digest_size=16).digest()
+
+
+def get_shingles(key: str) -> set[bytes]:
+    words = key.split()
+    return {
+        " ".join(words[i : i + SHINGLE_WORDS]).encode()
+        for i in range(max(len(words) - SHINGLE_WORDS + 1, 1))
+    }
+
+
+def minhash_signature(shingles: set[bytes], permutations: int) -> tuple[int, ...]:
+    digests = math.ceil(permutations / MINHASH_VALUES_PER_DIGEST)
+    values_format = f"<{digests * MINHASH_VALUES_PER_DIGEST}I"
+    rows = [
+        struct.unpack(
+            values_format,
+            b"".join(
+                hashlib.blake2b(shingle, salt=bytes([salt])).digest()
+                for salt in range(digests)
+            ),
+        )
+        for shingle in shingles
+    ]
+    return tuple(map(min, zip(*rows)))[:permutations]
+
+
+def find_near_duplicates(
+    keys: list[str], similarity: float, permutations: int
+) -> list[int]:
+    """Map each key to the index of the first key in its near-duplicate group."""
+    signatures = [minhash_signature(get_shingles(key), permutations) for key in keys]
+    parents = list(range(len(keys)))
+
+    def find(i: int) -> int:
+        while parents[i] != i:
+            parents[i] = parents[parents[i]]
+            i = parents[i]
+        return i
+
+    buckets: dict[tuple[int, tuple[int, ...]], list[int]] = {}
+    for i, signature in enumerate(signatures):
+        for start in range(0, permutations, MINHASH_ROWS_PER_BAND):
+            band = signature[start : start + MINHASH_ROWS_PER_BAND]
+            buckets.setdefault((start, band), []).append(i)
+
+    for candidates in buckets.values():
+        first = candidates[0]
+        for other in candidates[1:]:
+            root, other_root = find(first), find(other)
+            if root == other_root:
+                continue
+            matching = sum(map(operator.eq, signatures[first], signatures[other]))
+            if matching / permutations >= similarity:
+                parents[max(root, other_root)] = min(root, other_root)
+
+    return [find(i) for i in range(len(keys))]
+
+
+def group_duplicate_opinions(
+    opinions_list: list[Opinion],
+    near_duplicates: bool = False,
+    similarity: float = 0.8,
+    permutations: int = 64,
+) -> OpinionGroups:
+    key_indexes: dict[str, int] = {}
+    keys: list[str] = []
+    contents: list[str] = []
+    key_index_of_opinion = []
+    for opinion in opinions_list:
+        key = dedup_key(opinion.content)
+        index = key_indexes.setdefault(key, len(keys))
+        if index == len(keys):
+            keys.append(key)
+            contents.append(opinion.content)
+        key_index_of_opinion.append(index)
+
+    if near_duplicates and len(keys) > 1:
+        group_of_key = find_near_duplicates(keys, similarity, permutations)
+    else:
+        group_of_key = list(range(len(keys)))
+
+    representative_of_group: dict[int, int] = {}
+    representatives: list[Opinion] = []
+    representative_keys: list[str] = []
+    for group in group_of_key:
+        if group not in representative_of_group:
+            representative_of_group[group] = len(representatives)
+            representatives.append(
+                Opinion(id=str(len(representatives)), content=contents[group])
+            )
+            representative_keys.append(keys[group])
+
+    return OpinionGroups(
+        representatives=representatives,
+        representative_indexes=[
+            representative_of_group[group_of_key[index]]
+            for index in key_index_of_opinion
+        ],
+        representative_keys=representative_keys,
+    )
@@ -0,0 +1,43 @@
+import csv
+import io
+from collections.abc import AsyncIterator
+
+import orjson
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.sentiment_analysis import ExportFormatE
+from app.repository.sentiment_analysis import (
+    SENTIMENT_ANALYSIS_RESULT_EXPORT_COLUMNS,
+    stream_sentiment_analysis_results,
+)
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormatE.NDJSON: "application/x-ndjson",
+    ExportFormatE.CSV: "text/csv",
+}
+
+
+async def export_sentiment_analysis_results(
+    db: AsyncSession,
+    project_id: int,
+    user_id: int,
+    export_format: ExportFormatE,
+    year: int | None = None,
+) -> AsyncIterator[bytes]:
+    """Encode results one cursor batch at a time, so memory does not grow with rows."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if export_format == ExportFormatE.CSV:
+        writer.writerow(SENTIMENT_ANALYSIS_RESULT_EXPORT_COLUMNS)
+        yield buffer.getvalue().encode("utf-8")
+
+    async for rows in stream_sentiment_analysis_results(
+        db, project_id=project_id, user_id=user_id, year=year
+    ):
+        if export_format == ExportFormatE.NDJSON:
+            yield b"".join(orjson.dumps(row._asdict()) + b"\n" for row in rows)
+            continue
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(rows)
+        yield buffer.getvalue().encode("utf-8")
@@ -0,0 +1,66 @@
+import codecs
+import csv
+import io
+from collections.abc import AsyncIterator
+from typing import Protocol
+
+CSV_READ_CHUNK_SIZE = 64 * 1024
+
+
+class AsyncReader(Protocol):
+    async def read(self, size: int = -1) -> bytes:
+        """Return up to ``size`` bytes, or ``b""`` at the end of the stream."""
+        ...
+
+
+class ChunkedReader:
+    """Read a stream of byte chunks, such as stored upload pieces, as a file."""
+
+    def __init__(self, chunks: AsyncIterator[bytes]) -> None:
+        self.chunks = chunks
+        self.buffer = b""
+        self.offset = 0
+
+    async def read(self, size: int = -1) -> bytes:
+        while self.offset >= len(self.buffer):
+            chunk = await anext(self.chunks, None)
+            if chunk is None:
+                return b""
+            self.buffer, self.offset = chunk, 0
+        end = len(self.buffer) if size < 0 else self.offset + size
+        data = self.buffer[self.offset : end]
+        self.offset += len(data)
+        return data
+
+
+async def iter_csv_rows(
+    file: AsyncReader, chunk_size: int = CSV_READ_CHUNK_SIZE
+) -> AsyncIterator[list[str]]:
+    """Parse a UTF-8 CSV upload, holding only one chunk plus a partial record.
+
+    Each chunk is parsed by ``csv.reader``, so quoting follows the csv module
+    exactly. The chunk's last record may continue in the next chunk, so it is
+    held back and parsed again with the next chunk.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pending = ""
+    while True:
+        data = await file.read(chunk_size)
+        final = not data
+        text = pending + decoder.decode(data, final=final)
+        # The reader pulls one line at a time, so the buffer's position after
+        # each row is where that record ends.
+        buffer = io.StringIO(text, newline="")
+        row = None
+        record_start = record_end = 0
+        for next_row in csv.reader(buffer):
+            if row is not None:
+                yield row
+            row, record_start, record_end = next_row, record_end, buffer.tell()
+        buffer.close()
+
+        if final:
+            if row is not None:
+                yield row
+            return
+        pending = text[record_start:]
@@ -0,0 +1,117 @@
+"""Prometheus metrics, exposed by the API at ``/metrics``.
+
+Metrics live in the process's default registry, so with several worker
+processes each one is scraped separately.
+"""
+
+import time
+from contextvars import ContextVar
+
+import httpx
+from google.genai import errors, types
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import Scope
+
+# ASGI scope of the request being served. Queries made outside a request, by
+# the job workers, are labelled "background".
+current_request_scope: ContextVar[Scope | None] = ContextVar(
+    "current_request_scope", default=None
+)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "polarify_http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ["method", "route"],
+)
+HTTP_RESPONSES = Counter(
+    "polarify_http_responses_total",
+    "HTTP responses by route template and status code.",
+    ["method", "route", "status"],
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "polarify_http_requests_in_progress",
+    "HTTP requests being served, by route template.",
+    ["method", "route"],
+)
+
+DB_QUERY_DURATION = Histogram(
+    "polarify_db_query_duration_seconds",
+    "SQL statement latency by the route that issued it.",
+    ["route"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+
+GEMINI_REQUEST_DURATION = Histogram(
+    "polarify_gemini_request_duration_seconds",
+    "Latency of Gemini generate_content calls, including failed attempts.",
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
+)
+GEMINI_TOKENS = Counter(
+    "polarify_gemini_tokens_total",
+    "Tokens reported in Gemini usage metadata, batch jobs included.",
+    ["type"],
+)
+GEMINI_ERRORS = Counter(
+    "polarify_gemini_errors_total",
+    "Failed Gemini calls, by HTTP status code or transport error.",
+    ["type"],
+)
+
+OPINIONS_SCORED = Counter(
+    "polarify_opinions_scored_total",
+    "Opinions scored, whether by the backend, the score cache or deduplication.",
+    ["backend"],
+)
+
+
+def get_route_label(scope: Scope | None) -> str:
+    """The matched route's path template, so IDs do not explode the label set.
+
+    FastAPI stores the route in the scope once routing is done, so reading it
+    costs nothing; requests no route matched are labelled "unmatched".
+    """
+    if scope is None:
+        return "background"
+    route = scope.get("route")
+    return route.path if route is not None else "unmatched"
+
+
+def get_error_type(error: BaseException) -> str:
+    if isinstance(error, errors.APIError):
+        return str(error.code)
+    if isinstance(error, httpx.TimeoutException):
+        return "timeout"
+    if isinstance(error, httpx.TransportError):
+        return "transport"
+    return type(error).__name__
+
+
+def record_gemini_usage(usage: types.GenerateContentResponseUsageMetadata) -> None:
+    GEMINI_TOKENS.labels("prompt").inc(usage.prompt_token_count or 0)
+    GEMINI_TOKENS.labels("output").inc(usage.candidates_token_count or 0)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Time every statement, labelled with the route that issued it."""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        conn.info.setdefault("query_start_times", []).append(time.perf_counter())
+
+    def observe(start: float) -> None:
+        DB_QUERY_DURATION.labels(get_route_label(current_request_scope.get())).observe(
+            time.perf_counter() - start
+        )
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, many):
+        observe(conn.info["query_start_times"].pop())
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def handle_error(exception_context):
+        connection = exception_context.connection
+        start_times = connection.info.get("query_start_times") if connection else None
+        if start_times:
+            observe(start_times.pop())
@@ -0,0 +1,27 @@
+import base64
+import binascii
+import json
+
+CursorValue = str | int
+
+
+def encode_cursor(*values: CursorValue) -> str:
+    """Opaque cursor holding the sort key of the last row on a page."""
+    payload = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, length: int) -> list[CursorValue]:
+    """Inverse of :func:`encode_cursor`; raises ValueError on a malformed cursor."""
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(payload)
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if (
+        not isinstance(values, list)
+        or len(values) != length
+        or not all(isinstance(value, (str, int)) for value in values)
+    ):
+        raise ValueError("Invalid cursor")
+    return values
@@ -1,16 +1,83 @@
+import hashlib
+import os
+from dataclasses import dataclass
 from enum import StrEnum
 from pathlib import Path
 
+from app.api.core.config import settings
+
 PROMPTS_DIR = Path(__file__).parent.parent / "prompts"
 
 
 class PromptTypeE(StrEnum):
     CONTENT = "content.txt"
+    CONTENT_ORDINAL = "content_ordinal.txt"
     SYSTEM_INSTRUCTIONS = "system_instructions.txt"
 
 
+@dataclass(frozen=True)
+class PromptSet:
+    prompts: dict[PromptTypeE, str]
+    version: str
+    mtimes: dict[PromptTypeE, int]
+
+
+def read_prompt_set(prompts_dir: Path) -> PromptSet:
+    prompts = {}
+    mtimes = {}
+    digest = hashlib.blake2b(digest_size=16)
+    for prompt_type in PromptTypeE:
+        file_path = prompts_dir / prompt_type
+        mtimes[prompt_type] = os.stat(file_path).st_mtime_ns
+        with open(file_path, "r", encoding="utf-8") as f:
+            prompts[prompt_type] = f.read()
+        digest.update(prompts[prompt_type].encode("utf-8"))
+    return PromptSet(prompts=prompts, version=digest.hexdigest(), mtimes=mtimes)
+
+
+class PromptRegistry:
+    """Prompt templates held in memory, read once instead of on every analysis.
+
+    With ``hot_reload`` every lookup compares the files' mtimes with the loaded
+    ones and re-reads them on a change; that costs a ``stat`` per file, so it is
+    meant for development only.
+    """
+
+    def __init__(self, prompts_dir: Path = PROMPTS_DIR, hot_reload: bool = False):
+        self.prompts_dir = prompts_dir
+        self.hot_reload = hot_reload
+        self.prompt_set: PromptSet | None = None
+
+    def load(self) -> PromptSet:
+        self.prompt_set = read_prompt_set(self.prompts_dir)
+        return self.prompt_set
+
+    def current(self) -> PromptSet:
+        prompt_set = self.prompt_set
+        if prompt_set is None:
+            return self.load()
+        if self.hot_reload and any(
+            os.stat(self.prompts_dir / prompt_type).st_mtime_ns != mtime
+            for prompt_type, mtime in prompt_set.mtimes.items()
+        ):
+            return self.load()
+        return prompt_set
+
+    def get(self, prompt_type: PromptTypeE) -> str:
+        return self.current().prompts[prompt_type]
+
+    @property
+    def version(self) -> str:
+        """Hash of every prompt template, used to key cached sentiment scores."""
+        return self.current().version
+
+
+prompt_registry = PromptRegistry(hot_reload=settings.PROMPTS_HOT_RELOAD)
+
+
 def get_prompt(file_name: PromptTypeE) -> str:
-    file_path = PROMPTS_DIR / file_name
-    with open(file_path, "r", encoding="utf-8") as f:
-        prompt_str = f.read()
-    return prompt_str
+    return prompt_registry.get(file_name)
+
+
+def get_prompt_version() -> str:
+    return prompt_registry.version
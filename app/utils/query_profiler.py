@@ -0,0 +1,101 @@
+"""Opt-in recording of the SQL statements a request or a block of code runs.
+
+Statements are grouped by shape, with literals and bind parameters replaced by
+``?``, so a query issued once per row (an N+1 pattern) shows up as one shape
+repeated many times.
+"""
+
+import re
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# String and number literals, and runs of bind parameters with their casts, so
+# ``IN ($1::INTEGER, $2::INTEGER)`` has the same shape whatever its length.
+STATEMENT_LITERAL_PATTERN = re.compile(
+    r"'(?:[^']|'')*'"
+    r"|\$\d+(?:::\w+)?(?:\s*,\s*\$\d+(?:::\w+)?)*"
+    r"|%\(\w+\)s"
+    r"|\b\d+(?:\.\d+)?\b"
+)
+
+# Profiles being recorded; a block profiled inside a profiled request sees its
+# own statements and the request sees them all.
+active_query_profiles: ContextVar[tuple["QueryProfile", ...]] = ContextVar(
+    "active_query_profiles", default=()
+)
+
+
+@dataclass
+class QueryRecord:
+    statement: str
+    seconds: float
+
+
+@dataclass
+class QueryProfile:
+    queries: list[QueryRecord] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(query.seconds for query in self.queries)
+
+    def repeated_statements(self, threshold: int) -> dict[str, int]:
+        """Statement shapes run at least ``threshold`` times, most repeated first."""
+        shapes = Counter(statement_shape(query.statement) for query in self.queries)
+        return {
+            shape: count
+            for shape, count in shapes.most_common()
+            if count >= threshold and threshold > 1
+        }
+
+    def summary(self) -> str:
+        lines = [f"{self.count} queries in {self.total_seconds * 1000:.1f}ms"]
+        lines += (
+            f"  {query.seconds * 1000:.1f}ms {statement_shape(query.statement)}"
+            for query in self.queries
+        )
+        return "\n".join(lines)
+
+
+def statement_shape(statement: str) -> str:
+    return " ".join(STATEMENT_LITERAL_PATTERN.sub("?", statement).split())
+
+
+@contextmanager
+def profile_queries() -> Iterator[QueryProfile]:
+    profile = QueryProfile()
+    token = active_query_profiles.set((*active_query_profiles.get(), profile))
+    try:
+        yield profile
+    finally:
+        active_query_profiles.reset(token)
+
+
+def profile_engine(engine: AsyncEngine) -> None:
+    """Record the engine's statements into the active profiles, if any."""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        if active_query_profiles.get():
+            conn.info["query_profile_start"] = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, many):
+        profiles = active_query_profiles.get()
+        start = conn.info.pop("query_profile_start", None)
+        if not profiles or start is None:
+            return
+        record = QueryRecord(statement, time.perf_counter() - start)
+        for profile in profiles:
+            profile.queries.append(record)
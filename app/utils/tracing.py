@@ -0,0 +1,421 @@
+"""Tracing spans across the API, service, repository and Gemini layers.
+
+Whether a trace is recorded is decided once, at its root span, with
+probability ``TRACING_SAMPLE_RATE`` (or by the caller's W3C ``traceparent``
+header); spans of unsampled traces cost one context variable lookup. Finished
+spans are queued and exported in batches from a background thread, and dropped
+when the queue is full, so a slow exporter never holds up requests.
+"""
+
+import logging
+import queue
+import random
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import IO
+
+import httpx
+import orjson
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.api.core.config import settings
+from app.domain.tracing import TracingExporterE
+from app.utils.query_profiler import statement_shape
+
+AttributeValue = str | int | float | bool
+
+MAX_STATEMENT_ATTRIBUTE_CHARS = 1000
+SHUTDOWN_TIMEOUT_SECONDS = 10.0
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(eq=False)
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_span_id: str | None
+    sampled: bool
+    start_time_ns: int = field(default_factory=time.time_ns)
+    end_time_ns: int | None = None
+    attributes: dict[str, AttributeValue] = field(default_factory=dict)
+    error: str | None = None
+
+    def set_attribute(self, key: str, value: AttributeValue) -> None:
+        if self.sampled:
+            self.attributes[key] = value
+
+    def set_attributes(self, attributes: dict[str, AttributeValue]) -> None:
+        if self.sampled:
+            self.attributes.update(attributes)
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_time_ns or time.time_ns()) - self.start_time_ns) / 1e6
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_span_id,
+            "start_time_ns": self.start_time_ns,
+            "end_time_ns": self.end_time_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+# Returned while tracing is off, so call sites never check for it.
+NOOP_SPAN = Span(
+    name="", trace_id="0" * 32, span_id="0" * 16, parent_span_id=None, sampled=False
+)
+
+current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+def parse_traceparent(header: str) -> Span | None:
+    """The caller's span from a W3C ``traceparent`` header, if well formed."""
+    parts = header.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    _, trace_id, span_id, flags = parts
+    try:
+        sampled = bool(int(flags, 16) & 1)
+        int(trace_id, 16), int(span_id, 16)
+    except ValueError:
+        return None
+    if trace_id == "0" * 32 or span_id == "0" * 16:
+        return None
+    return Span(
+        name="remote",
+        trace_id=trace_id,
+        span_id=span_id,
+        parent_span_id=None,
+        sampled=sampled,
+    )
+
+
+class SpanExporter(ABC):
+    @abstractmethod
+    def export(self, spans: list[Span]) -> None:
+        """Send finished spans; called from the batch processor's thread."""
+
+    def shutdown(self) -> None:
+        pass
+
+
+class JsonLinesSpanExporter(SpanExporter):
+    """One JSON object per span, for reading locally or loading elsewhere."""
+
+    def __init__(self, output: IO[bytes]) -> None:
+        self.output = output
+
+    def export(self, spans: list[Span]) -> None:
+        self.output.write(b"".join(orjson.dumps(s.to_dict()) + b"\n" for s in spans))
+        self.output.flush()
+
+
+class ConsoleSpanExporter(JsonLinesSpanExporter):
+    def __init__(self) -> None:
+        super().__init__(sys.stderr.buffer)
+
+
+class FileSpanExporter(JsonLinesSpanExporter):
+    def __init__(self, path: str) -> None:
+        super().__init__(open(path, "ab"))
+
+    def shutdown(self) -> None:
+        self.output.close()
+
+
+def to_otlp_value(value: AttributeValue) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp_span(span: Span) -> dict:
+    otlp_span = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "startTimeUnixNano": str(span.start_time_ns),
+        "endTimeUnixNano": str(span.end_time_ns),
+        "attributes": [
+            {"key": key, "value": to_otlp_value(value)}
+            for key, value in span.attributes.items()
+        ],
+        "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+    }
+    if span.parent_span_id is not None:
+        otlp_span["parentSpanId"] = span.parent_span_id
+    return otlp_span
+
+
+class OtlpHttpSpanExporter(SpanExporter):
+    """Send spans to an OpenTelemetry collector over OTLP/HTTP, JSON-encoded."""
+
+    def __init__(
+        self, endpoint: str, service_name: str, client: httpx.Client | None = None
+    ) -> None:
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.client = client or httpx.Client(timeout=10.0)
+
+    def export(self, spans: list[Span]) -> None:
+        payload = {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [
+                            {
+                                "key": "service.name",
+                                "value": {"stringValue": self.service_name},
+                            }
+                        ]
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "polarify"},
+                            "spans": [to_otlp_span(span) for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+        response = self.client.post(
+            self.endpoint,
+            content=orjson.dumps(payload),
+            headers={"Content-Type": "application/json"},
+        )
+        response.raise_for_status()
+
+    def shutdown(self) -> None:
+        self.client.close()
+
+
+class BatchSpanProcessor:
+    """Export finished spans from a background thread, in batches."""
+
+    def __init__(
+        self,
+        exporter: SpanExporter,
+        max_queue_size: int,
+        batch_size: int,
+        interval_seconds: float,
+    ) -> None:
+        self.exporter = exporter
+        self.batch_size = batch_size
+        self.interval_seconds = interval_seconds
+        self.queue: queue.Queue[Span | threading.Event | None] = queue.Queue(
+            max_queue_size
+        )
+        self.dropped_spans = 0
+        self.thread = threading.Thread(
+            target=self.run, name="span-exporter", daemon=True
+        )
+        self.thread.start()
+
+    def on_end(self, span: Span) -> None:
+        try:
+            self.queue.put_nowait(span)
+        except queue.Full:
+            self.dropped_spans += 1
+
+    def export(self, spans: list[Span]) -> None:
+        if not spans:
+            return
+        try:
+            self.exporter.export(spans)
+        except Exception:
+            logger.exception("Failed to export %d spans", len(spans))
+
+    def run(self) -> None:
+        spans: list[Span] = []
+        deadline = time.monotonic() + self.interval_seconds
+        while True:
+            try:
+                item = self.queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                self.export(spans)
+                spans = []
+                deadline = time.monotonic() + self.interval_seconds
+                continue
+            if isinstance(item, Span):
+                spans.append(item)
+                if len(spans) < self.batch_size and time.monotonic() < deadline:
+                    continue
+            self.export(spans)
+            spans = []
+            deadline = time.monotonic() + self.interval_seconds
+            if item is None:
+                return
+            if isinstance(item, threading.Event):
+                item.set()
+
+    def force_flush(self, timeout: float = SHUTDOWN_TIMEOUT_SECONDS) -> None:
+        flushed = threading.Event()
+        self.queue.put(flushed, timeout=timeout)
+        flushed.wait(timeout)
+
+    def shutdown(self) -> None:
+        self.queue.put(None, timeout=SHUTDOWN_TIMEOUT_SECONDS)
+        self.thread.join(SHUTDOWN_TIMEOUT_SECONDS)
+        self.exporter.shutdown()
+
+
+class Tracer:
+    def __init__(self) -> None:
+        self.processor: BatchSpanProcessor | None = None
+        self.sample_rate = 0.0
+        self.random = random.Random()
+
+    def configure(self, exporter: SpanExporter | None, sample_rate: float) -> None:
+        self.shutdown()
+        self.sample_rate = sample_rate
+        if exporter is not None:
+            self.processor = BatchSpanProcessor(
+                exporter,
+                max_queue_size=settings.TRACING_MAX_QUEUE_SIZE,
+                batch_size=settings.TRACING_EXPORT_BATCH_SIZE,
+                interval_seconds=settings.TRACING_EXPORT_INTERVAL_SECONDS,
+            )
+
+    @property
+    def enabled(self) -> bool:
+        return self.processor is not None
+
+    def shutdown(self) -> None:
+        if self.processor is not None:
+            self.processor.shutdown()
+            self.processor = None
+
+    def force_flush(self) -> None:
+        if self.processor is not None:
+            self.processor.force_flush()
+
+    def current_span(self) -> Span:
+        return current_span.get() or NOOP_SPAN
+
+    def start_span(
+        self,
+        name: str,
+        attributes: dict[str, AttributeValue] | None = None,
+        parent: Span | None = None,
+    ) -> Span:
+        """Start a span without making it current; finish it with ``end_span``."""
+        if self.processor is None:
+            return NOOP_SPAN
+        parent = parent or current_span.get()
+        if parent is not None and not parent.sampled:
+            return parent
+        if parent is None:
+            sampled = self.random.random() < self.sample_rate
+            trace_id = f"{self.random.getrandbits(128) or 1:032x}"
+        else:
+            sampled, trace_id = True, parent.trace_id
+        return Span(
+            name=name,
+            trace_id=trace_id,
+            span_id=f"{self.random.getrandbits(64) or 1:016x}",
+            parent_span_id=parent.span_id if parent is not None else None,
+            sampled=sampled,
+            attributes=dict(attributes or {}) if sampled else {},
+        )
+
+    def end_span(self, span: Span, error: BaseException | None = None) -> None:
+        if not span.sampled or span.end_time_ns is not None:
+            return
+        span.end_time_ns = time.time_ns()
+        if error is not None:
+            span.error = f"{type(error).__name__}: {error}"
+        if self.processor is not None:
+            self.processor.on_end(span)
+
+    @contextmanager
+    def span(
+        self,
+        name: str,
+        attributes: dict[str, AttributeValue] | None = None,
+        parent: Span | None = None,
+    ) -> Iterator[Span]:
+        span = self.start_span(name, attributes, parent)
+        if span is NOOP_SPAN:
+            yield span
+            return
+        token = current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            self.end_span(span, e)
+            raise
+        finally:
+            current_span.reset(token)
+            self.end_span(span)
+
+
+tracer = Tracer()
+
+
+def create_span_exporter() -> SpanExporter | None:
+    if settings.TRACING_EXPORTER == TracingExporterE.CONSOLE:
+        return ConsoleSpanExporter()
+    if settings.TRACING_EXPORTER == TracingExporterE.FILE:
+        return FileSpanExporter(settings.TRACING_FILE_PATH)
+    if settings.TRACING_EXPORTER == TracingExporterE.OTLP:
+        return OtlpHttpSpanExporter(
+            settings.TRACING_OTLP_ENDPOINT, settings.TRACING_SERVICE_NAME
+        )
+    return None
+
+
+def configure_tracing() -> None:
+    tracer.configure(create_span_exporter(), settings.TRACING_SAMPLE_RATE)
+
+
+def trace_engine(engine: AsyncEngine) -> None:
+    """Record a span for every statement run within a sampled trace."""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        span = tracer.start_span("db.query")
+        if span.sampled:
+            span.set_attributes(
+                {
+                    "db.operation": statement.split(None, 1)[0].upper(),
+                    "db.statement": statement_shape(statement)[
+                        :MAX_STATEMENT_ATTRIBUTE_CHARS
+                    ],
+                    "db.executemany": many,
+                }
+            )
+            conn.info["tracing_span"] = span
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, many):
+        span = conn.info.pop("tracing_span", None)
+        if span is not None:
+            if cursor.rowcount is not None and cursor.rowcount >= 0:
+                span.set_attribute("db.rows", cursor.rowcount)
+            tracer.end_span(span)
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def handle_error(exception_context):
+        connection = exception_context.connection
+        span = connection.info.pop("tracing_span", None) if connection else None
+        if span is not None:
+            tracer.end_span(span, exception_context.original_exception)
@@ -0,0 +1,38 @@
+"""Standalone sentiment analysis job worker: ``python -m app.worker``.
+
+Runs ``SENTIMENT_JOB_WORKERS`` workers polling the jobs table, for deployments
+that keep the API replicas free of analysis work (set ``SENTIMENT_JOB_WORKERS=0``
+on the API replicas then).
+"""
+
+import asyncio
+import logging
+
+from app.api.core.config import settings
+from app.api.dependencies.database import engine
+from app.services.gemini import close_gemini_client, init_gemini_client
+from app.services.sentiment_analysis_jobs import (
+    start_sentiment_analysis_job_workers,
+    stop_sentiment_analysis_job_workers,
+)
+from app.utils.prompts import prompt_registry
+from app.utils.tracing import configure_tracing, tracer
+
+
+async def main() -> None:
+    configure_tracing()
+    prompt_registry.load()
+    init_gemini_client()
+    tasks = start_sentiment_analysis_job_workers(max(settings.SENTIMENT_JOB_WORKERS, 1))
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        await stop_sentiment_analysis_job_workers(tasks)
+        await close_gemini_client()
+        await engine.dispose()
+        tracer.shutdown()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
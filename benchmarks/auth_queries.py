@@ -0,0 +1,100 @@
+"""SQL queries and latency per authenticated request, with and without the auth cache.
+
+Usage: ``python -m benchmarks.auth_queries --requests 2000``
+
+Every request fetches one project, which costs one query of its own; the rest
+is authentication. Without the cache every request resolves its token with one
+joined query (two separate lookups before it was introduced); with a hot cache
+authentication issues none.
+
+Uses ``TEST_DATABASE_URL``; tables are recreated at the start and dropped at the
+end of the run.
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.api.core.config import settings
+from app.api.dependencies.database import Base, get_db, to_async_database_url
+from app.main import app
+from app.services.auth import auth_user_cache
+
+
+async def run(requests: int) -> None:
+    async_engine = create_async_engine(
+        to_async_database_url(str(settings.TEST_DATABASE_URL))
+    )
+    AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+    queries = 0
+
+    def count_query(*args) -> None:
+        nonlocal queries
+        queries += 1
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", count_query)
+
+    async def override_get_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url="http://bench",
+        headers={"Authorization": "Bearer bench-token"},
+    ) as client:
+        for mode, ttl_seconds in (("no-cache", 0.0), ("cache", 60.0)):
+            auth_user_cache.clear()
+            auth_user_cache.ttl_seconds = ttl_seconds
+            queries = 0
+            start = time.perf_counter()
+            for _ in range(requests):
+                response = await client.get("/projects/1")
+                response.raise_for_status()
+            elapsed = time.perf_counter() - start
+            print(
+                f"mode={mode} requests={requests} "
+                f"queries/request={queries / requests:.2f} "
+                f"latency={elapsed / requests * 1000:.2f}ms"
+            )
+
+    await async_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    engine = create_engine(str(settings.TEST_DATABASE_URL))
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO users (username, email, password_hash, created_at) "
+                "VALUES ('bench', 'bench@example.com', '', now())"
+            )
+        )
+        connection.execute(
+            text("INSERT INTO auth_tokens (user_id, token) VALUES (1, 'bench-token')")
+        )
+        connection.execute(
+            text("INSERT INTO projects (user_id, name) VALUES (1, 'Benchmark')")
+        )
+
+    try:
+        asyncio.run(run(args.requests))
+    finally:
+        app.dependency_overrides = {}
+        Base.metadata.drop_all(bind=engine)
+
+
+if __name__ == "__main__":
+    main()
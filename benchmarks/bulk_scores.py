@@ -0,0 +1,139 @@
+"""Time to persist one analysis result with its per-opinion scores.
+
+Usage: ``python -m benchmarks.bulk_scores --opinions 100000``
+
+Uses ``TEST_DATABASE_URL``; tables are recreated at the start and dropped at the
+end of the run. ``--orm`` stores the same rows with one ORM object per score
+for comparison.
+"""
+
+import argparse
+import asyncio
+import csv
+import random
+import tempfile
+import time
+from datetime import date
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.core.config import settings
+from app.api.dependencies.database import Base, to_async_database_url
+from app.models import (  # noqa: F401
+    sentiment_analysis_job,
+    sentiment_score_cache,
+    token,
+)
+from app.models.project import Project
+from app.models.sentiment_analysis import OpinionSentimentScore
+from app.models.user import User as UserModel
+from app.repository.sentiment_analysis import create_sentiment_analysis_result
+
+
+async def store_with_copy(
+    db: AsyncSession, project_id: int, user_id: int, opinions: int
+) -> float:
+    with tempfile.SpooledTemporaryFile(
+        max_size=settings.SENTIMENT_SCORES_SPOOL_MAX_BYTES, mode="w+", newline=""
+    ) as scores_csv:
+        writer = csv.writer(scores_csv, quoting=csv.QUOTE_NONNUMERIC)
+        writer.writerows(
+            (position, str(position), round(random.uniform(-1, 1), 4))
+            for position in range(opinions)
+        )
+        scores_csv.seek(0)
+        start = time.perf_counter()
+        await create_sentiment_analysis_result(
+            db,
+            project_id=project_id,
+            user_id=user_id,
+            date_from=date(2025, 1, 1),
+            date_to=date(2025, 1, 31),
+            opinions_count=opinions,
+            positive_count=0,
+            neutral_count=0,
+            negative_count=0,
+            avg_sentiment=0.0,
+            opinion_scores_csv=scores_csv,
+        )
+        return time.perf_counter() - start
+
+
+async def store_with_orm(
+    db: AsyncSession, project_id: int, user_id: int, opinions: int
+) -> float:
+    scores = [round(random.uniform(-1, 1), 4) for _ in range(opinions)]
+    start = time.perf_counter()
+    result = await create_sentiment_analysis_result(
+        db,
+        project_id=project_id,
+        user_id=user_id,
+        date_from=date(2025, 1, 1),
+        date_to=date(2025, 1, 31),
+        opinions_count=opinions,
+        positive_count=0,
+        neutral_count=0,
+        negative_count=0,
+        avg_sentiment=0.0,
+    )
+    db.add_all(
+        OpinionSentimentScore(
+            result_id=result.id,
+            position=position,
+            opinion_id=str(position),
+            sentiment=sentiment,
+        )
+        for position, sentiment in enumerate(scores)
+    )
+    await db.commit()
+    return time.perf_counter() - start
+
+
+async def store(project_id: int, user_id: int, opinions: int, orm: bool) -> float:
+    async_engine = create_async_engine(
+        to_async_database_url(str(settings.TEST_DATABASE_URL))
+    )
+    try:
+        async with AsyncSession(async_engine, expire_on_commit=False) as db:
+            store_scores = store_with_orm if orm else store_with_copy
+            return await store_scores(db, project_id, user_id, opinions)
+    finally:
+        await async_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--opinions", type=int, default=100_000)
+    parser.add_argument("--orm", action="store_true")
+    args = parser.parse_args()
+
+    engine = create_engine(str(settings.TEST_DATABASE_URL))
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    try:
+        with SessionLocal() as db:
+            user = UserModel(
+                username="bench", email="bench@example.com", password_hash=""
+            )
+            db.add(user)
+            db.commit()
+            project = Project(user_id=user.id, name="Benchmark")
+            db.add(project)
+            db.commit()
+
+            project_id, user_id = project.id, user.id
+
+        elapsed = asyncio.run(store(project_id, user_id, args.opinions, args.orm))
+
+        print(f"method={'orm' if args.orm else 'copy'} opinions={args.opinions}")
+        print(f"elapsed={elapsed:.3f}s rows/sec={args.opinions / elapsed:.0f}")
+    finally:
+        Base.metadata.drop_all(bind=engine)
+
+
+if __name__ == "__main__":
+    main()
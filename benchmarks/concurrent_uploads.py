@@ -0,0 +1,124 @@
+"""Requests/sec of concurrent CSV uploads against the local fake Gemini server.
+
+Usage: ``python -m benchmarks.concurrent_uploads --concurrency 20 --latency-ms 500``
+
+Uses ``TEST_DATABASE_URL``; tables are recreated at the start and dropped at the
+end of the run.
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime
+
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.core.config import settings
+from app.api.dependencies.auth import get_current_user
+from app.api.dependencies.database import Base, get_db, to_async_database_url
+from app.domain.user import User as UserDomain
+from app.main import app
+from app.models.project import Project
+from app.models.user import User as UserModel
+from app.services.gemini import create_gemini_client
+from app.services.sentiment_backends import gemini as gemini_backend
+from benchmarks.fake_gemini import create_app as create_fake_gemini_app
+
+
+def build_csv(opinions: int) -> bytes:
+    rows = (f"{i},opinion number {i} is good\n" for i in range(opinions))
+    return "".join(rows).encode("utf-8")
+
+
+async def run(concurrency: int, requests: int, latency_ms: int, opinions: int) -> None:
+    fake_gemini_app = create_fake_gemini_app(latency_ms=latency_ms)
+    gemini_client = create_gemini_client(
+        httpx.AsyncClient(transport=httpx.ASGITransport(app=fake_gemini_app))
+    )
+    gemini_backend.get_gemini_client = lambda: gemini_client  # type: ignore
+
+    payload = build_csv(opinions)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://bench"
+    ) as client:
+
+        async def upload() -> None:
+            async with semaphore:
+                response = await client.post(
+                    "/sentiment-analysis-csv",
+                    params={
+                        "project_id": 1,
+                        "date_from": "2025-01-01",
+                        "date_to": "2025-01-31",
+                    },
+                    files={"file": ("opinions.csv", payload, "text/csv")},
+                )
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(upload() for _ in range(requests)))
+        elapsed = time.perf_counter() - start
+
+    print(
+        f"concurrency={concurrency} requests={requests} latency_ms={latency_ms} "
+        f"opinions={opinions}"
+    )
+    print(f"elapsed={elapsed:.2f}s requests/sec={requests / elapsed:.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--latency-ms", type=int, default=500)
+    parser.add_argument("--opinions", type=int, default=50)
+    args = parser.parse_args()
+
+    engine = create_engine(str(settings.TEST_DATABASE_URL))
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    with SessionLocal() as db:
+        db_user = UserModel(
+            username="bench", email="bench@example.com", password_hash=""
+        )
+        db.add(db_user)
+        db.commit()
+        db.add(Project(user_id=db_user.id, name="Benchmark"))
+        db.commit()
+        user = UserDomain(
+            id=db_user.id,
+            username="bench",
+            email="bench@example.com",
+            created_at=datetime.now(),
+        )
+
+    async_engine = create_async_engine(
+        to_async_database_url(str(settings.TEST_DATABASE_URL))
+    )
+    AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def override_get_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = lambda: user
+
+    try:
+        asyncio.run(
+            run(args.concurrency, args.requests, args.latency_ms, args.opinions)
+        )
+    finally:
+        app.dependency_overrides = {}
+        Base.metadata.drop_all(bind=engine)
+
+
+if __name__ == "__main__":
+    main()
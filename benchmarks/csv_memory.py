@@ -0,0 +1,94 @@
+"""Peak Python heap while ingesting and scoring CSV uploads of growing size.
+
+Usage: ``python -m benchmarks.csv_memory --sizes-mb 10 50 100``
+
+Each file is streamed through ``iter_opinions_csv`` in scoring batches and
+scored with the local lexicon backend, so no database or network is involved.
+Peak memory should stay flat as the file grows; ``--read-all`` reports the old
+read-decode-split approach for comparison.
+"""
+
+import argparse
+import asyncio
+import csv
+import io
+import os
+import tempfile
+import time
+import tracemalloc
+
+from starlette.datastructures import UploadFile
+
+from app.api.core.config import settings
+from app.domain.sentiment_analysis import Opinion
+from app.services.sentiment_analysis import iter_opinion_batches, iter_opinions_csv
+from app.services.sentiment_backends.lexicon import LexiconBackend
+
+ROW = '{i},"Opinion {i}: the product is good, but delivery was slow\nand ""meh"""\n'
+
+
+def write_csv(path: str, size_mb: int) -> None:
+    target = size_mb * 1024 * 1024
+    written = 0
+    i = 0
+    with open(path, "w", encoding="utf-8") as f:
+        while written < target:
+            rows = "".join(ROW.format(i=i + n) for n in range(1_000))
+            f.write(rows)
+            written += len(rows)
+            i += 1_000
+
+
+async def stream_and_score(path: str) -> int:
+    backend = LexiconBackend()
+    scored = 0
+    with open(path, "rb") as f:
+        opinions = iter_opinions_csv(UploadFile(file=f))
+        async for batch in iter_opinion_batches(
+            opinions, batch_size=settings.SENTIMENT_STREAM_BATCH_SIZE
+        ):
+            scored += len(await backend.score(batch))
+    return scored
+
+
+async def read_all_and_score(path: str) -> int:
+    with open(path, "rb") as f:
+        text = f.read().decode("utf-8")
+    opinions = [
+        Opinion(id=row[0], content=row[1]) for row in csv.reader(io.StringIO(text))
+    ]
+    return len(await LexiconBackend().score(opinions))
+
+
+def measure(path: str, read_all: bool) -> tuple[int, float, float]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    scored = asyncio.run(
+        read_all_and_score(path) if read_all else stream_and_score(path)
+    )
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return scored, peak / 1024 / 1024, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes-mb", type=int, nargs="+", default=[10, 50, 100])
+    parser.add_argument("--read-all", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size_mb in args.sizes_mb:
+            path = os.path.join(tmp, f"opinions_{size_mb}mb.csv")
+            write_csv(path, size_mb)
+            scored, peak_mb, elapsed = measure(path, args.read_all)
+            print(
+                f"size={size_mb}MB opinions={scored} peak={peak_mb:.1f}MB "
+                f"elapsed={elapsed:.2f}s"
+            )
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Prompt tokens and grouping time on a duplicate-heavy upload, per dedup mode.
+
+Usage: ``python -m benchmarks.dedup --opinions 20000 --duplicate-ratio 0.6``
+
+``duplicate_ratio`` of the opinions are boilerplate ("Great!", "ok") or spam
+copies with a word changed; the rest are distinct. Tokens are counted by the
+fake Gemini server's approximate tokenizer. The score cache is bypassed so
+every mode starts cold.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+import httpx
+
+from app.api.core.config import settings
+from app.domain.sentiment_analysis import Opinion
+from app.services.gemini import create_gemini_client
+from app.services.sentiment_backends import gemini as gemini_backend
+from app.services.sentiment_dedup import group_duplicate_opinions
+from benchmarks.fake_gemini import create_app as create_fake_gemini_app
+
+BOILERPLATE = ["Great!", "great", "GREAT!!!", "ok", "OK.", "Good", "good!", "meh"]
+SPAM = (
+    "Best deals on watches and bags, visit our shop {} and get free shipping "
+    "on every order over fifty dollars"
+)
+SPAM_WORDS = ["today", "now", "tonight", "online", "here"]
+WORDS = "delivery product quality price support size colour box battery screen".split()
+ADJECTIVES = "good bad great poor fine slow fast sad nice awful".split()
+
+
+def build_opinions(count: int, duplicate_ratio: float) -> list[Opinion]:
+    rng = random.Random(0)
+    opinions = []
+    for i in range(count):
+        roll = rng.random()
+        if roll < duplicate_ratio / 2:
+            content = rng.choice(BOILERPLATE)
+        elif roll < duplicate_ratio:
+            content = SPAM.format(rng.choice(SPAM_WORDS))
+        else:
+            content = " ".join(
+                f"the {rng.choice(WORDS)} was {rng.choice(ADJECTIVES)}"
+                for _ in range(3)
+            )
+            content += f" #{i}"
+        opinions.append(Opinion(id=str(i), content=content))
+    return opinions
+
+
+async def run(opinions: int, duplicate_ratio: float) -> None:
+    opinions_list = build_opinions(opinions, duplicate_ratio)
+
+    for mode in ("off", "exact", "near"):
+        fake_gemini_app = create_fake_gemini_app()
+        gemini_client = create_gemini_client(
+            httpx.AsyncClient(transport=httpx.ASGITransport(app=fake_gemini_app))
+        )
+        gemini_backend.get_gemini_client = lambda: gemini_client  # type: ignore
+
+        start = time.perf_counter()
+        if mode == "off":
+            representatives = opinions_list
+        else:
+            representatives = group_duplicate_opinions(
+                opinions_list,
+                near_duplicates=mode == "near",
+                similarity=settings.SENTIMENT_DEDUP_SIMILARITY,
+                permutations=settings.SENTIMENT_DEDUP_MINHASH_PERMUTATIONS,
+            ).representatives
+        grouping_elapsed = time.perf_counter() - start
+        await gemini_backend.score_opinions(representatives)
+
+        print(
+            f"dedup={mode} opinions={opinions} scored={len(representatives)} "
+            f"prompt_tokens={fake_gemini_app.state.prompt_tokens} "
+            f"output_tokens={fake_gemini_app.state.output_tokens} "
+            f"grouping={grouping_elapsed * 1000:.0f}ms"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--opinions", type=int, default=20000)
+    parser.add_argument("--duplicate-ratio", type=float, default=0.6)
+    args = parser.parse_args()
+    asyncio.run(run(args.opinions, args.duplicate_ratio))
+
+
+if __name__ == "__main__":
+    main()
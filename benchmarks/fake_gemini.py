@@ -0,0 +1,264 @@
+"""Local stand-in for the Gemini ``generateContent`` and Batch REST endpoints.
+
+Run it with ``uvicorn benchmarks.fake_gemini:app --port 8089`` and point the API
+at it with ``GEMINI_BASE_URL=http://127.0.0.1:8089``, or mount it in-process
+through ``httpx.ASGITransport`` (see ``benchmarks/concurrent_uploads.py``).
+
+Under uvicorn it is configured with ``FAKE_GEMINI_LATENCY_MS``,
+``FAKE_GEMINI_OUTPUT_TOKEN_LATENCY_MS``, ``FAKE_GEMINI_ERROR_RATE`` (fraction of
+calls answered with ``FAKE_GEMINI_ERROR_STATUS``) and
+``FAKE_GEMINI_RESPONSE_PADDING_BYTES`` (whitespace appended to every response
+text, which grows the payload without changing the scores).
+"""
+
+import asyncio
+import json
+import os
+import random
+import re
+import uuid
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+INPUT_DATA_MARKER = "**Input Data (ID: Text):**\n"
+ORDINAL_INPUT_DATA_MARKER = "**Input Data (one per line, number<TAB>text):**\n"
+# Letter runs of up to four, digit runs of up to three and single symbols: close
+# enough to a BPE tokenizer to compare prompt formats.
+TOKEN_PATTERN = re.compile(r"[A-Za-z]{1,4}|\d{1,3}|[^\sA-Za-z\d]")
+
+ERROR_MESSAGES = {
+    400: "Request contains an invalid argument.",
+    429: "Resource has been exhausted (e.g. check quota).",
+    503: "The model is overloaded.",
+}
+ERROR_STATUSES = {
+    400: "INVALID_ARGUMENT",
+    429: "RESOURCE_EXHAUSTED",
+    503: "UNAVAILABLE",
+}
+BATCH_METADATA_TYPE = (
+    "type.googleapis.com/google.ai.generativelanguage.v1main.GenerateContentBatch"
+)
+
+POSITIVE_WORDS = {"good", "great", "love", "excellent", "nice", "happy"}
+NEGATIVE_WORDS = {"bad", "awful", "hate", "terrible", "poor", "sad"}
+
+
+def score_text(text: str) -> float:
+    words = set(text.lower().split())
+    if words & POSITIVE_WORDS:
+        return 0.8
+    if words & NEGATIVE_WORDS:
+        return -0.8
+    return 0.0
+
+
+def parse_opinions(prompt: str) -> dict[str, str]:
+    opinions_str = prompt.split(INPUT_DATA_MARKER, 1)[-1]
+    opinions = {}
+    for item in opinions_str.split(", "):
+        opinion_id, _, content = item.partition(": ")
+        if opinion_id:
+            opinions[opinion_id] = content
+    return opinions
+
+
+def parse_ordinal_opinions(prompt: str) -> list[str]:
+    opinions_str = prompt.split(ORDINAL_INPUT_DATA_MARKER, 1)[-1]
+    return [line.partition("\t")[2] for line in opinions_str.splitlines()]
+
+
+def estimate_tokens(text: str) -> int:
+    return len(TOKEN_PATTERN.findall(text))
+
+
+def get_prompt_text(request_body: dict) -> str:
+    return "".join(
+        part.get("text", "")
+        for content in request_body["contents"]
+        for part in content["parts"]
+    )
+
+
+def score_prompt(prompt: str) -> str:
+    if ORDINAL_INPUT_DATA_MARKER in prompt:
+        return json.dumps(
+            [score_text(content) for content in parse_ordinal_opinions(prompt)]
+        )
+    opinions = parse_opinions(prompt)
+    return json.dumps(
+        {opinion_id: score_text(content) for opinion_id, content in opinions.items()}
+    )
+
+
+def build_error(status: int) -> dict:
+    return {
+        "code": status,
+        "message": ERROR_MESSAGES.get(status, "Error."),
+        "status": ERROR_STATUSES.get(status, "UNKNOWN"),
+    }
+
+
+def build_response(text: str, prompt: str) -> dict:
+    return {
+        "candidates": [
+            {
+                "content": {"parts": [{"text": text}], "role": "model"},
+                "finishReason": "STOP",
+            }
+        ],
+        "usageMetadata": {
+            "promptTokenCount": estimate_tokens(prompt),
+            "candidatesTokenCount": estimate_tokens(text),
+            "totalTokenCount": estimate_tokens(prompt) + estimate_tokens(text),
+        },
+    }
+
+
+def create_app(
+    latency_ms: int = 0,
+    output_token_latency_ms: float = 0.0,
+    error_rate: float = 0.0,
+    error_status: int = 503,
+    response_padding_bytes: int = 0,
+    seed: int = 0,
+) -> FastAPI:
+    """``output_token_latency_ms`` is added per response token, like decoding time.
+
+    The first ``state.fail_calls`` calls fail, then a random ``error_rate`` of
+    them; both answer ``state.fail_status``.
+    """
+    fake_app = FastAPI()
+    fake_app.state.latency_ms = latency_ms
+    fake_app.state.output_token_latency_ms = output_token_latency_ms
+    fake_app.state.error_rate = error_rate
+    fake_app.state.response_padding_bytes = response_padding_bytes
+    fake_app.state.random = random.Random(seed)
+    fake_app.state.prompt_tokens = 0
+    fake_app.state.output_tokens = 0
+    fake_app.state.calls = 0
+    fake_app.state.failed_calls = 0
+    fake_app.state.fail_calls = 0
+    fake_app.state.fail_status = error_status
+
+    # Batch mode: every poll answers RUNNING until ``batch_running_polls`` polls
+    # have been made, then the first ``batch_fail_requests`` inlined requests
+    # of the batch are answered with an error.
+    fake_app.state.batches = {}
+    fake_app.state.batch_calls = 0
+    fake_app.state.batch_running_polls = 1
+    fake_app.state.batch_fail_requests = 0
+
+    @fake_app.post("/{api_version}/models/{model_action}", response_model=None)
+    async def generate_content(
+        api_version: str, model_action: str, request: Request
+    ) -> dict | JSONResponse:
+        body = await request.json()
+        if model_action.endswith(":batchGenerateContent"):
+            return create_batch(model_action.partition(":")[0], body)
+
+        fake_app.state.calls += 1
+        prompt = get_prompt_text(body)
+
+        if fake_app.state.latency_ms:
+            await asyncio.sleep(fake_app.state.latency_ms / 1000)
+
+        if fake_app.state.fail_calls or (
+            fake_app.state.error_rate
+            and fake_app.state.random.random() < fake_app.state.error_rate
+        ):
+            fake_app.state.fail_calls = max(fake_app.state.fail_calls - 1, 0)
+            fake_app.state.failed_calls += 1
+            fail_status = fake_app.state.fail_status
+            return JSONResponse(
+                status_code=fail_status, content={"error": build_error(fail_status)}
+            )
+
+        text = score_prompt(prompt)
+        output_tokens = estimate_tokens(text)
+        fake_app.state.prompt_tokens += estimate_tokens(prompt)
+        fake_app.state.output_tokens += output_tokens
+        if fake_app.state.output_token_latency_ms:
+            await asyncio.sleep(
+                output_tokens * fake_app.state.output_token_latency_ms / 1000
+            )
+        return build_response(
+            text + " " * fake_app.state.response_padding_bytes, prompt
+        )
+
+    def create_batch(model: str, body: dict) -> dict:
+        fake_app.state.batch_calls += 1
+        batch = body["batch"]
+        name = f"batches/{uuid.uuid4().hex}"
+        fake_app.state.batches[name] = {
+            "model": f"models/{model}",
+            "displayName": batch.get("displayName"),
+            "state": "BATCH_STATE_PENDING",
+            "polls": 0,
+            "requests": [
+                item["request"] for item in batch["inputConfig"]["requests"]["requests"]
+            ],
+        }
+        return get_batch_operation(name)
+
+    def get_batch_operation(name: str) -> dict:
+        batch = fake_app.state.batches[name]
+        metadata = {
+            "@type": BATCH_METADATA_TYPE,
+            "model": batch["model"],
+            "displayName": batch["displayName"],
+            "state": batch["state"],
+        }
+        if batch["state"] == "BATCH_STATE_SUCCEEDED":
+            metadata["output"] = {
+                "inlinedResponses": {"inlinedResponses": batch["responses"]}
+            }
+        return {"name": name, "metadata": metadata}
+
+    @fake_app.get("/{api_version}/batches/{batch_id}", response_model=None)
+    async def get_batch(api_version: str, batch_id: str) -> dict | JSONResponse:
+        name = f"batches/{batch_id}"
+        batch = fake_app.state.batches.get(name)
+        if batch is None:
+            return JSONResponse(status_code=404, content={"error": build_error(404)})
+
+        if batch["state"] in ("BATCH_STATE_PENDING", "BATCH_STATE_RUNNING"):
+            batch["polls"] += 1
+            if batch["polls"] <= fake_app.state.batch_running_polls:
+                batch["state"] = "BATCH_STATE_RUNNING"
+            else:
+                batch["state"] = "BATCH_STATE_SUCCEEDED"
+                batch["responses"] = [
+                    (
+                        {"error": build_error(400)}
+                        if i < fake_app.state.batch_fail_requests
+                        else {
+                            "response": build_response(
+                                score_prompt(get_prompt_text(request)),
+                                get_prompt_text(request),
+                            )
+                        }
+                    )
+                    for i, request in enumerate(batch["requests"])
+                ]
+        return get_batch_operation(name)
+
+    @fake_app.post("/{api_version}/batches/{batch_action}", response_model=None)
+    async def cancel_batch(api_version: str, batch_action: str) -> dict:
+        batch = fake_app.state.batches[f"batches/{batch_action.partition(':')[0]}"]
+        batch["state"] = "BATCH_STATE_CANCELLED"
+        return {}
+
+    return fake_app
+
+
+app = create_app(
+    latency_ms=int(os.getenv("FAKE_GEMINI_LATENCY_MS", "0")),
+    output_token_latency_ms=float(
+        os.getenv("FAKE_GEMINI_OUTPUT_TOKEN_LATENCY_MS", "0")
+    ),
+    error_rate=float(os.getenv("FAKE_GEMINI_ERROR_RATE", "0")),
+    error_status=int(os.getenv("FAKE_GEMINI_ERROR_STATUS", "503")),
+    response_padding_bytes=int(os.getenv("FAKE_GEMINI_RESPONSE_PADDING_BYTES", "0")),
+)
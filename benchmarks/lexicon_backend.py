@@ -0,0 +1,37 @@
+"""Opinions/sec of the local lexicon backend.
+
+Usage: ``python -m benchmarks.lexicon_backend --opinions 300000``
+"""
+
+import argparse
+import random
+import time
+
+from app.services.sentiment_backends.lexicon import score_texts
+
+WORDS = (
+    "the product arrived on time and it was good but the box was damaged "
+    "delivery took a week price is fair would not recommend support staff "
+    "were very helpful I love the colour terrible packaging works fine"
+).split()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--opinions", type=int, default=300_000)
+    parser.add_argument("--words", type=int, default=12)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    texts = [" ".join(rng.choices(WORDS, k=args.words)) for _ in range(args.opinions)]
+
+    start = time.perf_counter()
+    score_texts(texts)
+    elapsed = time.perf_counter() - start
+
+    print(f"opinions={args.opinions} words={args.words}")
+    print(f"elapsed={elapsed:.2f}s opinions/sec={args.opinions / elapsed:,.0f}")
+
+
+if __name__ == "__main__":
+    main()
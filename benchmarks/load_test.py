@@ -0,0 +1,339 @@
+"""End-to-end load test: latency percentiles and requests/sec per endpoint.
+
+Usage: ``python -m benchmarks.load_test --concurrency 20 --duration 30``
+
+Each of ``--concurrency`` clients loops for ``--duration`` seconds, picking a
+scenario by weight (``--mix raw=1 csv=1 results=3 statistics=3 projects=2``).
+Every analysed opinion is unique, so the score cache and dedup do not hide the
+Gemini round trip. p50/p95/p99 latency, requests/sec and error counts are
+printed per scenario and written as JSON to ``--output``, for comparing runs.
+
+By default the API and the fake Gemini server (``benchmarks/fake_gemini.py``)
+run in-process against ``TEST_DATABASE_URL``; tables are recreated at the start
+and dropped at the end of the run. With ``--base-url`` a running deployment is
+driven instead, authenticated with ``--token`` against ``--project-id``; point
+its ``GEMINI_BASE_URL`` at ``uvicorn benchmarks.fake_gemini:app`` first.
+"""
+
+import argparse
+import asyncio
+import csv
+import io
+import json
+import random
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass, field
+
+import httpx
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.api.core.config import settings
+from app.api.dependencies.database import Base, get_db, to_async_database_url
+from app.main import app
+from app.services.gemini import create_gemini_client
+from app.services.sentiment_backends import gemini as gemini_backend
+from benchmarks.fake_gemini import create_app as create_fake_gemini_app
+
+PHRASES = [
+    "delivery was quick and the packaging was good",
+    "the product broke after two days, terrible quality",
+    "it arrived on time",
+    "great value, would buy again",
+    "customer support never answered my emails, sad",
+]
+DATE_RANGE = {"date_from": "2025-01-01", "date_to": "2025-01-31"}
+
+
+@dataclass
+class LoadTestContext:
+    client: httpx.AsyncClient
+    project_id: int
+    opinions: int
+    rng: random.Random = field(default_factory=random.Random)
+
+    def build_opinions(self) -> list[dict[str, str]]:
+        return [
+            {
+                "id": str(i),
+                "content": f"{self.rng.choice(PHRASES)} {self.rng.getrandbits(64):x}",
+            }
+            for i in range(self.opinions)
+        ]
+
+
+Scenario = Callable[[LoadTestContext], Awaitable[httpx.Response]]
+
+
+async def analyze_raw(context: LoadTestContext) -> httpx.Response:
+    return await context.client.post(
+        "/sentiment-analysis-raw",
+        params={"project_id": context.project_id, **DATE_RANGE},
+        json=context.build_opinions(),
+    )
+
+
+async def analyze_csv(context: LoadTestContext) -> httpx.Response:
+    csv_file = io.StringIO()
+    csv.writer(csv_file).writerows(
+        (opinion["id"], opinion["content"]) for opinion in context.build_opinions()
+    )
+    return await context.client.post(
+        "/sentiment-analysis-csv",
+        params={"project_id": context.project_id, **DATE_RANGE},
+        files={"file": ("opinions.csv", csv_file.getvalue().encode(), "text/csv")},
+    )
+
+
+async def list_results(context: LoadTestContext) -> httpx.Response:
+    return await context.client.get(
+        f"/sentiment-analysis_results/{context.project_id}", params={"limit": 100}
+    )
+
+
+async def get_statistics(context: LoadTestContext) -> httpx.Response:
+    return await context.client.get(
+        f"/sentiment-analysis_statistical_measures/{context.project_id}"
+    )
+
+
+async def list_projects(context: LoadTestContext) -> httpx.Response:
+    return await context.client.get("/projects/", params={"limit": 100})
+
+
+async def get_project(context: LoadTestContext) -> httpx.Response:
+    return await context.client.get(f"/projects/{context.project_id}")
+
+
+SCENARIOS: dict[str, Scenario] = {
+    "raw": analyze_raw,
+    "csv": analyze_csv,
+    "results": list_results,
+    "statistics": get_statistics,
+    "projects": list_projects,
+    "project": get_project,
+}
+
+
+@dataclass
+class ScenarioReport:
+    requests: int
+    errors: int
+    requests_per_second: float
+    p50_ms: float | None
+    p95_ms: float | None
+    p99_ms: float | None
+
+
+def build_report(latencies: list[float], errors: int, elapsed: float) -> ScenarioReport:
+    p50 = p95 = p99 = None
+    if len(latencies) >= 2:
+        quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+        p50, p95, p99 = (quantiles[q - 1] * 1000 for q in (50, 95, 99))
+    elif latencies:
+        p50 = p95 = p99 = latencies[0] * 1000
+    return ScenarioReport(
+        requests=len(latencies),
+        errors=errors,
+        requests_per_second=len(latencies) / elapsed,
+        p50_ms=p50,
+        p95_ms=p95,
+        p99_ms=p99,
+    )
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    project_id: int,
+    mix: dict[str, int],
+    concurrency: int,
+    duration: float,
+    opinions: int,
+) -> tuple[dict[str, ScenarioReport], ScenarioReport]:
+    latencies: dict[str, list[float]] = {name: [] for name in mix}
+    errors = dict.fromkeys(mix, 0)
+    names = list(mix)
+    weights = list(mix.values())
+    deadline = time.perf_counter() + duration
+
+    async def worker(seed: int) -> None:
+        context = LoadTestContext(client, project_id, opinions, rng=random.Random(seed))
+        while time.perf_counter() < deadline:
+            name = context.rng.choices(names, weights)[0]
+            start = time.perf_counter()
+            try:
+                response = await SCENARIOS[name](context)
+                failed = response.is_error
+            except httpx.HTTPError:
+                failed = True
+            latencies[name].append(time.perf_counter() - start)
+            errors[name] += failed
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(seed) for seed in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    reports = {
+        name: build_report(latencies[name], errors[name], elapsed) for name in mix
+    }
+    total = build_report(
+        [latency for name in mix for latency in latencies[name]],
+        sum(errors.values()),
+        elapsed,
+    )
+    return reports, total
+
+
+def parse_mix(items: list[str]) -> dict[str, int]:
+    mix = {}
+    for item in items:
+        name, _, weight = item.partition("=")
+        if name not in SCENARIOS:
+            raise ValueError(
+                f"Unknown scenario {name!r}, expected one of {', '.join(SCENARIOS)}"
+            )
+        mix[name] = int(weight or 1)
+    return mix
+
+
+async def run(args: argparse.Namespace, client: httpx.AsyncClient) -> None:
+    mix = args.mix
+    context = LoadTestContext(client, args.project_id, args.opinions)
+    for _ in range(args.warmup_requests):
+        (await analyze_raw(context)).raise_for_status()
+
+    reports, total = await run_load(
+        client, args.project_id, mix, args.concurrency, args.duration, args.opinions
+    )
+
+    for name, report in [*reports.items(), ("total", total)]:
+        print(
+            f"scenario={name} requests={report.requests} errors={report.errors} "
+            f"rps={report.requests_per_second:.1f} p50={report.p50_ms or 0:.1f}ms "
+            f"p95={report.p95_ms or 0:.1f}ms p99={report.p99_ms or 0:.1f}ms"
+        )
+
+    result = {
+        "config": {
+            "base_url": args.base_url,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "opinions": args.opinions,
+            "mix": mix,
+            "gemini_latency_ms": args.gemini_latency_ms,
+            "gemini_error_rate": args.gemini_error_rate,
+            "gemini_response_padding_bytes": args.gemini_response_padding_bytes,
+        },
+        "scenarios": {name: asdict(report) for name, report in reports.items()},
+        "total": asdict(total),
+    }
+    with open(args.output, "w") as output:
+        json.dump(result, output, indent=2)
+    print(f"written to {args.output}")
+
+
+async def run_remote(args: argparse.Namespace) -> None:
+    async with httpx.AsyncClient(
+        base_url=args.base_url,
+        headers={"Authorization": f"Bearer {args.token}"},
+        timeout=None,
+        limits=httpx.Limits(max_connections=args.concurrency),
+    ) as client:
+        await run(args, client)
+
+
+async def run_in_process(args: argparse.Namespace) -> None:
+    fake_gemini_app = create_fake_gemini_app(
+        latency_ms=args.gemini_latency_ms,
+        error_rate=args.gemini_error_rate,
+        response_padding_bytes=args.gemini_response_padding_bytes,
+    )
+    gemini_client = create_gemini_client(
+        httpx.AsyncClient(transport=httpx.ASGITransport(app=fake_gemini_app))
+    )
+    gemini_backend.get_gemini_client = lambda: gemini_client  # type: ignore
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url="http://bench",
+        headers={"Authorization": "Bearer bench-token"},
+        timeout=None,
+    ) as client:
+        await run(args, client)
+    print(
+        f"gemini_calls={fake_gemini_app.state.calls} "
+        f"gemini_failed_calls={fake_gemini_app.state.failed_calls}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument(
+        "--mix",
+        nargs="+",
+        default=["raw=1", "csv=1", "results=3", "statistics=3", "projects=2"],
+        help=f"scenario=weight pairs; scenarios: {', '.join(SCENARIOS)}",
+    )
+    parser.add_argument("--opinions", type=int, default=50)
+    parser.add_argument("--warmup-requests", type=int, default=5)
+    parser.add_argument("--output", default="load_test_results.json")
+    parser.add_argument("--base-url")
+    parser.add_argument("--token")
+    parser.add_argument("--project-id", type=int, default=1)
+    parser.add_argument("--gemini-latency-ms", type=int, default=300)
+    parser.add_argument("--gemini-error-rate", type=float, default=0.0)
+    parser.add_argument("--gemini-response-padding-bytes", type=int, default=0)
+    args = parser.parse_args()
+    try:
+        args.mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.base_url:
+        if not args.token:
+            parser.error("--token is required with --base-url")
+        asyncio.run(run_remote(args))
+        return
+
+    engine = create_engine(str(settings.TEST_DATABASE_URL))
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO users (username, email, password_hash, created_at) "
+                "VALUES ('bench', 'bench@example.com', '', now())"
+            )
+        )
+        connection.execute(
+            text("INSERT INTO auth_tokens (user_id, token) VALUES (1, 'bench-token')")
+        )
+        connection.execute(
+            text("INSERT INTO projects (user_id, name) VALUES (1, 'Benchmark')")
+        )
+
+    async_engine = create_async_engine(
+        to_async_database_url(str(settings.TEST_DATABASE_URL)),
+        pool_size=args.concurrency,
+    )
+    AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def override_get_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+
+    try:
+        asyncio.run(run_in_process(args))
+    finally:
+        app.dependency_overrides = {}
+        Base.metadata.drop_all(bind=engine)
+
+
+if __name__ == "__main__":
+    main()
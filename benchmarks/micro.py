@@ -0,0 +1,350 @@
+"""Time and peak memory of CPU-bound hot paths, checked against stored baselines.
+
+Usage: ``python -m benchmarks.micro`` to compare with ``benchmarks/baselines/micro.json``
+and exit with status 1 on a regression, ``python -m benchmarks.micro --save`` to
+record new baselines (only for the selected cases), ``--filter csv`` to run the
+cases whose name contains ``csv``.
+
+Time is the best of ``--repeat`` runs, per call, with the garbage collector
+off as in ``timeit``. Peak memory is measured with
+``tracemalloc`` over one call, excluding the inputs, and is stable across
+machines with the same Python version, whereas time baselines are only
+comparable on the machine that recorded them; ``--metrics memory`` checks
+memory alone.
+"""
+
+import argparse
+import asyncio
+import gc
+import inspect
+import io
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+
+from starlette.datastructures import UploadFile
+
+from app.api.core.config import settings
+from app.api.core.responses import rows_response
+from app.api.sentiment_analysis import SentimentAnalysisResponse
+from app.domain.sentiment_analysis import Opinion, PromptPackingE
+from app.repository.project_sentiment_statistics import sentiment_histogram_bin
+from app.services.sentiment_analysis import (
+    SentimentAnalysisResult,
+    SentimentCounts,
+    histogram_median,
+    iter_opinions_csv,
+)
+from app.services.sentiment_backends.gemini import (
+    opinions_list_to_ordinal_str,
+    opinions_list_to_str,
+    parse_chunk_response,
+)
+from app.services.sentiment_backends.lexicon import score_texts
+from app.services.sentiment_dedup import group_duplicate_opinions
+
+BASELINE_PATH = Path(__file__).parent / "baselines" / "micro.json"
+# Differences below these are noise whatever the relative change.
+MIN_SECONDS_DELTA = 0.0005
+MIN_PEAK_BYTES_DELTA = 64 * 1024
+
+PHRASES = [
+    "delivery was quick and the packaging was good",
+    "the product broke after two days, terrible quality",
+    "it arrived on time",
+    "great value, would buy again",
+    "customer support never answered my emails, sad",
+]
+
+# Builds the inputs and returns a function making one call, which may return a
+# coroutine.
+CaseFactory = Callable[[], Callable[[], object]]
+
+
+@dataclass
+class Case:
+    name: str
+    make_call: CaseFactory
+    number: int = 1
+
+
+def build_opinions(count: int) -> list[Opinion]:
+    rng = random.Random(0)
+    return [
+        Opinion(id=str(i), content=f"{rng.choice(PHRASES)} {rng.getrandbits(32):x}")
+        for i in range(count)
+    ]
+
+
+def csv_parse_case(rows: int) -> CaseFactory:
+    def make_call() -> Callable[[], object]:
+        payload = "".join(
+            f'{opinion.id},"{opinion.content}"\n' for opinion in build_opinions(rows)
+        ).encode()
+
+        async def call() -> None:
+            upload = UploadFile(file=io.BytesIO(payload))
+            async for _ in iter_opinions_csv(upload):
+                pass
+
+        return call
+
+    return make_call
+
+
+def prompt_case(to_str: Callable[[list[Opinion]], str]) -> CaseFactory:
+    def make_call() -> Callable[[], object]:
+        opinions = build_opinions(10_000)
+        return lambda: to_str(opinions)
+
+    return make_call
+
+
+def response_parse_case(packing: PromptPackingE) -> CaseFactory:
+    def make_call() -> Callable[[], object]:
+        opinions = build_opinions(10_000)
+        scores = [round(random.Random(i).uniform(-1, 1), 2) for i in range(10_000)]
+        if packing == PromptPackingE.ORDINAL:
+            text = json.dumps(scores)
+        else:
+            text = json.dumps({o.id: score for o, score in zip(opinions, scores)})
+
+        def call() -> object:
+            previous = settings.SENTIMENT_PROMPT_PACKING
+            settings.SENTIMENT_PROMPT_PACKING = packing
+            try:
+                return parse_chunk_response(opinions, text)
+            finally:
+                settings.SENTIMENT_PROMPT_PACKING = previous
+
+        return call
+
+    return make_call
+
+
+def sentiment_counts_case() -> Callable[[], object]:
+    rng = random.Random(0)
+    batches = [[round(rng.uniform(-1, 1), 2) for _ in range(2_000)] for _ in range(50)]
+
+    def call() -> float:
+        counts = SentimentCounts()
+        for batch in batches:
+            counts.add(batch)
+        return counts.avg_sentiment
+
+    return call
+
+
+def histogram_median_case() -> Callable[[], object]:
+    rng = random.Random(0)
+    histogram: dict[str, int] = {}
+    for _ in range(100_000):
+        key = str(sentiment_histogram_bin(rng.uniform(-1, 1)))
+        histogram[key] = histogram.get(key, 0) + 1
+    return lambda: histogram_median(histogram, 100_000)
+
+
+def build_results(count: int) -> list[SentimentAnalysisResult]:
+    return [
+        SentimentAnalysisResult(
+            id=i,
+            project_id=1,
+            user_id=1,
+            date_from=date(2025, 1, 1),
+            date_to=date(2025, 1, 31),
+            opinions_count=100,
+            positive_count=50,
+            neutral_count=30,
+            negative_count=20,
+            avg_sentiment=0.25,
+            created_at=datetime(2025, 2, 1, 12, 0, 0),
+        )
+        for i in range(count)
+    ]
+
+
+def rows_response_case() -> Callable[[], object]:
+    results = build_results(1_000)
+    return lambda: rows_response(SentimentAnalysisResponse, results)
+
+
+def model_validate_case() -> Callable[[], object]:
+    results = build_results(1_000)
+    return lambda: [
+        SentimentAnalysisResponse.model_validate(result) for result in results
+    ]
+
+
+def dedup_case() -> Callable[[], object]:
+    opinions = build_opinions(5_000) + build_opinions(5_000)
+    return lambda: group_duplicate_opinions(opinions)
+
+
+def lexicon_case() -> Callable[[], object]:
+    texts = [opinion.content for opinion in build_opinions(10_000)]
+    return lambda: score_texts(texts)
+
+
+CASES = [
+    Case("csv_parse_1k", csv_parse_case(1_000), number=20),
+    Case("csv_parse_100k", csv_parse_case(100_000)),
+    Case("csv_parse_1m", csv_parse_case(1_000_000)),
+    Case("prompt_keyed_10k", prompt_case(opinions_list_to_str), number=20),
+    Case("prompt_ordinal_10k", prompt_case(opinions_list_to_ordinal_str), number=20),
+    Case("response_keyed_10k", response_parse_case(PromptPackingE.KEYED), number=5),
+    Case("response_ordinal_10k", response_parse_case(PromptPackingE.ORDINAL), number=5),
+    Case("sentiment_counts_100k", sentiment_counts_case, number=5),
+    Case("histogram_median_100k", histogram_median_case, number=200),
+    Case("rows_response_1k", rows_response_case, number=10),
+    Case("model_validate_1k", model_validate_case, number=5),
+    Case("dedup_exact_10k", dedup_case, number=5),
+    Case("lexicon_score_10k", lexicon_case, number=5),
+]
+
+
+def run_call(loop: asyncio.AbstractEventLoop, call: Callable[[], object]) -> None:
+    result = call()
+    if inspect.iscoroutine(result):
+        loop.run_until_complete(result)
+
+
+def measure(
+    case: Case, repeat: int, loop: asyncio.AbstractEventLoop
+) -> dict[str, float]:
+    call = case.make_call()
+    run_call(loop, call)
+
+    best = float("inf")
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(case.number):
+                run_call(loop, call)
+            best = min(best, (time.perf_counter() - start) / case.number)
+    finally:
+        gc.enable()
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        run_call(loop, call)
+        peak = tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+    return {"seconds": best, "peak_bytes": peak}
+
+
+def find_regressions(
+    name: str,
+    measured: dict[str, float],
+    baseline: dict[str, float],
+    metrics: list[str],
+    time_threshold: float,
+    memory_threshold: float,
+) -> list[str]:
+    regressions = []
+    seconds, base_seconds = measured["seconds"], baseline["seconds"]
+    if (
+        "time" in metrics
+        and seconds > base_seconds * (1 + time_threshold)
+        and seconds - base_seconds > MIN_SECONDS_DELTA
+    ):
+        regressions.append(
+            f"{name}: time {seconds * 1000:.2f}ms vs {base_seconds * 1000:.2f}ms"
+        )
+    peak, base_peak = measured["peak_bytes"], baseline["peak_bytes"]
+    if (
+        "memory" in metrics
+        and peak > base_peak * (1 + memory_threshold)
+        and peak - base_peak > MIN_PEAK_BYTES_DELTA
+    ):
+        regressions.append(
+            f"{name}: peak memory {peak / 1024:.0f}KiB vs {base_peak / 1024:.0f}KiB"
+        )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--filter", default="")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save", action="store_true")
+    parser.add_argument(
+        "--metrics", nargs="+", choices=["time", "memory"], default=["time", "memory"]
+    )
+    parser.add_argument("--time-threshold", type=float, default=0.25)
+    parser.add_argument("--memory-threshold", type=float, default=0.10)
+    args = parser.parse_args()
+
+    stored: dict = {"cases": {}}
+    if args.baseline.exists():
+        stored = json.loads(args.baseline.read_text())
+    baselines = stored["cases"]
+    if stored.get("python", platform.python_version()) != platform.python_version():
+        print(f"note: baselines were recorded with Python {stored['python']}")
+
+    loop = asyncio.new_event_loop()
+    results = {}
+    regressions = []
+    try:
+        for case in CASES:
+            if args.filter not in case.name:
+                continue
+            measured = measure(case, args.repeat, loop)
+            results[case.name] = measured
+            baseline = baselines.get(case.name)
+            line = (
+                f"case={case.name} time={measured['seconds'] * 1000:.3f}ms "
+                f"peak={measured['peak_bytes'] / 1024:.0f}KiB"
+            )
+            if baseline is not None:
+                line += (
+                    f" time_ratio={measured['seconds'] / baseline['seconds']:.2f}"
+                    f" peak_ratio={measured['peak_bytes'] / baseline['peak_bytes']:.2f}"
+                )
+                regressions += find_regressions(
+                    case.name,
+                    measured,
+                    baseline,
+                    args.metrics,
+                    args.time_threshold,
+                    args.memory_threshold,
+                )
+            print(line)
+    finally:
+        loop.close()
+
+    if args.save:
+        baselines.update(results)
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(
+            json.dumps(
+                {
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "cases": dict(sorted(baselines.items())),
+                },
+                indent=2,
+            )
+            + "\n"
+        )
+        print(f"baselines written to {args.baseline}")
+        return
+
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""Latency of cheap reads while slow queries or uploads run on the same worker.
+
+Usage: ``python -m benchmarks.mixed_load --readers 20 --slow-clients 5 --uploaders 40``
+
+Readers fetch one project (auth lookup plus a primary-key read). Slow clients
+hit a benchmark-only route that runs ``pg_sleep`` through the regular ``get_db``
+session, i.e. a query that takes long in Postgres without using CPU here. With
+blocking database calls the readers queue behind every slow query; with the
+async engine their p99 should barely move between the two phases.
+
+Uploaders post opinions to ``/sentiment-analysis-raw`` against the in-process
+fake Gemini server answering after ``--gemini-latency-ms``. The engine uses the
+app's ``DATABASE_POOL_SIZE`` and ``DATABASE_MAX_OVERFLOW``, so an upload that
+held a connection for the whole Gemini call would show up as readers waiting
+for, or timing out on, the pool.
+
+Uses ``TEST_DATABASE_URL``; tables are recreated at the start and dropped at the
+end of the run.
+"""
+
+import argparse
+import asyncio
+import itertools
+import statistics
+import time
+
+import httpx
+from fastapi import Depends
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.api.core.config import settings
+from app.api.dependencies.database import Base, get_db, to_async_database_url
+from app.main import app
+from app.services.gemini import create_gemini_client
+from app.services.sentiment_backends import gemini as gemini_backend
+from benchmarks.fake_gemini import create_app as create_fake_gemini_app
+
+UPLOAD_PARAMS: dict[str, str | int] = {
+    "project_id": 1,
+    "date_from": "2025-01-01",
+    "date_to": "2025-01-31",
+}
+
+
+@app.get("/benchmarks/slow-query", include_in_schema=False)
+async def slow_query_api(seconds: float, db: AsyncSession = Depends(get_db)) -> None:
+    await db.execute(text("SELECT pg_sleep(:seconds)"), {"seconds": seconds})
+
+
+def percentile(latencies: list[float], q: int) -> float:
+    return statistics.quantiles(latencies, n=100)[q - 1] * 1000
+
+
+async def run_phase(
+    client: httpx.AsyncClient,
+    readers: int,
+    slow_clients: int,
+    slow_query_ms: int,
+    uploaders: int,
+    upload_opinions: int,
+    duration: float,
+) -> tuple[list[float], int, int]:
+    latencies: list[float] = []
+    errors = upload_errors = 0
+    deadline = time.perf_counter() + duration
+    # Every upload sends new texts, so none is answered from the score cache.
+    upload_numbers = itertools.count()
+
+    async def read() -> None:
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                response = await client.get("/projects/1")
+                response.raise_for_status()
+            except Exception:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    async def slow_query() -> None:
+        while time.perf_counter() < deadline:
+            response = await client.get(
+                "/benchmarks/slow-query", params={"seconds": slow_query_ms / 1000}
+            )
+            response.raise_for_status()
+
+    async def upload() -> None:
+        nonlocal upload_errors
+        while time.perf_counter() < deadline:
+            upload_number = next(upload_numbers)
+            try:
+                response = await client.post(
+                    "/sentiment-analysis-raw",
+                    params=UPLOAD_PARAMS,
+                    json=[
+                        {"id": str(i), "content": f"good product {upload_number} {i}"}
+                        for i in range(upload_opinions)
+                    ],
+                )
+                response.raise_for_status()
+            except Exception:
+                upload_errors += 1
+
+    await asyncio.gather(
+        *(read() for _ in range(readers)),
+        *(slow_query() for _ in range(slow_clients)),
+        *(upload() for _ in range(uploaders)),
+    )
+    return latencies, errors, upload_errors
+
+
+async def run(args: argparse.Namespace) -> None:
+    fake_gemini_app = create_fake_gemini_app(latency_ms=args.gemini_latency_ms)
+    gemini_client = create_gemini_client(
+        httpx.AsyncClient(transport=httpx.ASGITransport(app=fake_gemini_app))
+    )
+    gemini_backend.get_gemini_client = lambda: gemini_client  # type: ignore
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url="http://bench",
+        headers={"Authorization": "Bearer bench-token"},
+        timeout=None,
+    ) as client:
+        for phase, slow_clients, uploaders in (
+            ("reads", 0, 0),
+            ("slow-queries", args.slow_clients, 0),
+            ("uploads", 0, args.uploaders),
+        ):
+            latencies, errors, upload_errors = await run_phase(
+                client,
+                args.readers,
+                slow_clients,
+                args.slow_query_ms,
+                uploaders,
+                args.upload_opinions,
+                args.duration,
+            )
+            print(
+                f"phase={phase} slow_clients={slow_clients} uploaders={uploaders} "
+                f"requests={len(latencies)} errors={errors} "
+                f"upload_errors={upload_errors} "
+                f"p50={percentile(latencies, 50):.1f}ms "
+                f"p95={percentile(latencies, 95):.1f}ms "
+                f"p99={percentile(latencies, 99):.1f}ms"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--readers", type=int, default=20)
+    parser.add_argument("--slow-clients", type=int, default=5)
+    parser.add_argument("--slow-query-ms", type=int, default=500)
+    parser.add_argument("--uploaders", type=int, default=40)
+    parser.add_argument("--upload-opinions", type=int, default=20)
+    parser.add_argument("--gemini-latency-ms", type=int, default=2000)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    engine = create_engine(str(settings.TEST_DATABASE_URL))
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO users (username, email, password_hash, created_at) "
+                "VALUES ('bench', 'bench@example.com', '', now())"
+            )
+        )
+        connection.execute(
+            text("INSERT INTO auth_tokens (user_id, token) VALUES (1, 'bench-token')")
+        )
+        connection.execute(
+            text("INSERT INTO projects (user_id, name) VALUES (1, 'Benchmark')")
+        )
+
+    async_engine = create_async_engine(
+        to_async_database_url(str(settings.TEST_DATABASE_URL)),
+        pool_size=settings.DATABASE_POOL_SIZE,
+        max_overflow=settings.DATABASE_MAX_OVERFLOW,
+    )
+    AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def override_get_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+
+    try:
+        asyncio.run(run(args))
+    finally:
+        app.dependency_overrides = {}
+        Base.metadata.drop_all(bind=engine)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Tokens and latency per 1,000 opinions for each prompt packing mode.
+
+Usage: ``python -m benchmarks.prompt_packing --opinions 1000``
+
+Opinions carry UUID IDs, as integrations usually send. Tokens are counted by
+the fake Gemini server's approximate tokenizer, and its per-output-token
+latency stands in for decoding time, which is what the shorter output saves.
+``matched`` counts scores that map back to an input ID. The keyed format joins
+opinions with ", ", so every comma inside a content also yields a bogus score.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+
+import httpx
+
+from app.api.core.config import settings
+from app.domain.sentiment_analysis import Opinion, PromptPackingE
+from app.services.gemini import create_gemini_client
+from app.services.sentiment_backends import gemini as gemini_backend
+from benchmarks.fake_gemini import create_app as create_fake_gemini_app
+
+PHRASES = [
+    "delivery was quick and the packaging was good",
+    "the product broke after two days, terrible quality",
+    "it arrived on time",
+    "great value, would buy again",
+    "customer support never answered my emails, sad",
+    "works as described, nothing special",
+]
+
+
+def build_opinions(count: int) -> list[Opinion]:
+    rng = random.Random(0)
+    return [
+        Opinion(
+            id=str(uuid.UUID(int=rng.getrandbits(128))),
+            content=", ".join(rng.sample(PHRASES, 2)),
+        )
+        for _ in range(count)
+    ]
+
+
+async def run(opinions: int, latency_ms: int, output_token_latency_ms: float) -> None:
+    opinions_list = build_opinions(opinions)
+
+    for packing in PromptPackingE:
+        settings.SENTIMENT_PROMPT_PACKING = packing
+        fake_gemini_app = create_fake_gemini_app(
+            latency_ms=latency_ms, output_token_latency_ms=output_token_latency_ms
+        )
+        gemini_client = create_gemini_client(
+            httpx.AsyncClient(transport=httpx.ASGITransport(app=fake_gemini_app))
+        )
+        gemini_backend.get_gemini_client = lambda: gemini_client  # type: ignore
+
+        start = time.perf_counter()
+        values = await gemini_backend.score_opinions(opinions_list)
+        elapsed = time.perf_counter() - start
+        ids = {opinion.id for opinion in opinions_list}
+        matched = sum(value.id in ids for value in values)
+
+        per_thousand = 1000 / opinions
+        print(
+            f"packing={packing} opinions={opinions} "
+            f"scores={len(values)} matched={matched} "
+            f"prompt_tokens/1k={fake_gemini_app.state.prompt_tokens * per_thousand:.0f} "
+            f"output_tokens/1k={fake_gemini_app.state.output_tokens * per_thousand:.0f} "
+            f"elapsed={elapsed:.2f}s"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--opinions", type=int, default=1000)
+    parser.add_argument("--latency-ms", type=int, default=300)
+    parser.add_argument("--output-token-latency-ms", type=float, default=4.0)
+    args = parser.parse_args()
+    asyncio.run(run(args.opinions, args.latency_ms, args.output_token_latency_ms))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Peak memory and time to first byte of the results export versus building a list.
+
+Usage: ``python -m benchmarks.results_export --results 200000``
+
+The export is consumed straight from the service generator, discarding each
+chunk as a socket would, so only server-side memory is measured. tracemalloc
+slows both modes down, so compare elapsed times between modes only.
+
+Uses ``TEST_DATABASE_URL``; tables are recreated at the start and dropped at the
+end of the run.
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+from typing import cast
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.api.core.config import settings
+from app.api.dependencies.database import Base, to_async_database_url
+from app.api.sentiment_analysis import SentimentAnalysisResponse
+from app.domain.sentiment_analysis import ExportFormatE
+from app.models import (  # noqa: F401
+    project,
+    project_sentiment_rollup,
+    project_sentiment_statistics,
+    sentiment_analysis,
+    sentiment_analysis_job,
+    sentiment_score_cache,
+    token,
+    user,
+)
+from app.repository.sentiment_analysis import get_sentiment_analysis_results
+from app.services.sentiment_export import export_sentiment_analysis_results
+
+
+async def run(results: int) -> None:
+    async_engine = create_async_engine(
+        to_async_database_url(str(settings.TEST_DATABASE_URL))
+    )
+    AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    for export_format in ExportFormatE:
+        async with AsyncSessionLocal() as db:
+            tracemalloc.start()
+            start = time.perf_counter()
+            first_byte = None
+            size = 0
+            async for chunk in export_sentiment_analysis_results(
+                db, project_id=1, user_id=1, export_format=export_format
+            ):
+                if first_byte is None:
+                    first_byte = time.perf_counter() - start
+                size += len(chunk)
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        print(
+            f"mode=export-{export_format} results={results} "
+            f"first_byte={cast(float, first_byte) * 1000:.1f}ms "
+            f"elapsed={elapsed:.2f}s peak={peak / 2**20:.1f}MB size={size / 2**20:.1f}MB"
+        )
+
+    async with AsyncSessionLocal() as db:
+        tracemalloc.start()
+        start = time.perf_counter()
+        rows = await get_sentiment_analysis_results(db, project_id=1, user_id=1)
+        body = [
+            SentimentAnalysisResponse(
+                project_id=row.project_id,
+                user_id=row.user_id,
+                date_from=row.date_from,
+                date_to=row.date_to,
+                opinions_count=row.opinions_count,
+                positive_count=row.positive_count,
+                neutral_count=row.neutral_count,
+                negative_count=row.negative_count,
+                avg_sentiment=cast(float, row.avg_sentiment),
+                created_at=row.created_at,
+            )
+            for row in rows
+        ]
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    print(
+        f"mode=list results={len(body)} first_byte={elapsed * 1000:.1f}ms "
+        f"elapsed={elapsed:.2f}s peak={peak / 2**20:.1f}MB"
+    )
+
+    await async_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--results", type=int, default=200_000)
+    args = parser.parse_args()
+
+    engine = create_engine(str(settings.TEST_DATABASE_URL))
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO users (username, email, password_hash, created_at) "
+                "VALUES ('bench', 'bench@example.com', '', now())"
+            )
+        )
+        connection.execute(
+            text("INSERT INTO projects (user_id, name) VALUES (1, 'Benchmark')")
+        )
+        connection.execute(
+            text(
+                "INSERT INTO sentiment_analysis_results (project_id, user_id, "
+                "date_from, date_to, created_at, opinions_count, positive_count, "
+                "neutral_count, negative_count, avg_sentiment) "
+                "SELECT 1, 1, date '2020-01-01' + g % 1500, "
+                "date '2020-01-01' + g % 1500 + 30, "
+                "timestamp '2020-01-01' + g * interval '1 minute', "
+                "100, 40, 30, 30, 0.1 "
+                "FROM generate_series(1, :results) AS g"
+            ),
+            {"results": args.results},
+        )
+
+    try:
+        asyncio.run(run(args.results))
+    finally:
+        Base.metadata.drop_all(bind=engine)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""CPU spent serializing a 10k-row list response, per encoding path.
+
+Usage: ``python -m benchmarks.serialization --rows 10000 --requests 20``
+
+Each path serves the same in-memory ORM rows through the ASGI stack, so the
+database is not involved and the difference is serialization alone:
+
+- ``models``: copy every row into a response model and return the list, which
+  FastAPI validates and dumps again before encoding it with ``json``.
+- ``rows``: ``rows_response``, which reads the fields off the rows and encodes
+  them with orjson.
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import date, datetime
+from typing import cast
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+from app.api.core.responses import rows_response
+from app.api.sentiment_analysis import SentimentAnalysisResponse
+from app.models import (  # noqa: F401
+    project,
+    project_sentiment_rollup,
+    project_sentiment_statistics,
+    sentiment_analysis,
+    sentiment_analysis_job,
+    sentiment_score_cache,
+    token,
+    user,
+)
+from app.models.sentiment_analysis import SentimentAnalysisResult
+
+
+def create_app(results: list[SentimentAnalysisResult]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/models", response_class=JSONResponse)
+    async def models() -> list[SentimentAnalysisResponse]:
+        return [
+            SentimentAnalysisResponse(
+                project_id=result.project_id,
+                user_id=result.user_id,
+                date_from=result.date_from,
+                date_to=result.date_to,
+                opinions_count=result.opinions_count,
+                positive_count=result.positive_count,
+                neutral_count=result.neutral_count,
+                negative_count=result.negative_count,
+                avg_sentiment=cast(float, result.avg_sentiment),
+                created_at=result.created_at,
+            )
+            for result in results
+        ]
+
+    @app.get("/rows", response_model=list[SentimentAnalysisResponse])
+    async def rows():
+        return rows_response(SentimentAnalysisResponse, results)
+
+    return app
+
+
+async def run(rows: int, requests: int) -> None:
+    results = [
+        SentimentAnalysisResult(
+            id=i,
+            project_id=1,
+            user_id=1,
+            date_from=date(2025, 1, 1),
+            date_to=date(2025, 1, 31),
+            opinions_count=100,
+            positive_count=40,
+            neutral_count=30,
+            negative_count=30,
+            avg_sentiment=0.12,
+            created_at=datetime(2025, 1, 1, 12, 0, 0),
+        )
+        for i in range(rows)
+    ]
+    app = create_app(results)
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://bench"
+    ) as client:
+        for path in ("models", "rows"):
+            body = (await client.get(f"/{path}")).json()
+            assert len(body) == rows
+            start = time.process_time()
+            for _ in range(requests):
+                response = await client.get(f"/{path}")
+                response.raise_for_status()
+            cpu = (time.process_time() - start) / requests
+            print(f"mode={path} rows={rows} cpu/request={cpu * 1000:.1f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.requests))
+
+
+if __name__ == "__main__":
+    main()
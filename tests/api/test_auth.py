@@ -0,0 +1,23 @@
+def test_register_and_use_token(test_client):
+    register_response = test_client.post(
+        "/register/",
+        json={"username": "new", "email": "new@example.com", "password": "1234"},
+    )
+    assert register_response.status_code == 200
+    token = register_response.json()["token"]
+
+    response = test_client.get(
+        "/users/me", headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 200
+    assert response.json() == {"username": "new", "email": "new@example.com"}
+
+    login_response = test_client.post(
+        "/login/", json={"email": "new@example.com", "password": "1234"}
+    )
+    assert login_response.json()["token"] == token
+
+
+def test_invalid_token(test_client):
+    response = test_client.get("/users/me", headers={"Authorization": "Bearer nope"})
+    assert response.status_code == 401
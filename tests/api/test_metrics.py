@@ -0,0 +1,105 @@
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from app.api.core.config import settings
+
+
+def get_sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_metrics_record_route_latency_and_queries(test_auth_client):
+    labels = {"method": "GET", "route": "/projects/{project_id}"}
+    requests_before = get_sample(
+        "polarify_http_request_duration_seconds_count", **labels
+    )
+    queries_before = get_sample(
+        "polarify_db_query_duration_seconds_count", route="/projects/{project_id}"
+    )
+
+    test_auth_client.post("/projects", json={"name": "Test"})
+    test_auth_client.get("/projects/1")
+    test_auth_client.get("/projects/2")
+
+    assert (
+        get_sample("polarify_http_request_duration_seconds_count", **labels)
+        == requests_before + 2
+    )
+    assert (
+        get_sample(
+            "polarify_db_query_duration_seconds_count", route="/projects/{project_id}"
+        )
+        >= queries_before + 2
+    )
+    assert get_sample("polarify_http_responses_total", **labels, status="404") >= 1
+    assert get_sample("polarify_http_requests_in_progress", **labels) == 0
+
+    response = test_auth_client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'route="/projects/{project_id}"' in response.text
+
+
+def test_metrics_forget_failed_queries(run_with_db):
+    queries_before = get_sample(
+        "polarify_db_query_duration_seconds_count", route="background"
+    )
+
+    async def run_failing_query(db):
+        connection = await db.connection()
+        with pytest.raises(DBAPIError):
+            await connection.execute(text("SELECT * FROM missing_table"))
+        return connection.info["query_start_times"]
+
+    assert run_with_db(run_failing_query) == []
+    assert (
+        get_sample("polarify_db_query_duration_seconds_count", route="background")
+        == queries_before + 1
+    )
+
+
+def test_metrics_record_gemini_calls_and_scored_opinions(test_auth_client, fake_gemini):
+    calls_before = get_sample("polarify_gemini_request_duration_seconds_count")
+    tokens_before = get_sample("polarify_gemini_tokens_total", type="prompt")
+    scored_before = get_sample("polarify_opinions_scored_total", backend="gemini")
+
+    test_auth_client.post("/projects", json={"name": "Test"})
+    test_auth_client.post(
+        "/sentiment-analysis-raw",
+        params={"project_id": 1, "date_from": "2025-01-01", "date_to": "2025-01-31"},
+        json=[
+            {"id": "1", "content": "good product"},
+            {"id": "2", "content": "bad service"},
+        ],
+    )
+
+    assert (
+        get_sample("polarify_gemini_request_duration_seconds_count") == calls_before + 1
+    )
+    assert get_sample("polarify_gemini_tokens_total", type="prompt") > tokens_before
+    assert (
+        get_sample("polarify_opinions_scored_total", backend="gemini")
+        == scored_before + 2
+    )
+
+
+def test_metrics_count_gemini_errors_by_status(test_auth_client, fake_gemini):
+    fake_gemini.state.fail_calls = 1
+    fake_gemini.state.fail_status = 400
+    errors_before = get_sample("polarify_gemini_errors_total", type="400")
+
+    test_auth_client.post("/projects", json={"name": "Test"})
+    test_auth_client.post(
+        "/sentiment-analysis-raw",
+        params={"project_id": 1, "date_from": "2025-01-01", "date_to": "2025-01-31"},
+        json=[{"id": "1", "content": "good product"}],
+    )
+
+    assert get_sample("polarify_gemini_errors_total", type="400") > errors_before
+
+
+def test_metrics_disabled(test_client, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_ENABLED", False)
+    assert test_client.get("/metrics").status_code == 404
@@ -12,6 +12,7 @@ def test_create_get_project_api(test_auth_client):
     assert get_response.json()["name"] == "Test"
     assert get_response.json()["id"] == 1
     assert get_response.json()["description"] == "Test"
+    assert get_response.json()["sentiment_backend"] == "gemini"
 
 
 def test_get_projects_list_api(test_auth_client):
@@ -55,3 +56,55 @@ def test_create_project_wrong_payload(test_auth_client):
 def test_get_projects_no_auth(test_client):
     response = test_client.get("/projects")
     assert response.status_code == 401
+
+
+def test_get_projects_list_pagination(test_auth_client):
+    for name in ("Test 1", "Test 2", "Test 3"):
+        test_auth_client.post("/projects", json={"name": name})
+
+    first_page = test_auth_client.get(
+        "/projects", params={"limit": 2, "include_total": True}
+    )
+    second_page = test_auth_client.get(
+        "/projects",
+        params={
+            "limit": 2,
+            "include_total": True,
+            "cursor": first_page.headers["X-Next-Cursor"],
+        },
+    )
+
+    assert [p["name"] for p in first_page.json()] == ["Test 1", "Test 2"]
+    assert [p["name"] for p in second_page.json()] == ["Test 3"]
+    assert first_page.headers["X-Total-Count"] == "3"
+    assert second_page.headers["X-Total-Count"] == "3"
+    assert "X-Next-Cursor" not in second_page.headers
+
+
+def test_get_projects_list_name_prefix(test_auth_client):
+    for name in ("Shop reviews", "Shop_2", "Shopping", "App reviews"):
+        test_auth_client.post("/projects", json={"name": name})
+
+    response = test_auth_client.get("/projects", params={"name_prefix": "Shop"})
+    escaped_response = test_auth_client.get(
+        "/projects", params={"name_prefix": "Shop_", "include_total": True}
+    )
+
+    assert [p["name"] for p in response.json()] == [
+        "Shop reviews",
+        "Shop_2",
+        "Shopping",
+    ]
+    assert [p["name"] for p in escaped_response.json()] == ["Shop_2"]
+    assert escaped_response.headers["X-Total-Count"] == "1"
+    assert "X-Total-Count" not in response.headers
+
+
+def test_get_projects_list_matches_project_response(test_auth_client):
+    test_auth_client.post("/projects", json={"name": "Test", "description": "Test"})
+
+    list_response = test_auth_client.get("/projects")
+    get_response = test_auth_client.get("/projects/1")
+
+    assert list_response.headers["content-type"] == "application/json"
+    assert list_response.json() == [get_response.json()]
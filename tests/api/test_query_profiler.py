@@ -0,0 +1,84 @@
+import pytest
+
+from app.api.core.config import settings
+from app.repository import project as project_repo
+from app.utils.query_profiler import profile_queries
+
+DATE_RANGE = {"date_from": "2025-01-01", "date_to": "2025-01-31"}
+
+
+@pytest.fixture()
+def analysed_project(test_auth_client, fake_gemini):
+    test_auth_client.post("/projects", json={"name": "Test"})
+    test_auth_client.post(
+        "/sentiment-analysis-raw",
+        params={"project_id": 1, **DATE_RANGE},
+        json=[
+            {"id": "1", "content": "good product"},
+            {"id": "2", "content": "bad service"},
+        ],
+    )
+    return 1
+
+
+@pytest.mark.parametrize(
+    "url, max_queries",
+    [
+        ("/projects/", 1),
+        ("/projects/{project_id}", 1),
+        ("/sentiment-analysis_results/{project_id}", 2),
+        ("/sentiment-analysis_statistical_measures/{project_id}", 2),
+        ("/sentiment-analysis_rollups/{project_id}", 2),
+    ],
+)
+def test_read_endpoints_query_count(
+    test_auth_client, analysed_project, assert_max_queries, url, max_queries
+):
+    with assert_max_queries(max_queries):
+        response = test_auth_client.get(url.format(project_id=analysed_project))
+    assert response.status_code == 200
+
+
+def test_sentiment_analysis_raw_query_count(
+    test_auth_client, fake_gemini, assert_max_queries
+):
+    test_auth_client.post("/projects", json={"name": "Test"})
+    with assert_max_queries(8):
+        response = test_auth_client.post(
+            "/sentiment-analysis-raw",
+            params={"project_id": 1, **DATE_RANGE},
+            json=[{"id": str(i), "content": f"opinion {i}"} for i in range(50)],
+        )
+    assert response.status_code == 200
+
+
+def test_query_profile_header(test_auth_client, monkeypatch):
+    test_auth_client.post("/projects", json={"name": "Test"})
+
+    response = test_auth_client.get("/projects/1", headers={"X-Query-Profile": "1"})
+    assert "server-timing" not in response.headers
+
+    monkeypatch.setattr(settings, "QUERY_PROFILER_HEADER_ENABLED", True)
+    assert "server-timing" not in test_auth_client.get("/projects/1").headers
+    response = test_auth_client.get("/projects/1", headers={"X-Query-Profile": "1"})
+    assert response.status_code == 200
+    assert response.headers["server-timing"].startswith("db;dur=")
+    assert 'desc="1 queries"' in response.headers["server-timing"]
+
+
+def test_query_profile_reports_repeated_statements(run_with_db, test_auth_client):
+    for name in ("First", "Second", "Third"):
+        test_auth_client.post("/projects", json={"name": name})
+
+    async def get_projects_one_by_one(db):
+        for project_id in (1, 2, 3):
+            await project_repo.get_project(db, project_id=project_id, user_id=1)
+
+    with profile_queries() as profile:
+        run_with_db(get_projects_one_by_one)
+
+    assert profile.count == 3
+    [(shape, count)] = profile.repeated_statements(3).items()
+    assert count == 3
+    assert "WHERE projects.id = ?" in shape
+    assert profile.repeated_statements(4) == {}
@@ -0,0 +1,255 @@
+import json
+from statistics import mean, median, pstdev
+
+
+def test_sentiment_analysis_raw_api(test_auth_client, fake_gemini):
+    test_auth_client.post("/projects", json={"name": "Test"})
+    response = test_auth_client.post(
+        "/sentiment-analysis-raw",
+        params={"project_id": 1, "date_from": "2025-01-01", "date_to": "2025-01-31"},
+        json=[
+            {"id": "1", "content": "good product"},
+            {"id": "2", "content": "bad service"},
+            {"id": "3", "content": "it arrived"},
+        ],
+    )
+    assert response.status_code == 200
+    assert response.json()["opinions_count"] == 3
+    assert response.json()["positive_count"] == 1
+    assert response.json()["neutral_count"] == 1
+    assert response.json()["negative_count"] == 1
+    assert response.json()["avg_sentiment"] == 0.0
+
+
+def test_sentiment_analysis_csv_api(test_auth_client, fake_gemini):
+    test_auth_client.post("/projects", json={"name": "Test"})
+    response = test_auth_client.post(
+        "/sentiment-analysis-csv",
+        params={"project_id": 1, "date_from": "2025-01-01", "date_to": "2025-01-31"},
+        files={"file": ("opinions.csv", b"1,good product\n2,great\n", "text/csv")},
+    )
+    assert response.status_code == 200
+    assert response.json()["opinions_count"] == 2
+    assert response.json()["avg_sentiment"] == 0.8
+
+
+def test_sentiment_analysis_cache_hit_skips_llm(test_auth_client, fake_gemini):
+    test_auth_client.post("/projects", json={"name": "Test"})
+    params = {"project_id": 1, "date_from": "2025-01-01", "date_to": "2025-01-31"}
+    test_auth_client.post(
+        "/sentiment-analysis-raw",
+        params=params,
+        json=[{"id": "1", "content": "good product"}],
+    )
+    response = test_auth_client.post(
+        "/sentiment-analysis-raw",
+        params={**params, "date_from": "2025-01-15"},
+        json=[{"id": "1", "content": "good product"}],
+    )
+    assert response.status_code == 200
+    assert response.json()["positive_count"] == 1
+    assert fake_gemini.state.calls == 1
+
+    stats_response = test_auth_client.get("/sentiment-analysis-cache/stats")
+    assert stats_response.json()["memory_hits"] == 1
+    assert stats_response.json()["misses"] == 1
+
+
+def test_sentiment_analysis_uses_project_backend(test_auth_client, fake_gemini):
+    test_auth_client.post(
+        "/projects", json={"name": "Test", "sentiment_backend": "lexicon"}
+    )
+    response = test_auth_client.post(
+        "/sentiment-analysis-raw",
+        params={"project_id": 1, "date_from": "2025-01-01", "date_to": "2025-01-31"},
+        json=[{"id": "1", "content": "great product"}],
+    )
+    assert response.status_code == 200
+    assert response.json()["positive_count"] == 1
+    assert fake_gemini.state.calls == 0
+
+
+def test_sentiment_analysis_backend_override(test_auth_client, fake_gemini):
+    test_auth_client.post("/projects", json={"name": "Test"})
+    response = test_auth_client.post(
+        "/sentiment-analysis-raw",
+        params={
+            "project_id": 1,
+            "date_from": "2025-01-01",
+            "date_to": "2025-01-31",
+            "backend": "lexicon",
+        },
+        json=[{"id": "1", "content": "terrible service"}],
+    )
+    assert response.status_code == 200
+    assert response.json()["negative_count"] == 1
+    assert fake_gemini.state.calls == 0
+
+
+def test_sentiment_analysis_project_doesnt_exist(test_auth_client, fake_gemini):
+    response = test_auth_client.post(
+        "/sentiment-analysis-raw",
+        params={"project_id": 1, "date_from": "2025-01-01", "date_to": "2025-01-31"},
+        json=[{"id": "1", "content": "good"}],
+    )
+    assert response.status_code == 404
+
+
+def test_sentiment_analysis_statistical_measures(test_auth_client, fake_gemini):
+    test_auth_client.post("/projects", json={"name": "Test"})
+    params = {"project_id": 1, "date_from": "2025-01-01", "date_to": "2025-01-31"}
+    for contents in (["good"], ["bad"], ["good", "it arrived"], ["it arrived"]):
+        test_auth_client.post(
+            "/sentiment-analysis-raw",
+            params=params,
+            json=[
+                {"id": str(i), "content": content} for i, content in enumerate(contents)
+            ],
+        )
+
+    response = test_auth_client.get("/sentiment-analysis_statistical_measures/1")
+
+    assert response.status_code == 200
+    values = [0.8, -0.8, 0.4, 0.0]
+    assert response.json()["results_count"] == 4
+    assert response.json()["min"] == min(values)
+    assert response.json()["max"] == max(values)
+    assert response.json()["mean"] == round(mean(values), 2)
+    assert response.json()["median"] == median(values)
+    assert response.json()["std"] == round(pstdev(values), 2)
+
+
+def test_sentiment_analysis_statistical_measures_empty_project(test_auth_client):
+    test_auth_client.post("/projects", json={"name": "Test"})
+
+    response = test_auth_client.get("/sentiment-analysis_statistical_measures/1")
+
+    assert response.status_code == 200
+    assert response.json()["results_count"] == 0
+    assert response.json()["mean"] is None
+    assert response.json()["median"] is None
+
+
+def test_sentiment_analysis_results_pagination(test_auth_client, fake_gemini):
+    test_auth_client.post("/projects", json={"name": "Test"})
+    for day in ("01", "02", "03"):
+        test_auth_client.post(
+            "/sentiment-analysis-raw",
+            params={
+                "project_id": 1,
+                "date_from": f"2025-01-{day}",
+                "date_to": "2025-01-31",
+            },
+            json=[{"id": "1", "content": "good"}],
+        )
+
+    first_page = test_auth_client.get(
+        "/sentiment-analysis_results/1", params={"limit": 2}
+    )
+    second_page = test_auth_client.get(
+        "/sentiment-analysis_results/1",
+        params={"limit": 2, "cursor": first_page.headers["X-Next-Cursor"]},
+    )
+
+    assert [r["date_from"] for r in first_page.json()] == ["2025-01-03", "2025-01-02"]
+    assert [r["date_from"] for r in second_page.json()] == ["2025-01-01"]
+    assert "X-Next-Cursor" not in second_page.headers
+
+
+def test_sentiment_analysis_results_invalid_cursor(test_auth_client):
+    test_auth_client.post("/projects", json={"name": "Test"})
+
+    response = test_auth_client.get(
+        "/sentiment-analysis_results/1", params={"cursor": "not-a-cursor"}
+    )
+
+    assert response.status_code == 400
+
+
+def test_sentiment_analysis_results_year_overlap(test_auth_client, fake_gemini):
+    test_auth_client.post("/projects", json={"name": "Test"})
+    for date_from, date_to in (
+        ("2024-12-01", "2025-01-31"),
+        ("2023-06-01", "2026-06-01"),
+        ("2024-01-01", "2024-12-31"),
+    ):
+        test_auth_client.post(
+            "/sentiment-analysis-raw",
+            params={"project_id": 1, "date_from": date_from, "date_to": date_to},
+            json=[{"id": "1", "content": "good"}],
+        )
+
+    response = test_auth_client.get(
+        "/sentiment-analysis_results/1", params={"year": 2025}
+    )
+
+    assert sorted(r["date_from"] for r in response.json()) == [
+        "2023-06-01",
+        "2024-12-01",
+    ]
+
+
+def test_sentiment_analysis_rollups(test_auth_client, fake_gemini):
+    test_auth_client.post("/projects", json={"name": "Test"})
+    for date_from, contents in (
+        ("2025-01-06", ["good"]),
+        ("2025-01-08", ["bad", "bad", "bad"]),
+        ("2025-02-03", ["good", "it arrived"]),
+    ):
+        test_auth_client.post(
+            "/sentiment-analysis-raw",
+            params={"project_id": 1, "date_from": date_from, "date_to": "2025-03-01"},
+            json=[
+                {"id": str(i), "content": content} for i, content in enumerate(contents)
+            ],
+        )
+
+    months = test_auth_client.get(
+        "/sentiment-analysis_rollups/1", params={"granularity": "month"}
+    )
+    weeks = test_auth_client.get(
+        "/sentiment-analysis_rollups/1",
+        params={"granularity": "week", "date_from": "2025-01-09"},
+    )
+
+    assert months.status_code == 200
+    assert [
+        (b["bucket"], b["results_count"], b["opinions_count"], b["avg_sentiment"])
+        for b in months.json()
+    ] == [("2025-01-01", 2, 4, -0.4), ("2025-02-01", 1, 2, 0.4)]
+    assert [b["bucket"] for b in weeks.json()] == ["2025-01-06", "2025-02-03"]
+    assert weeks.json()[0]["negative_count"] == 3
+
+
+def test_sentiment_analysis_results_export(test_auth_client, fake_gemini):
+    test_auth_client.post("/projects", json={"name": "Test"})
+    for day in ("01", "02"):
+        test_auth_client.post(
+            "/sentiment-analysis-raw",
+            params={
+                "project_id": 1,
+                "date_from": f"2025-01-{day}",
+                "date_to": "2025-01-31",
+            },
+            json=[{"id": "1", "content": "good"}],
+        )
+
+    ndjson = test_auth_client.get("/sentiment-analysis_results/1/export")
+    csv_export = test_auth_client.get(
+        "/sentiment-analysis_results/1/export", params={"format": "csv"}
+    )
+
+    assert ndjson.status_code == 200
+    assert ndjson.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in ndjson.text.splitlines()]
+    assert [row["date_from"] for row in rows] == ["2025-01-02", "2025-01-01"]
+    assert rows[0]["avg_sentiment"] == 0.8
+    assert csv_export.headers["content-type"].startswith("text/csv")
+    lines = csv_export.text.splitlines()
+    assert lines[0].startswith("id,project_id,user_id,date_from")
+    assert len(lines) == 3
+
+
+def test_sentiment_analysis_results_export_project_doesnt_exist(test_auth_client):
+    response = test_auth_client.get("/sentiment-analysis_results/1/export")
+    assert response.status_code == 404
@@ -0,0 +1,320 @@
+import asyncio
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.core.config import settings
+from app.models.sentiment_analysis import SentimentAnalysisResult
+from app.models.sentiment_analysis_job import (
+    SentimentAnalysisJob,
+    SentimentAnalysisJobUploadChunk,
+)
+from app.repository.sentiment_analysis_job import (
+    claim_next_sentiment_analysis_job,
+    complete_sentiment_analysis_job,
+    fail_sentiment_analysis_job,
+    update_sentiment_analysis_job_progress,
+)
+from app.services.sentiment_analysis import analyze_sentiment
+from app.services.sentiment_analysis_jobs import run_next_sentiment_analysis_job
+
+JOB_PARAMS = {"project_id": 1, "date_from": "2025-01-01", "date_to": "2025-01-31"}
+
+
+def submit_job(client, content=b"1,good product\n2,bad\n"):
+    response = client.post(
+        "/sentiment-analysis-jobs",
+        params=JOB_PARAMS,
+        files={"file": ("opinions.csv", content, "text/csv")},
+    )
+    return response.json()["id"]
+
+
+def claim(db):
+    return claim_next_sentiment_analysis_job(db, lease_seconds=60, max_attempts=2)
+
+
+def expire_lease(job_id):
+    async def expire(db):
+        await db.execute(
+            update(SentimentAnalysisJob)  # type: ignore
+            .where(SentimentAnalysisJob.id == job_id)
+            .values(heartbeat_at=datetime.now() - timedelta(minutes=5))
+        )
+        await db.commit()
+
+    return expire
+
+
+def count_upload_chunks(job_id):
+    async def count(db):
+        return await db.scalar(
+            select(func.count()).where(SentimentAnalysisJobUploadChunk.job_id == job_id)
+        )
+
+    return count
+
+
+def test_sentiment_analysis_job_api(test_auth_client, fake_gemini, run_with_db):
+    test_auth_client.post("/projects", json={"name": "Test"})
+    create_response = test_auth_client.post(
+        "/sentiment-analysis-jobs",
+        params={"project_id": 1, "date_from": "2025-01-01", "date_to": "2025-01-31"},
+        files={"file": ("opinions.csv", b"1,good product\n2,bad\n", "text/csv")},
+    )
+    assert create_response.status_code == 202
+    assert create_response.json()["status"] == "queued"
+    job_id = create_response.json()["id"]
+    assert fake_gemini.state.calls == 0
+
+    assert run_with_db(run_next_sentiment_analysis_job) is True
+    assert run_with_db(run_next_sentiment_analysis_job) is False
+
+    get_response = test_auth_client.get(f"/sentiment-analysis-jobs/{job_id}")
+    assert get_response.status_code == 200
+    assert get_response.json()["status"] == "succeeded"
+    assert get_response.json()["opinions_total"] == 2
+    assert get_response.json()["opinions_done"] == 2
+    assert get_response.json()["result"]["opinions_count"] == 2
+    assert get_response.json()["result"]["avg_sentiment"] == 0.0
+
+
+def test_sentiment_analysis_job_failure(test_auth_client, fake_gemini, run_with_db):
+    fake_gemini.state.fail_status = 400
+    fake_gemini.state.fail_calls = 10
+    test_auth_client.post("/projects", json={"name": "Test"})
+    create_response = test_auth_client.post(
+        "/sentiment-analysis-jobs",
+        params={"project_id": 1, "date_from": "2025-01-01", "date_to": "2025-01-31"},
+        files={"file": ("opinions.csv", b"1,good product\n", "text/csv")},
+    )
+    job_id = create_response.json()["id"]
+
+    run_with_db(run_next_sentiment_analysis_job)
+
+    get_response = test_auth_client.get(f"/sentiment-analysis-jobs/{job_id}")
+    assert get_response.json()["status"] == "failed"
+    assert "Failed to generate sentiment" in get_response.json()["error"]
+    assert get_response.json()["result"] is None
+
+
+def test_sentiment_analysis_job_requeues_retryable_failures(
+    test_auth_client, fake_gemini, run_with_db, monkeypatch
+):
+    monkeypatch.setattr(settings, "GEMINI_MAX_RETRIES", 0)
+    monkeypatch.setattr(settings, "SENTIMENT_JOB_MAX_ATTEMPTS", 2)
+    fake_gemini.state.fail_status = 503
+    fake_gemini.state.fail_calls = 1
+    test_auth_client.post("/projects", json={"name": "Test"})
+    job_id = submit_job(test_auth_client)
+
+    run_with_db(run_next_sentiment_analysis_job)
+
+    response = test_auth_client.get(f"/sentiment-analysis-jobs/{job_id}")
+    assert response.json()["status"] == "queued"
+    assert "unavailable" in response.json()["error"]
+    assert run_with_db(count_upload_chunks(job_id)) == 1
+
+    run_with_db(run_next_sentiment_analysis_job)
+
+    response = test_auth_client.get(f"/sentiment-analysis-jobs/{job_id}")
+    assert response.json()["status"] == "succeeded"
+    assert response.json()["error"] is None
+    assert response.json()["result"]["opinions_count"] == 2
+
+
+def test_sentiment_analysis_job_fails_when_retries_run_out(
+    test_auth_client, fake_gemini, run_with_db, monkeypatch
+):
+    monkeypatch.setattr(settings, "GEMINI_MAX_RETRIES", 0)
+    monkeypatch.setattr(settings, "SENTIMENT_JOB_MAX_ATTEMPTS", 2)
+    fake_gemini.state.fail_status = 503
+    fake_gemini.state.fail_calls = 10
+    test_auth_client.post("/projects", json={"name": "Test"})
+    job_id = submit_job(test_auth_client)
+
+    assert run_with_db(run_next_sentiment_analysis_job) is True
+    assert run_with_db(run_next_sentiment_analysis_job) is True
+    assert run_with_db(run_next_sentiment_analysis_job) is False
+
+    response = test_auth_client.get(f"/sentiment-analysis-jobs/{job_id}")
+    assert response.json()["status"] == "failed"
+    assert run_with_db(count_upload_chunks(job_id)) == 0
+
+
+def test_sentiment_analysis_job_updates_are_fenced_on_the_attempt(
+    test_auth_client, fake_gemini, run_with_db
+):
+    test_auth_client.post("/projects", json={"name": "Test"})
+    job_id = submit_job(test_auth_client)
+    run_with_db(claim)
+    run_with_db(expire_lease(job_id))
+    assert run_with_db(claim).attempts == 2
+
+    async def complete_stale_attempt(db):
+        result = await analyze_sentiment(
+            db,
+            project_id=1,
+            user_id=1,
+            date_from=date(2025, 1, 1),
+            date_to=date(2025, 1, 31),
+            opinions_list=[],
+            commit=False,
+        )
+        return await complete_sentiment_analysis_job(
+            db, job_id, 1, result_id=result.id, opinions_done=0, opinions_total=0
+        )
+
+    run_with_db(lambda db: update_sentiment_analysis_job_progress(db, job_id, 1, 5))
+    assert run_with_db(complete_stale_attempt) is False
+    run_with_db(lambda db: fail_sentiment_analysis_job(db, job_id, 1, error="stale"))
+
+    response = test_auth_client.get(f"/sentiment-analysis-jobs/{job_id}")
+    assert response.json()["status"] == "running"
+    assert response.json()["opinions_done"] == 0
+    assert response.json()["error"] is None
+    assert run_with_db(count_upload_chunks(job_id)) == 1
+    assert (
+        run_with_db(
+            lambda db: db.scalar(
+                select(func.count()).select_from(SentimentAnalysisResult)
+            )
+        )
+        == 0
+    )
+
+
+def test_get_sentiment_analysis_job_doesnt_exist(test_auth_client):
+    response = test_auth_client.get("/sentiment-analysis-jobs/1")
+    assert response.status_code == 404
+
+
+def test_sentiment_analysis_job_gemini_batch(
+    test_auth_client, fake_gemini, run_with_db
+):
+    fake_gemini.state.batch_running_polls = 2
+    test_auth_client.post("/projects", json={"name": "Test"})
+    create_response = test_auth_client.post(
+        "/sentiment-analysis-jobs",
+        params={
+            "project_id": 1,
+            "date_from": "2025-01-01",
+            "date_to": "2025-01-31",
+            "backend": "gemini_batch",
+        },
+        files={"file": ("opinions.csv", b"1,good product\n2,bad\n", "text/csv")},
+    )
+    job_id = create_response.json()["id"]
+
+    run_with_db(run_next_sentiment_analysis_job)
+
+    get_response = test_auth_client.get(f"/sentiment-analysis-jobs/{job_id}")
+    assert get_response.json()["status"] == "succeeded"
+    assert get_response.json()["opinions_done"] == 2
+    assert get_response.json()["result"]["positive_count"] == 1
+    assert get_response.json()["result"]["negative_count"] == 1
+    assert fake_gemini.state.batch_calls == 1
+    assert fake_gemini.state.calls == 0
+
+
+def test_sentiment_analysis_raw_rejects_gemini_batch(test_auth_client, fake_gemini):
+    test_auth_client.post("/projects", json={"name": "Test"})
+    response = test_auth_client.post(
+        "/sentiment-analysis-raw",
+        params={
+            "project_id": 1,
+            "date_from": "2025-01-01",
+            "date_to": "2025-01-31",
+            "backend": "gemini_batch",
+        },
+        json=[{"id": "1", "content": "good"}],
+    )
+    assert response.status_code == 400
+    assert "analysis jobs" in response.json()["detail"]
+    assert fake_gemini.state.batch_calls == 0
+
+
+def test_sentiment_analysis_job_lease_is_renewed_by_progress(
+    test_auth_client, run_with_db
+):
+    test_auth_client.post("/projects", json={"name": "Test"})
+    job_id = submit_job(test_auth_client)
+    assert run_with_db(claim).id == job_id
+    assert run_with_db(claim) is None
+
+    run_with_db(expire_lease(job_id))
+    run_with_db(lambda db: update_sentiment_analysis_job_progress(db, job_id, 1, 1))
+    assert run_with_db(claim) is None
+
+    run_with_db(expire_lease(job_id))
+    reclaimed = run_with_db(claim)
+    assert reclaimed.id == job_id
+    assert reclaimed.attempts == 2
+
+
+def test_sentiment_analysis_job_fails_when_last_lease_expires(
+    test_auth_client, run_with_db
+):
+    test_auth_client.post("/projects", json={"name": "Test"})
+    job_id = submit_job(test_auth_client)
+    run_with_db(claim)
+    run_with_db(expire_lease(job_id))
+    run_with_db(claim)
+    run_with_db(expire_lease(job_id))
+
+    assert run_with_db(claim) is None
+
+    response = test_auth_client.get(f"/sentiment-analysis-jobs/{job_id}")
+    assert response.json()["status"] == "failed"
+    assert "Lease expired" in response.json()["error"]
+    assert run_with_db(count_upload_chunks(job_id)) == 0
+
+
+def test_sentiment_analysis_job_upload_is_stored_in_chunks(
+    test_auth_client, fake_gemini, run_with_db, monkeypatch
+):
+    monkeypatch.setattr(settings, "SENTIMENT_JOB_UPLOAD_CHUNK_BYTES", 4)
+    test_auth_client.post("/projects", json={"name": "Test"})
+    content = b"".join(f"{i},good product {i}\n".encode() for i in range(10))
+    job_id = submit_job(test_auth_client, content)
+    assert run_with_db(count_upload_chunks(job_id)) == -(-len(content) // 4)
+
+    run_with_db(run_next_sentiment_analysis_job)
+
+    response = test_auth_client.get(f"/sentiment-analysis-jobs/{job_id}")
+    assert response.json()["status"] == "succeeded"
+    assert response.json()["opinions_total"] == 10
+    assert response.json()["result"]["opinions_count"] == 10
+    assert run_with_db(count_upload_chunks(job_id)) == 0
+
+
+def test_sentiment_analysis_job_lease_is_renewed_while_batch_runs(
+    test_auth_client, fake_gemini, run_with_db, monkeypatch
+):
+    monkeypatch.setattr(settings, "SENTIMENT_JOB_LEASE_SECONDS", 1)
+    monkeypatch.setattr(settings, "GEMINI_BATCH_POLL_INTERVAL_SECONDS", 0.5)
+    fake_gemini.state.batch_running_polls = 5
+    test_auth_client.post("/projects", json={"name": "Test"})
+    response = test_auth_client.post(
+        "/sentiment-analysis-jobs",
+        params={**JOB_PARAMS, "backend": "gemini_batch"},
+        files={"file": ("opinions.csv", b"1,good product\n", "text/csv")},
+    )
+    job_id = response.json()["id"]
+
+    async def run_and_claim(db):
+        run = asyncio.create_task(run_next_sentiment_analysis_job(db))
+        await asyncio.sleep(1.5)
+        async with AsyncSession(db.bind) as other_db:
+            claimed = await claim_next_sentiment_analysis_job(
+                other_db, lease_seconds=1, max_attempts=3
+            )
+        await run
+        return claimed
+
+    assert run_with_db(run_and_claim) is None
+
+    response = test_auth_client.get(f"/sentiment-analysis-jobs/{job_id}")
+    assert response.json()["status"] == "succeeded"
+    assert fake_gemini.state.batch_calls == 1
@@ -0,0 +1,183 @@
+import json
+import threading
+
+import httpx
+import pytest
+
+from app.utils.tracing import (
+    BatchSpanProcessor,
+    FileSpanExporter,
+    OtlpHttpSpanExporter,
+    Span,
+    SpanExporter,
+    tracer,
+)
+
+DATE_RANGE = {"date_from": "2025-01-01", "date_to": "2025-01-31"}
+TRACEPARENT = "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
+
+
+class CollectingSpanExporter(SpanExporter):
+    def __init__(self):
+        self.spans = []
+
+    def export(self, spans):
+        self.spans.extend(spans)
+
+
+@pytest.fixture()
+def collect_spans(test_auth_client):
+    """Trace every request; return a helper flushing and returning the spans."""
+    exporter = CollectingSpanExporter()
+    tracer.configure(exporter, sample_rate=1.0)
+
+    def collect():
+        tracer.force_flush()
+        return exporter.spans
+
+    yield collect
+    tracer.shutdown()
+
+
+def analyze(client, headers=None):
+    return client.post(
+        "/sentiment-analysis-raw",
+        params={"project_id": 1, **DATE_RANGE},
+        json=[
+            {"id": "1", "content": "good product"},
+            {"id": "2", "content": "bad service"},
+            {"id": "3", "content": "good product"},
+        ],
+        headers=headers,
+    )
+
+
+def test_sentiment_analysis_trace(test_auth_client, fake_gemini, collect_spans):
+    test_auth_client.post("/projects", json={"name": "Test"})
+    collect_spans().clear()
+
+    assert analyze(test_auth_client).status_code == 200
+
+    spans = collect_spans()
+    [root] = [span for span in spans if span.parent_span_id is None]
+    assert root.name == "POST /sentiment-analysis-raw"
+    assert root.attributes["http.status_code"] == 200
+    span_ids = {span.span_id for span in spans}
+    assert all(span.trace_id == root.trace_id for span in spans)
+    assert all(span.parent_span_id in span_ids for span in spans if span is not root)
+
+    by_name = {span.name: span for span in spans}
+    assert by_name["opinions.read_batch"].attributes["opinions.count"] == 3
+    assert by_name["sentiment.score_batch"].attributes["opinions.distinct"] == 2
+    assert by_name["gemini.build_prompt"].attributes["prompt.chars"] > 0
+    assert by_name["gemini.generate_content"].attributes["tokens.prompt"] > 0
+    assert by_name["gemini.parse_response"].attributes["response.chars"] > 0
+    assert by_name["sentiment.save_result"].attributes["opinions.count"] == 3
+    assert by_name["db.copy"].parent_span_id == by_name["sentiment.save_result"].span_id
+    assert {
+        span.attributes["db.operation"] for span in spans if span.name == "db.query"
+    } >= {"SELECT", "INSERT"}
+
+
+def test_trace_sampling(test_auth_client, fake_gemini, collect_spans):
+    tracer.sample_rate = 0.0
+    test_auth_client.post("/projects", json={"name": "Test"})
+    assert analyze(test_auth_client).status_code == 200
+    assert collect_spans() == []
+
+    unsampled = TRACEPARENT[:-2] + "00"
+    analyze(test_auth_client, headers={"traceparent": unsampled})
+    assert collect_spans() == []
+
+    analyze(test_auth_client, headers={"traceparent": TRACEPARENT})
+    spans = collect_spans()
+    assert spans
+    assert {span.trace_id for span in spans} == {TRACEPARENT.split("-")[1]}
+    [root] = [span for span in spans if span.name.startswith("POST")]
+    assert root.parent_span_id == TRACEPARENT.split("-")[2]
+
+
+def test_trace_ignores_malformed_content_length(test_auth_client, collect_spans):
+    response = test_auth_client.get("/projects/", headers={"content-length": "1e3"})
+
+    assert response.status_code == 200
+    [root] = [span for span in collect_spans() if span.name == "GET /projects/"]
+    assert "http.request.body.size" not in root.attributes
+
+
+def build_span(**kwargs):
+    span = Span(
+        name="gemini.generate_content",
+        trace_id="0af7651916cd43dd8448eb211c80319c",
+        span_id="b7ad6b7169203331",
+        parent_span_id=None,
+        sampled=True,
+        start_time_ns=1_000,
+        end_time_ns=2_000,
+        attributes={"prompt.chars": 10, "gemini.model": "m", "ok": True},
+    )
+    for key, value in kwargs.items():
+        setattr(span, key, value)
+    return span
+
+
+def test_otlp_exporter_payload():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200)
+
+    exporter = OtlpHttpSpanExporter(
+        "http://collector/v1/traces",
+        "polarify-test",
+        client=httpx.Client(transport=httpx.MockTransport(handler)),
+    )
+    exporter.export([build_span(error="ValueError: bad json")])
+
+    [request] = requests
+    assert request.url == "http://collector/v1/traces"
+    payload = json.loads(request.content)
+    [resource_spans] = payload["resourceSpans"]
+    assert resource_spans["resource"]["attributes"][0]["value"] == {
+        "stringValue": "polarify-test"
+    }
+    [span] = resource_spans["scopeSpans"][0]["spans"]
+    assert span["traceId"] == "0af7651916cd43dd8448eb211c80319c"
+    assert span["startTimeUnixNano"] == "1000"
+    assert "parentSpanId" not in span
+    assert {"key": "prompt.chars", "value": {"intValue": "10"}} in span["attributes"]
+    assert {"key": "ok", "value": {"boolValue": True}} in span["attributes"]
+    assert span["status"] == {"code": 2, "message": "ValueError: bad json"}
+
+
+def test_file_exporter(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    exporter = FileSpanExporter(str(path))
+    exporter.export([build_span(), build_span(name="db.query")])
+    exporter.shutdown()
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["name"] for line in lines] == ["gemini.generate_content", "db.query"]
+    assert lines[0]["duration_ms"] == 0.001
+
+
+def test_batch_span_processor_drops_spans_when_queue_is_full():
+    release = threading.Event()
+
+    class BlockingSpanExporter(CollectingSpanExporter):
+        def export(self, spans):
+            release.wait(5)
+            super().export(spans)
+
+    exporter = BlockingSpanExporter()
+    processor = BatchSpanProcessor(
+        exporter, max_queue_size=2, batch_size=1, interval_seconds=0.01
+    )
+    for _ in range(10):
+        processor.on_end(build_span())
+    assert processor.dropped_spans >= 7
+
+    release.set()
+    processor.shutdown()
+    assert 1 <= len(exporter.spans) <= 3
@@ -1,30 +1,69 @@
+import asyncio
+from contextlib import contextmanager
 from datetime import datetime
 
+import httpx
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
 from app.api.core.config import settings
 from app.api.dependencies.auth import get_current_user
-from app.api.dependencies.database import Base, get_db
+from app.api.dependencies.database import Base, get_db, to_async_database_url
 from app.domain.user import User as UserDomain
 from app.main import app
 from app.models.user import User as UserModel
+from app.services.auth import auth_user_cache
+from app.services.gemini import create_gemini_client
+from app.services.rate_limit import gemini_rate_limiter
+from app.services.sentiment_backends import gemini as gemini_backend
+from app.services.sentiment_backends import gemini_batch as gemini_batch_backend
+from app.services.sentiment_cache import score_cache
+from app.utils.metrics import instrument_engine
+from app.utils.query_profiler import profile_engine, profile_queries
+from app.utils.tracing import trace_engine
+from benchmarks.fake_gemini import create_app as create_fake_gemini_app
 
 test_database_url = settings.TEST_DATABASE_URL
 if test_database_url is None:
     raise ValueError("TEST_DATABASE_URL not found.")
 
+# Tests run queued jobs explicitly instead of through background workers.
+settings.SENTIMENT_JOB_WORKERS = 0
+settings.GEMINI_RETRY_BASE_DELAY_SECONDS = 0.01
+settings.GEMINI_BATCH_POLL_INTERVAL_SECONDS = 0.01
+
 
 engine = create_engine(str(test_database_url))
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Tests drive the app from several event loops (TestClient's portal and
+# asyncio.run), so async connections must not be pooled across them.
+async_engine = create_async_engine(
+    to_async_database_url(str(test_database_url)), poolclass=NullPool
+)
+instrument_engine(async_engine)
+profile_engine(async_engine)
+trace_engine(async_engine)
+TestingAsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
+
+async def override_get_db():
+    async with TestingAsyncSessionLocal() as db:
+        yield db
 
 
 @pytest.fixture(scope="function", autouse=True)
 def setup_test_db():
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
+    score_cache.clear()
+    auth_user_cache.clear()
+    gemini_rate_limiter.reset_stats()
     yield
     Base.metadata.drop_all(bind=engine)
 
@@ -42,16 +81,23 @@ def db_session():
         connection.close()
 
 
+@pytest.fixture()
+def run_with_db():
+    """Return a helper that awaits ``fn(db)`` with a fresh async session."""
+
+    def run(fn):
+        async def main():
+            async with TestingAsyncSessionLocal() as db:
+                return await fn(db)
+
+        return asyncio.run(main())
+
+    return run
+
+
 @pytest.fixture(scope="function")
 def test_client(db_session):
     """Create a test client that uses the override_get_db fixture to return a session."""
-
-    def override_get_db():
-        try:
-            yield db_session
-        finally:
-            db_session.close()
-
     app.dependency_overrides[get_db] = override_get_db
 
     client = TestClient(app)
@@ -86,12 +132,6 @@ def test_auth_client(db_session):
     def override_get_current_user():
         return fake_user
 
-    def override_get_db():
-        try:
-            yield db_session
-        finally:
-            db_session.close()
-
     app.dependency_overrides[get_db] = override_get_db
     app.dependency_overrides[get_current_user] = override_get_current_user
 
@@ -101,3 +141,28 @@ def test_auth_client(db_session):
         yield test_auth_client
 
     app.dependency_overrides = {}
+
+
+@pytest.fixture()
+def fake_gemini(monkeypatch):
+    """Route Gemini calls to the in-process fake server and return its app."""
+    fake_gemini_app = create_fake_gemini_app()
+    client = create_gemini_client(
+        httpx.AsyncClient(transport=httpx.ASGITransport(app=fake_gemini_app))
+    )
+    monkeypatch.setattr(gemini_backend, "get_gemini_client", lambda: client)
+    monkeypatch.setattr(gemini_batch_backend, "get_gemini_client", lambda: client)
+    return fake_gemini_app
+
+
+@pytest.fixture()
+def assert_max_queries():
+    """Return a context manager failing if the block runs more SQL statements."""
+
+    @contextmanager
+    def check(max_queries):
+        with profile_queries() as profile:
+            yield profile
+        assert profile.count <= max_queries, profile.summary()
+
+    return check
@@ -0,0 +1,43 @@
+from datetime import datetime
+
+from app.domain.user import User
+from app.models.token import AuthToken
+from app.models.user import User as UserModel
+from app.services import auth as auth_service
+from app.services.auth import AuthUserCache, auth_user_cache, get_user_by_token
+
+
+def test_get_user_by_token_is_cached(db_session, run_with_db):
+    db_session.add(UserModel(username="u", email="u@example.com", password_hash=""))
+    db_session.commit()
+    db_session.add(AuthToken(user_id=1, token="token"))
+    db_session.commit()
+
+    user = run_with_db(lambda db: get_user_by_token(db, "token"))
+    assert (user.id, user.username) == (1, "u")
+    assert run_with_db(lambda db: get_user_by_token(db, "other")) is None
+
+    db_session.query(AuthToken).delete()
+    db_session.commit()
+    assert run_with_db(lambda db: get_user_by_token(db, "token")) == user
+
+    auth_user_cache.clear()
+    assert run_with_db(lambda db: get_user_by_token(db, "token")) is None
+
+
+def test_auth_user_cache_expires_and_evicts(monkeypatch):
+    cache = AuthUserCache(max_entries=2, ttl_seconds=10)
+    users = [
+        User(id=i, username=str(i), email=f"{i}@example.com", created_at=datetime.now())
+        for i in range(3)
+    ]
+    for i, user in enumerate(users):
+        cache.set(f"token-{i}", user)
+
+    assert cache.get("token-0") is None
+    assert cache.get("token-2") == users[2]
+
+    now = auth_service.time.monotonic()
+    monkeypatch.setattr(auth_service.time, "monotonic", lambda: now + 11)
+    assert cache.get("token-2") is None
+    assert len(cache) == 1
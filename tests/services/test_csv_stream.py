@@ -0,0 +1,50 @@
+import asyncio
+import csv
+import io
+from itertools import accumulate
+
+from starlette.datastructures import UploadFile
+
+from app.utils.csv_stream import iter_csv_rows
+
+
+async def collect_rows(content: bytes, chunk_size: int) -> list[list[str]]:
+    file = UploadFile(file=io.BytesIO(content))
+    return [row async for row in iter_csv_rows(file, chunk_size=chunk_size)]
+
+
+def test_iter_csv_rows_matches_csv_reader_for_any_chunk_size():
+    text = (
+        "1,zażółć gęślą jaźń 😀\r\n"
+        '2,"multi\nline, with ""quotes"""\n'
+        '3,"trailing ""quote"" at chunk end"\n'
+        '0,the 5" screen is bad\n'
+        '5,"quoted" then text,"open ""\n quote"\n'
+        '"6",""""\n'
+        "\n"
+        "4,no trailing newline"
+    )
+    expected = list(csv.reader(io.StringIO(text, newline="")))
+
+    for chunk_size in (1, 2, 3, 7, 64, 1024):
+        assert asyncio.run(collect_rows(text.encode("utf-8"), chunk_size)) == expected
+
+
+def test_iter_csv_rows_empty_file():
+    assert asyncio.run(collect_rows(b"", chunk_size=16)) == []
+
+
+def test_iter_csv_rows_buffers_one_record_after_a_stray_quote():
+    text = '0,the 5" screen is bad\n' + "".join(f"{i},ok\n" for i in range(1, 500))
+    record_ends = list(accumulate(map(len, text.splitlines(keepends=True))))
+    file = UploadFile(file=io.BytesIO(text.encode("utf-8")))
+
+    async def collect():
+        rows = []
+        async for row in iter_csv_rows(file, chunk_size=16):
+            # Each record is parsed within two chunks of being read.
+            assert file.file.tell() <= record_ends[len(rows)] + 32
+            rows.append(row)
+        return rows
+
+    assert asyncio.run(collect()) == list(csv.reader(io.StringIO(text)))
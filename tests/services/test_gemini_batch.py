@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.core.config import settings
+from app.domain.sentiment_analysis import Opinion
+from app.services.sentiment_backends.gemini_batch import score_opinions_batch
+from benchmarks import fake_gemini as fake_gemini_module
+
+
+def test_score_opinions_batch_submits_one_batch_for_all_chunks(
+    fake_gemini, monkeypatch
+):
+    monkeypatch.setattr(settings, "SENTIMENT_CHUNK_MAX_OPINIONS", 2)
+    opinions = [
+        Opinion(id=str(i), content="good" if i % 2 else "bad") for i in range(5)
+    ]
+    progress = []
+
+    async def on_progress(opinions_scored):
+        progress.append(opinions_scored)
+
+    values = asyncio.run(score_opinions_batch(opinions, on_progress=on_progress))
+
+    assert [value.id for value in values] == ["0", "1", "2", "3", "4"]
+    assert [value.sentiment for value in values] == [-0.8, 0.8, -0.8, 0.8, -0.8]
+    assert progress == [2, 2, 1]
+    assert fake_gemini.state.batch_calls == 1
+    (batch,) = fake_gemini.state.batches.values()
+    assert len(batch["requests"]) == 3
+    assert fake_gemini.state.calls == 0
+
+
+def test_score_opinions_batch_retries_failed_requests_interactively(
+    fake_gemini, monkeypatch
+):
+    monkeypatch.setattr(settings, "SENTIMENT_CHUNK_MAX_OPINIONS", 2)
+    fake_gemini.state.batch_fail_requests = 1
+    opinions = [Opinion(id=str(i), content="good") for i in range(4)]
+
+    values = asyncio.run(score_opinions_batch(opinions))
+
+    assert [value.id for value in values] == ["0", "1", "2", "3"]
+    assert fake_gemini.state.batch_calls == 1
+    assert fake_gemini.state.calls == 1
+
+
+def test_score_opinions_batch_retries_non_numeric_scores_interactively(
+    fake_gemini, monkeypatch
+):
+    score_prompt = fake_gemini_module.score_prompt
+    monkeypatch.setattr(
+        fake_gemini_module,
+        "score_prompt",
+        lambda prompt: (
+            "[null, 0.8]" if fake_gemini.state.calls == 0 else score_prompt(prompt)
+        ),
+    )
+    opinions = [Opinion(id=str(i), content="good") for i in range(2)]
+
+    values = asyncio.run(score_opinions_batch(opinions))
+
+    assert [(value.id, value.sentiment) for value in values] == [("0", 0.8), ("1", 0.8)]
+    assert fake_gemini.state.batch_calls == 1
+    assert fake_gemini.state.calls == 1
+
+
+def test_score_opinions_batch_cancels_after_timeout(fake_gemini, monkeypatch):
+    monkeypatch.setattr(settings, "GEMINI_BATCH_TIMEOUT_SECONDS", 0.05)
+    fake_gemini.state.batch_running_polls = 1000
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(score_opinions_batch([Opinion(id="1", content="good")]))
+
+    assert exc_info.value.status_code == 504
+    (batch,) = fake_gemini.state.batches.values()
+    assert batch["state"] == "BATCH_STATE_CANCELLED"
@@ -0,0 +1,26 @@
+from app.services.sentiment_backends.lexicon import score_texts
+
+
+def test_score_texts():
+    scores = score_texts(
+        [
+            "Great product, I love it!",
+            "The delivery was late and the box was damaged.",
+            "It arrived on Tuesday.",
+        ]
+    )
+    assert scores[0] > 0.5
+    assert scores[1] < -0.5
+    assert scores[2] == 0.0
+
+
+def test_score_texts_negation_and_intensifiers():
+    good, not_good, very_good = score_texts(["good", "not good", "very good"])
+    assert not_good < 0 < good < very_good
+    assert score_texts(["I don't like it"])[0] < 0
+
+
+def test_score_texts_keeps_one_score_per_text():
+    texts = ["good", "", "bad\x00news", "good\nbad"]
+    assert len(score_texts(texts)) == len(texts)
+    assert score_texts([]) == []
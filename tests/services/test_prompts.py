@@ -1,5 +1,48 @@
-from app.utils.prompts import PromptTypeE, get_prompt
+import os
+
+from app.utils.prompts import PromptRegistry, PromptTypeE, get_prompt
 
 
 def test_get_prompt():
     assert get_prompt(PromptTypeE.SYSTEM_INSTRUCTIONS)[:17] == "You are an expert"
+
+
+def write_prompts(prompts_dir, content, mtime_ns):
+    for prompt_type in PromptTypeE:
+        path = prompts_dir / prompt_type
+        path.write_text(f"{prompt_type}: {content}", encoding="utf-8")
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_prompt_registry_serves_loaded_prompts_without_reading_files(tmp_path):
+    write_prompts(tmp_path, "v1", mtime_ns=1_000_000_000)
+    registry = PromptRegistry(tmp_path)
+    version = registry.load().version
+
+    for prompt_type in PromptTypeE:
+        (tmp_path / prompt_type).unlink()
+
+    assert registry.get(PromptTypeE.CONTENT) == "content.txt: v1"
+    assert registry.version == version
+
+
+def test_prompt_registry_hot_reload(tmp_path):
+    write_prompts(tmp_path, "v1", mtime_ns=1_000_000_000)
+    registry = PromptRegistry(tmp_path, hot_reload=True)
+    version = registry.version
+
+    write_prompts(tmp_path, "v2", mtime_ns=2_000_000_000)
+
+    assert registry.get(PromptTypeE.CONTENT) == "content.txt: v2"
+    assert registry.version != version
+
+
+def test_prompt_registry_without_hot_reload_keeps_loaded_version(tmp_path):
+    write_prompts(tmp_path, "v1", mtime_ns=1_000_000_000)
+    registry = PromptRegistry(tmp_path)
+    version = registry.version
+
+    write_prompts(tmp_path, "v2", mtime_ns=2_000_000_000)
+
+    assert registry.get(PromptTypeE.CONTENT) == "content.txt: v1"
+    assert registry.version == version
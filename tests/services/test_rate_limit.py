@@ -0,0 +1,97 @@
+import asyncio
+import time
+
+import pytest
+from google.genai import errors
+
+from app.api.core.config import settings
+from app.domain.sentiment_analysis import Opinion
+from app.repository.rate_limit_bucket import reserve_rate_limit_tokens
+from app.services.gemini import get_retry_delay, is_retryable_error
+from app.services.rate_limit import RateLimiter, TokenBucket, gemini_rate_limiter
+from app.services.sentiment_backends.gemini import score_opinions
+
+
+def test_token_bucket_spaces_reservations_at_the_refill_rate():
+    bucket = TokenBucket(rate=10, capacity=1)
+
+    delays = [asyncio.run(bucket.reserve(1)) for _ in range(3)]
+
+    assert delays[0] == 0
+    assert delays[1] == pytest.approx(0.1, abs=0.02)
+    assert delays[2] == pytest.approx(0.2, abs=0.02)
+
+
+def test_token_bucket_refund_stops_at_capacity():
+    bucket = TokenBucket(rate=0.001, capacity=10)
+
+    asyncio.run(bucket.reserve(-5))
+
+    assert bucket.tokens == 10
+    assert asyncio.run(bucket.reserve(12)) == pytest.approx(2000, rel=0.01)
+
+
+def test_rate_limiter_records_throttled_time():
+    limiter = RateLimiter(requests_bucket=TokenBucket(rate=20, capacity=1))
+
+    async def acquire_concurrently():
+        await asyncio.gather(*(limiter.acquire(tokens=0) for _ in range(4)))
+
+    start = time.perf_counter()
+    asyncio.run(acquire_concurrently())
+    elapsed = time.perf_counter() - start
+
+    stats = limiter.get_stats()
+    assert stats.requests == 4
+    assert stats.throttled_requests == 3
+    assert stats.throttled_seconds == pytest.approx(0.05 + 0.1 + 0.15, abs=0.03)
+    assert elapsed == pytest.approx(0.15, abs=0.1)
+
+
+def test_reserve_rate_limit_tokens_goes_into_debt(run_with_db):
+    def reserve(amount):
+        return run_with_db(
+            lambda db: reserve_rate_limit_tokens(
+                db, name="test", rate=0.001, capacity=10, amount=amount
+            )
+        )
+
+    assert reserve(4) == pytest.approx(6, abs=0.01)
+    assert reserve(8) == pytest.approx(-2, abs=0.01)
+    assert reserve(-5) == pytest.approx(3, abs=0.01)
+    assert reserve(-20) == pytest.approx(10, abs=0.01)
+
+
+def test_retry_delay_is_jittered_and_honours_retry_after(monkeypatch):
+    monkeypatch.setattr(settings, "GEMINI_RETRY_BASE_DELAY_SECONDS", 1.0)
+    monkeypatch.setattr(settings, "GEMINI_RETRY_MAX_DELAY_SECONDS", 4.0)
+    error = errors.ServerError(503, {"error": {"message": "overloaded"}})
+
+    delays = [get_retry_delay(attempt=5, error=error) for _ in range(50)]
+
+    assert is_retryable_error(error)
+    assert not is_retryable_error(errors.ClientError(400, {"error": {}}))
+    assert all(0 <= delay <= 4.0 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+def test_score_opinions_backs_off_on_quota_errors(fake_gemini):
+    fake_gemini.state.fail_status = 429
+    fake_gemini.state.fail_calls = 2
+
+    values = asyncio.run(score_opinions([Opinion(id="a", content="good")]))
+
+    assert values[0].sentiment == 0.8
+    assert fake_gemini.state.calls == 3
+    assert gemini_rate_limiter.get_stats().retries == 2
+
+
+def test_score_opinions_gives_up_with_503(fake_gemini, monkeypatch):
+    monkeypatch.setattr(settings, "GEMINI_MAX_RETRIES", 1)
+    fake_gemini.state.fail_calls = 10
+
+    with pytest.raises(Exception) as exc_info:
+        asyncio.run(score_opinions([Opinion(id="a", content="good")]))
+
+    assert getattr(exc_info.value, "status_code", None) == 503
+    assert fake_gemini.state.calls == 2
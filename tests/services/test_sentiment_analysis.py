@@ -0,0 +1,330 @@
+import asyncio
+import time
+from datetime import date
+
+import pytest
+from sqlalchemy import func, select
+
+from app.api.core.config import settings
+from app.domain.sentiment_analysis import Opinion, PromptPackingE, SentimentBackendE
+from app.models.sentiment_analysis import OpinionSentimentScore
+from app.models.user import User as UserModel
+from app.repository.sentiment_score_cache import get_cached_scores, save_cached_scores
+from app.services.sentiment_analysis import (
+    analyze_sentiment,
+    get_sentiment_values,
+    histogram_median,
+)
+from app.services.sentiment_backends.gemini import (
+    GeminiBackend,
+    chunk_opinions,
+    opinions_list_to_ordinal_str,
+    parse_chunk_response,
+    parse_ordinal_sentiment_values,
+    score_opinions,
+)
+from app.services.sentiment_backends.lexicon import LexiconBackend
+from app.services.sentiment_cache import score_cache
+
+
+def test_get_sentiment_values(fake_gemini, run_with_db):
+    opinions_list = [Opinion(id="a", content="good"), Opinion(id="b", content="bad")]
+
+    values = run_with_db(
+        lambda db: get_sentiment_values(db, opinions_list, GeminiBackend())
+    )
+
+    assert {v.id: v.sentiment for v in values} == {"a": 0.8, "b": -0.8}
+
+
+def test_get_sentiment_values_uses_cache(fake_gemini, run_with_db):
+    opinions_list = [Opinion(id="a", content="good"), Opinion(id="b", content="bad")]
+    run_with_db(lambda db: get_sentiment_values(db, opinions_list, GeminiBackend()))
+    assert fake_gemini.state.calls == 1
+
+    reuploaded_opinions_list = [
+        Opinion(id="c", content="  bad "),
+        Opinion(id="d", content="good"),
+    ]
+    values = run_with_db(
+        lambda db: get_sentiment_values(db, reuploaded_opinions_list, GeminiBackend())
+    )
+
+    assert fake_gemini.state.calls == 1
+    assert {v.id: v.sentiment for v in values} == {"c": -0.8, "d": 0.8}
+    assert score_cache.get_stats().memory_hits == 2
+    assert score_cache.get_stats().misses == 2
+
+
+def test_get_sentiment_values_uses_shared_cache_table(fake_gemini, run_with_db):
+    opinions_list = [Opinion(id="a", content="good")]
+    run_with_db(lambda db: get_sentiment_values(db, opinions_list, GeminiBackend()))
+    score_cache.memory.clear()
+
+    values = run_with_db(
+        lambda db: get_sentiment_values(db, opinions_list, GeminiBackend())
+    )
+
+    assert fake_gemini.state.calls == 1
+    assert values[0].sentiment == 0.8
+    assert score_cache.get_stats().db_hits == 1
+
+
+def test_score_cache_leaves_caller_transaction_alone(run_with_db):
+    async def save_scores_then_roll_back(db):
+        db.add(UserModel(username="pending", email="p@example.com", password_hash=""))
+        await db.flush()
+        await score_cache.set_many(db, {"key": 0.5}, model="m", prompt_version="v")
+        await db.rollback()
+        users = (await db.execute(select(func.count(UserModel.id)))).scalar_one()
+        return users, await get_cached_scores(db, ["key"])
+
+    assert run_with_db(save_scores_then_roll_back) == (0, {"key": 0.5})
+
+
+def test_get_sentiment_values_lexicon_backend(fake_gemini, run_with_db):
+    opinions_list = [Opinion(id="a", content="good"), Opinion(id="b", content="bad")]
+
+    values = run_with_db(
+        lambda db: get_sentiment_values(db, opinions_list, LexiconBackend())
+    )
+
+    assert fake_gemini.state.calls == 0
+    assert values[0].sentiment > 0.05
+    assert values[1].sentiment < -0.05
+    assert score_cache.get_stats().misses == 0
+
+
+def test_score_opinions_calls_overlap(fake_gemini):
+    fake_gemini.state.latency_ms = 200
+    opinions_list = [Opinion(id="a", content="good")]
+
+    async def run_concurrently():
+        return await asyncio.gather(*(score_opinions(opinions_list) for _ in range(5)))
+
+    start = time.perf_counter()
+    asyncio.run(run_concurrently())
+    elapsed = time.perf_counter() - start
+
+    assert fake_gemini.state.calls == 5
+    assert elapsed < 0.6
+
+
+def test_chunk_opinions():
+    opinions_list = [Opinion(id=str(i), content="x" * 10) for i in range(25)]
+
+    chunks = list(chunk_opinions(opinions_list, max_opinions=10, max_chars=1000))
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+
+    chunks = list(chunk_opinions(opinions_list, max_opinions=100, max_chars=80))
+    assert [len(chunk) for chunk in chunks] == [5, 5, 5, 5, 5]
+
+
+def test_opinions_list_to_ordinal_str():
+    opinions_list = [
+        Opinion(id="3f2a9c1e-7b4d-4e0a-9f1b-2c8d5e6a7b90", content="good, not great"),
+        Opinion(id="b", content="two\nlines\tand  spaces"),
+    ]
+
+    assert opinions_list_to_ordinal_str(opinions_list) == (
+        "1\tgood, not great\n2\ttwo lines and spaces"
+    )
+
+
+def test_parse_ordinal_sentiment_values():
+    opinions_list = [Opinion(id="x", content="good"), Opinion(id="y", content="bad")]
+
+    values = parse_ordinal_sentiment_values(opinions_list, "[0.8, -0.5]")
+
+    assert [(v.id, v.sentiment) for v in values] == [("x", 0.8), ("y", -0.5)]
+    with pytest.raises(ValueError):
+        parse_ordinal_sentiment_values(opinions_list, "[0.8]")
+    with pytest.raises(ValueError):
+        parse_ordinal_sentiment_values(opinions_list, "[0.8, null]")
+    with pytest.raises(ValueError):
+        parse_ordinal_sentiment_values(opinions_list, '[{"score": 0.8}, -0.5]')
+
+
+def test_parse_chunk_response_keyed_rejects_malformed_responses(monkeypatch):
+    monkeypatch.setattr(settings, "SENTIMENT_PROMPT_PACKING", PromptPackingE.KEYED)
+    opinions_list = [Opinion(id="x", content="good")]
+
+    assert parse_chunk_response(opinions_list, '{"x": 0.8}')[0].sentiment == 0.8
+    with pytest.raises(ValueError):
+        parse_chunk_response(opinions_list, "[0.8]")
+    with pytest.raises(ValueError):
+        parse_chunk_response(opinions_list, '{"x": "positive"}')
+    with pytest.raises(ValueError):
+        parse_chunk_response(opinions_list, '{"x": null}')
+
+
+def test_score_opinions_keyed_packing(fake_gemini, monkeypatch):
+    monkeypatch.setattr(settings, "SENTIMENT_PROMPT_PACKING", PromptPackingE.KEYED)
+    opinions_list = [Opinion(id="a", content="good"), Opinion(id="b", content="bad")]
+
+    values = asyncio.run(score_opinions(opinions_list))
+
+    assert {v.id: v.sentiment for v in values} == {"a": 0.8, "b": -0.8}
+
+
+def test_score_opinions_scores_chunks_concurrently(fake_gemini, monkeypatch):
+    monkeypatch.setattr(settings, "SENTIMENT_CHUNK_MAX_OPINIONS", 10)
+    monkeypatch.setattr(settings, "SENTIMENT_MAX_CONCURRENCY", 4)
+    fake_gemini.state.latency_ms = 200
+    opinions_list = [Opinion(id=str(i), content="good") for i in range(40)]
+
+    start = time.perf_counter()
+    values = asyncio.run(score_opinions(opinions_list))
+    elapsed = time.perf_counter() - start
+
+    assert fake_gemini.state.calls == 4
+    assert [v.id for v in values] == [str(i) for i in range(40)]
+    assert elapsed < 0.6
+
+
+def test_score_opinions_retries_failed_chunks(fake_gemini, monkeypatch):
+    monkeypatch.setattr(settings, "SENTIMENT_CHUNK_MAX_OPINIONS", 10)
+    fake_gemini.state.fail_calls = 1
+    opinions_list = [Opinion(id=str(i), content="bad") for i in range(30)]
+
+    values = asyncio.run(score_opinions(opinions_list))
+
+    assert fake_gemini.state.calls == 4
+    assert len(values) == 30
+    assert all(v.sentiment == -0.8 for v in values)
+
+
+def test_analyze_sentiment_streams_in_batches(
+    fake_gemini, db_session, run_with_db, monkeypatch, test_auth_client
+):
+    test_auth_client.post("/projects", json={"name": "Test"})
+    monkeypatch.setattr(settings, "SENTIMENT_STREAM_BATCH_SIZE", 2)
+    monkeypatch.setattr(settings, "SENTIMENT_CHUNK_MAX_OPINIONS", 2)
+    monkeypatch.setattr(settings, "SENTIMENT_MAX_CONCURRENCY", 1)
+    progress = []
+
+    async def on_progress(opinions_scored: int) -> None:
+        progress.append(opinions_scored)
+
+    async def opinions():
+        for i, content in enumerate(["good", "bad", "fine", "great", "sad"]):
+            yield Opinion(id=str(i), content=content)
+
+    result = run_with_db(
+        lambda db: analyze_sentiment(
+            db,
+            project_id=1,
+            user_id=1,
+            date_from=date(2025, 1, 1),
+            date_to=date(2025, 1, 31),
+            opinions_list=opinions(),
+            on_progress=on_progress,
+        )
+    )
+
+    assert fake_gemini.state.calls == 3
+    assert sum(progress) == 5
+    assert (result.opinions_count, result.positive_count) == (5, 2)
+    assert (result.negative_count, result.neutral_count) == (2, 1)
+    assert result.avg_sentiment == 0.0
+
+    scores = (
+        db_session.query(OpinionSentimentScore)
+        .filter(OpinionSentimentScore.result_id == result.id)
+        .order_by(OpinionSentimentScore.position)
+        .all()
+    )
+    assert [(s.position, s.opinion_id, s.sentiment) for s in scores] == [
+        (0, "0", 0.8),
+        (1, "1", -0.8),
+        (2, "2", 0.0),
+        (3, "3", 0.8),
+        (4, "4", -0.8),
+    ]
+
+
+@pytest.mark.parametrize(
+    "stream_batch_size, expected_batch_size",
+    [(2_000, 3_200), (3_200, 3_200), (1, 1_600)],
+)
+def test_gemini_batch_size_is_whole_rounds_of_concurrent_chunks(
+    monkeypatch, stream_batch_size, expected_batch_size
+):
+    monkeypatch.setattr(settings, "SENTIMENT_STREAM_BATCH_SIZE", stream_batch_size)
+    monkeypatch.setattr(settings, "SENTIMENT_CHUNK_MAX_OPINIONS", 200)
+    monkeypatch.setattr(settings, "SENTIMENT_MAX_CONCURRENCY", 8)
+
+    assert GeminiBackend().batch_size == expected_batch_size
+
+
+def test_analyze_sentiment_persists_scores_with_awkward_ids(
+    db_session, run_with_db, test_auth_client
+):
+    test_auth_client.post("/projects", json={"name": "Test"})
+    opinion_ids = ['a,"b"', "", "line\nbreak", "tab\there"]
+
+    result = run_with_db(
+        lambda db: analyze_sentiment(
+            db,
+            project_id=1,
+            user_id=1,
+            date_from=date(2025, 1, 1),
+            date_to=date(2025, 1, 31),
+            opinions_list=[Opinion(id=i, content="good") for i in opinion_ids],
+            backend=SentimentBackendE.LEXICON,
+        )
+    )
+
+    scores = (
+        db_session.query(OpinionSentimentScore.opinion_id)
+        .filter(OpinionSentimentScore.result_id == result.id)
+        .order_by(OpinionSentimentScore.position)
+        .all()
+    )
+    assert [opinion_id for opinion_id, in scores] == opinion_ids
+
+
+def test_histogram_median():
+    assert histogram_median({"-20": 1, "40": 1, "80": 1}, 3) == 0.4
+    assert histogram_median({"-20": 1, "40": 2, "81": 1}, 4) == 0.4
+    assert histogram_median({"40": 1, "81": 1}, 2) == 0.605
+
+
+def test_get_cached_scores_looks_up_more_keys_than_bind_parameters(run_with_db):
+    keys = [f"{i:032x}" for i in range(40_000)]
+
+    async def save_and_get(db):
+        await save_cached_scores(db, {keys[-1]: 0.5}, model="m", prompt_version="v")
+        await db.commit()
+        return await get_cached_scores(db, keys)
+
+    assert run_with_db(save_and_get) == {keys[-1]: 0.5}
+
+
+def test_analyze_sentiment_holds_no_transaction_while_scoring(
+    fake_gemini, run_with_db, monkeypatch, test_auth_client
+):
+    test_auth_client.post("/projects", json={"name": "Test"})
+    in_transaction = []
+    score = GeminiBackend.score
+
+    async def analyze(db):
+        async def score_outside_transaction(self, opinions_list, on_progress=None):
+            in_transaction.append(db.in_transaction())
+            return await score(self, opinions_list, on_progress=on_progress)
+
+        monkeypatch.setattr(GeminiBackend, "score", score_outside_transaction)
+        await db.execute(select(UserModel))
+        return await analyze_sentiment(
+            db,
+            project_id=1,
+            user_id=1,
+            date_from=date(2025, 1, 1),
+            date_to=date(2025, 1, 31),
+            opinions_list=[Opinion(id="1", content="good")],
+        )
+
+    result = run_with_db(analyze)
+
+    assert in_transaction == [False]
+    assert result.opinions_count == 1
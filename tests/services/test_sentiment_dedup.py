@@ -0,0 +1,122 @@
+from datetime import date
+
+from app.api.core.config import settings
+from app.domain.sentiment_analysis import Opinion
+from app.services.sentiment_analysis import analyze_sentiment, get_sentiment_values
+from app.services.sentiment_backends.gemini import GeminiBackend
+from app.services.sentiment_dedup import dedup_key, group_duplicate_opinions
+from benchmarks.fake_gemini import estimate_tokens
+
+SPAM = (
+    "Best deals on watches and bags, visit our shop today and get free "
+    "shipping on every order over fifty dollars"
+)
+
+
+def test_dedup_key():
+    assert dedup_key("  Great!!! ") == dedup_key("great") == "great"
+    assert dedup_key("Don't  buy\nit.") == "dont buy it"
+    assert dedup_key(":)") != dedup_key(":(")
+    assert dedup_key("not good") != dedup_key("good")
+
+
+def test_group_duplicate_opinions():
+    opinions = [
+        Opinion(id="a", content="Great!"),
+        Opinion(id="b", content="ok"),
+        Opinion(id="c", content="great"),
+        Opinion(id="d", content="OK."),
+    ]
+
+    groups = group_duplicate_opinions(opinions)
+
+    assert [o.content for o in groups.representatives] == ["Great!", "ok"]
+    assert [o.id for o in groups.representatives] == ["0", "1"]
+    assert groups.representative_indexes == [0, 1, 0, 1]
+
+
+def test_group_duplicate_opinions_near_duplicates():
+    opinions = [
+        Opinion(id="a", content=SPAM),
+        Opinion(id="b", content=SPAM.replace("today", "now")),
+        Opinion(id="c", content="The watch stopped after a week, do not buy it"),
+    ]
+
+    assert len(group_duplicate_opinions(opinions).representatives) == 3
+    groups = group_duplicate_opinions(opinions, near_duplicates=True, similarity=0.6)
+    assert groups.representative_indexes == [0, 0, 1]
+
+
+def test_get_sentiment_values_fans_out_duplicates(fake_gemini, run_with_db):
+    opinions_list = [
+        Opinion(id="a", content="good"),
+        Opinion(id="b", content="Good!"),
+        Opinion(id="c", content="bad"),
+        Opinion(id="d", content="GOOD"),
+    ]
+    progress = []
+
+    async def on_progress(opinions_scored):
+        progress.append(opinions_scored)
+
+    values = run_with_db(
+        lambda db: get_sentiment_values(
+            db, opinions_list, GeminiBackend(), on_progress=on_progress
+        )
+    )
+
+    assert [(v.id, v.sentiment) for v in values] == [
+        ("a", 0.8),
+        ("b", 0.8),
+        ("c", -0.8),
+        ("d", 0.8),
+    ]
+    assert sum(progress) == 4
+    assert fake_gemini.state.calls == 1
+    assert fake_gemini.state.output_tokens == estimate_tokens("[0.8, -0.8]")
+
+
+def test_get_sentiment_values_without_dedup(fake_gemini, run_with_db, monkeypatch):
+    monkeypatch.setattr(settings, "SENTIMENT_DEDUP", False)
+    opinions_list = [Opinion(id="a", content="good"), Opinion(id="b", content="good")]
+
+    values = run_with_db(
+        lambda db: get_sentiment_values(db, opinions_list, GeminiBackend())
+    )
+
+    assert [v.sentiment for v in values] == [0.8, 0.8]
+    assert fake_gemini.state.output_tokens == estimate_tokens("[0.8, 0.8]")
+
+
+def test_analyze_sentiment_dedups_across_batches(
+    fake_gemini, run_with_db, monkeypatch, test_auth_client
+):
+    test_auth_client.post("/projects", json={"name": "Test"})
+    monkeypatch.setattr(settings, "SENTIMENT_STREAM_BATCH_SIZE", 2)
+    monkeypatch.setattr(settings, "SENTIMENT_CHUNK_MAX_OPINIONS", 2)
+    monkeypatch.setattr(settings, "SENTIMENT_MAX_CONCURRENCY", 1)
+    contents = ["good", "bad", "Good!", "BAD.", "good", "fine"]
+    progress = []
+
+    async def on_progress(opinions_scored):
+        progress.append(opinions_scored)
+
+    result = run_with_db(
+        lambda db: analyze_sentiment(
+            db,
+            project_id=1,
+            user_id=1,
+            date_from=date(2025, 1, 1),
+            date_to=date(2025, 1, 31),
+            opinions_list=[
+                Opinion(id=str(i), content=content)
+                for i, content in enumerate(contents)
+            ],
+            on_progress=on_progress,
+        )
+    )
+
+    assert (result.positive_count, result.negative_count) == (3, 2)
+    assert sum(progress) == 6
+    # The second batch is answered from the first; the third sends only "fine".
+    assert fake_gemini.state.calls == 2